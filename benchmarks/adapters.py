@@ -0,0 +1,20 @@
+import asyncio
+
+from haraka_runtime.core.interfaces import Adapter
+
+
+class BenchAdapter(Adapter):
+    """Adapter whose startup/shutdown sleep for ``latency`` seconds of fake I/O."""
+
+    def __init__(self, name: str, latency: float = 0.0):
+        self.name = name
+        self.latency = latency
+
+    async def startup(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
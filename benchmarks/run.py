@@ -0,0 +1,274 @@
+"""
+Startup and lifecycle benchmarks for the orchestrator and manifest loader.
+
+Builds synthetic registries (flat, wide fan-out and deep chain graphs of 10,
+100 and 1,000 adapters, with and without simulated I/O latency) and generated
+manifest trees, times each lifecycle phase and writes the medians as JSON::
+
+    PYTHONPATH=src python -m benchmarks.run --output benchmarks/baseline.json
+    PYTHONPATH=src python -m benchmarks.run --compare benchmarks/baseline.json
+
+With ``--compare`` the exit status is 1 when any phase is slower than the
+baseline by more than ``--tolerance``.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from haraka_runtime.loader.manifest_loader import (
+    clear_manifest_cache,
+    load_adapter_from_manifest,
+    load_adapters_from_manifests,
+)
+from haraka_runtime.orchestrator.metrics import MetricsRegistry
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, StartupMode
+
+from benchmarks.adapters import BenchAdapter
+
+SIZES = (10, 100, 1000)
+SHAPES = ("flat", "fanout", "chain")
+# Regressions smaller than this are timer noise, whatever the ratio
+NOISE_FLOOR = 0.001
+
+Results = Dict[str, Dict[str, float]]
+
+
+def edges(shape: str, size: int) -> List[Tuple[str, List[str]]]:
+    """``(name, dependencies)`` pairs for a synthetic dependency graph."""
+    names = [f"svc{i}" for i in range(size)]
+    if shape == "flat":
+        return [(name, []) for name in names]
+    if shape == "fanout":
+        return [(names[0], [])] + [(name, [names[0]]) for name in names[1:]]
+    if shape == "chain":
+        return [(names[0], [])] + [
+            (name, [names[i]]) for i, name in enumerate(names[1:])
+        ]
+    raise ValueError(f"Unknown graph shape: {shape}")
+
+
+def build(
+    shape: str, size: int, mode: StartupMode, latency: float = 0.0
+) -> Orchestrator:
+    runtime = Orchestrator(
+        startup_mode=mode, handle_signals=False, loop_lag_threshold=None
+    )
+    for name, deps in edges(shape, size):
+        runtime.use(BenchAdapter(name, latency), dependencies=deps)
+    return runtime
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+async def lifecycle(
+    shape: str, size: int, mode: StartupMode, latency: float, repeat: int
+) -> Results:
+    phases: Dict[str, List[float]] = {
+        "resolve": [],
+        "run": [],
+        "wait_for_all_ready": [],
+        "shutdown": [],
+    }
+    clock = time.perf_counter
+    for _ in range(repeat):
+        runtime = build(shape, size, mode, latency)
+
+        began = clock()
+        runtime._resolve_start_order()
+        phases["resolve"].append(clock() - began)
+        runtime._graph._plan = None  # let run() pay for its own resolve
+
+        began = clock()
+        await runtime.run()
+        phases["run"].append(clock() - began)
+
+        began = clock()
+        await runtime.wait_for_all_ready(timeout=60.0)
+        phases["wait_for_all_ready"].append(clock() - began)
+
+        began = clock()
+        await runtime.shutdown(timeout=60.0)
+        phases["shutdown"].append(clock() - began)
+
+    latency_tag = f"-io{latency * 1000:g}ms" if latency else ""
+    prefix = f"lifecycle/{shape}-{size}{latency_tag}/{mode.name.lower()}"
+    return {f"{prefix}/{phase}": summarize(s) for phase, s in phases.items()}
+
+
+def write_manifests(root: Path, size: int) -> None:
+    for name, deps in edges("fanout", size):
+        service = root / name
+        service.mkdir(parents=True)
+        dep_lines = "".join(f"  - {dep}\n" for dep in deps)
+        (service / "service.yaml").write_text(
+            "entrypoint: benchmarks.adapters:BenchAdapter\n"
+            f"priority: 0\n"
+            f"dependencies:{' []' if not deps else ''}\n{dep_lines}"
+            f"settings:\n  name: {name}\n"
+        )
+
+
+def manifests(size: int, repeat: int) -> Results:
+    phases: Dict[str, List[float]] = {"cold": [], "warm": [], "bulk_cold": []}
+    clock = time.perf_counter
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write_manifests(root, size)
+        paths = sorted(root.rglob("service.yaml"))
+
+        def load_each() -> float:
+            runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+            began = clock()
+            for path in paths:
+                load_adapter_from_manifest(path, runtime)
+            return clock() - began
+
+        for _ in range(repeat):
+            clear_manifest_cache()
+            phases["cold"].append(load_each())
+            phases["warm"].append(load_each())
+
+            clear_manifest_cache()
+            runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+            began = clock()
+            load_adapters_from_manifests(root, runtime)
+            phases["bulk_cold"].append(clock() - began)
+
+    return {f"manifest/{size}/{phase}": summarize(s) for phase, s in phases.items()}
+
+
+def metrics(size: int, repeat: int, increments: int = 100_000) -> Results:
+    """Hot-path counter increments, and rendering ``size`` labelled series."""
+    phases: Dict[str, List[float]] = {"inc": [], "render": []}
+    clock = time.perf_counter
+    for _ in range(repeat):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ["route"])
+        for i in range(size):
+            requests.labels(f"/r{i}").inc()
+        counter = requests.labels("/r0")
+
+        began = clock()
+        for _ in range(increments):
+            counter.inc()
+        phases["inc"].append((clock() - began) / increments)
+
+        began = clock()
+        registry.render()
+        phases["render"].append(clock() - began)
+    return {f"metrics/{size}/{phase}": summarize(s) for phase, s in phases.items()}
+
+
+def run_suite(
+    sizes: Iterable[int] = SIZES,
+    repeat: int = 5,
+    io_latency: float = 0.002,
+    progress: Callable[[str], None] = lambda _: None,
+) -> Results:
+    """Run every benchmark case and return ``{case/phase: stats}``."""
+    results: Results = {}
+    # The orchestrator logs every transition; keep the terminal out of the timings
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink), contextlib.redirect_stderr(sink):
+        for size in sizes:
+            for shape in SHAPES:
+                progress(f"lifecycle {shape}-{size}")
+                results.update(
+                    asyncio.run(
+                        lifecycle(shape, size, StartupMode.CONCURRENT, 0.0, repeat)
+                    )
+                )
+                sink.seek(0)
+                sink.truncate()
+            progress(f"manifests {size}")
+            results.update(manifests(size, repeat))
+            progress(f"metrics {size}")
+            results.update(metrics(size, repeat))
+
+        io_size = min(100, max(sizes))
+        for shape in ("fanout", "chain"):
+            for mode in StartupMode:
+                progress(f"lifecycle {shape}-{io_size} io {mode.name.lower()}")
+                results.update(
+                    asyncio.run(lifecycle(shape, io_size, mode, io_latency, repeat))
+                )
+                sink.seek(0)
+                sink.truncate()
+    return results
+
+
+def compare(
+    results: Results, baseline: Results, tolerance: float
+) -> List[Tuple[str, float, float]]:
+    """Phases whose median regressed past ``tolerance`` as (key, old, new)."""
+    regressions = []
+    for key, stats in sorted(results.items()):
+        old = baseline.get(key, {}).get("median")
+        if old is None:
+            continue
+        new = stats["median"]
+        if new > old * (1 + tolerance) and new - old > NOISE_FLOOR:
+            regressions.append((key, old, new))
+    return regressions
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Skip 1,000 adapters")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to check")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    sizes = SIZES[:2] if args.quick else SIZES
+    results = run_suite(
+        sizes, args.repeat, progress=lambda msg: print(f"… {msg}", file=sys.stderr)
+    )
+    for key, stats in sorted(results.items()):
+        print(f"{key:<58} {stats['median'] * 1000:10.3f} ms")
+
+    if args.output:
+        document = {"environment": environment(), "results": results}
+        args.output.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for key, old, new in regressions:
+            print(
+                f"REGRESSION {key}: {old * 1000:.3f} ms → {new * 1000:.3f} ms",
+                file=sys.stderr,
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,5 +13,10 @@ setup(
         "PyYAML",  # for manifest_loader
         # add other runtime deps here
     ],
+    extras_require={
+        "kafka": ["aiokafka"],
+        "grpc": ["grpcio"],
+        "http": ["fastapi", "uvicorn[standard]>=0.24"],
+    },
     python_requires=">=3.8",
 )
@@ -0,0 +1,554 @@
+import abc
+import asyncio
+import os
+import time
+import zlib
+from collections import defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import (
+    Any,
+    AsyncIterator,
+    DefaultDict,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from haraka_runtime.core.interfaces import Adapter
+
+Record = Tuple[Optional[bytes], bytes]
+
+
+class KafkaDeliveryError(RuntimeError):
+    """Raised by ``flush()`` when records could not be delivered."""
+
+    def __init__(self, message: str, undelivered: int):
+        super().__init__(message)
+        self.undelivered = undelivered
+
+
+@dataclass(frozen=True)
+class KafkaMessage:
+    topic: str
+    partition: int
+    offset: int
+    key: Optional[bytes]
+    value: bytes
+    timestamp: float
+
+
+@dataclass
+class KafkaConfig:
+    brokers: str
+    topics: List[str]
+    group_id: Optional[str] = None
+    linger_ms: int = 5
+    batch_size: int = 500
+    max_batch_bytes: int = 1024 * 1024
+    compression: Optional[str] = None
+    acks: Union[int, str] = 1
+    consume_batch_size: int = 500
+
+
+@dataclass
+class KafkaStats:
+    produced: int = 0
+    batches_sent: int = 0
+    send_errors: int = 0
+    send_retries: int = 0
+    undelivered: int = 0
+    consumed: int = 0
+    commits: int = 0
+    buffered: int = 0
+    in_flight: int = 0
+    last_error: Optional[str] = None
+
+
+class KafkaBackend(abc.ABC):
+    """Transport used by ``KafkaAdapter``; swap it to run without a cluster."""
+
+    @abc.abstractmethod
+    async def start(self, config: KafkaConfig): ...
+
+    @abc.abstractmethod
+    async def stop(self): ...
+
+    @abc.abstractmethod
+    async def send_batch(self, topic: str, records: Sequence[Record]): ...
+
+    @abc.abstractmethod
+    async def fetch(self, max_records: int, timeout: float) -> List[KafkaMessage]: ...
+
+    @abc.abstractmethod
+    async def commit(self, offsets: Dict[Tuple[str, int], int]): ...
+
+
+class InMemoryBroker:
+    """
+    Partitioned, in-process stand-in for a Kafka cluster.
+
+    Several ``InMemoryBackend`` connections can share one broker, e.g. a
+    producing and a consuming adapter in the same test or benchmark.
+    """
+
+    def __init__(self, partitions: int = 1):
+        self.partitions = partitions
+        self.logs: DefaultDict[str, List[List[KafkaMessage]]] = defaultdict(
+            lambda: [[] for _ in range(self.partitions)]
+        )
+        self.committed: Dict[Tuple[str, str, int], int] = {}
+        self.bytes_in = 0
+        self._appended: Optional[asyncio.Condition] = None
+        self._round_robin = 0
+
+    @property
+    def appended(self) -> asyncio.Condition:
+        if self._appended is None:
+            self._appended = asyncio.Condition()
+        return self._appended
+
+    async def append(self, topic: str, records: Sequence[Record], codec: Any) -> None:
+        partitions = self.logs[topic]
+        now = time.time()
+        for key, value in records:
+            if key is None:
+                index = self._round_robin % self.partitions
+                self._round_robin += 1
+            else:
+                index = zlib.crc32(key) % self.partitions
+            log = partitions[index]
+            log.append(KafkaMessage(topic, index, len(log), key, value, now))
+        self.bytes_in += len(codec(b"".join(value for _, value in records)))
+        async with self.appended:
+            self.appended.notify_all()
+
+
+class InMemoryBackend(KafkaBackend):
+    """
+    ``KafkaBackend`` over an ``InMemoryBroker``. ``latency`` adds a simulated
+    network round trip to every request so batching effects can be measured.
+    """
+
+    CODECS = {None: lambda data: data, "gzip": lambda data: zlib.compress(data, 6)}
+
+    def __init__(self, broker: Optional[InMemoryBroker] = None, latency: float = 0.0):
+        self.broker = broker or InMemoryBroker()
+        self.latency = latency
+        self.requests = 0
+        self._config: Optional[KafkaConfig] = None
+        self._positions: Dict[Tuple[str, int], int] = {}
+
+    async def start(self, config: KafkaConfig):
+        if config.compression not in self.CODECS:
+            raise ValueError(f"Unsupported compression: {config.compression}")
+        self._config = config
+        self._positions.clear()
+
+    async def stop(self):
+        self._config = None
+
+    async def _round_trip(self) -> None:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def send_batch(self, topic: str, records: Sequence[Record]):
+        assert self._config is not None, "backend is not started"
+        await self._round_trip()
+        await self.broker.append(topic, records, self.CODECS[self._config.compression])
+
+    async def fetch(self, max_records: int, timeout: float) -> List[KafkaMessage]:
+        assert self._config is not None, "backend is not started"
+        config = self._config
+        await self._round_trip()
+
+        def available() -> List[KafkaMessage]:
+            batch: List[KafkaMessage] = []
+            for topic in config.topics:
+                for partition, log in enumerate(self.broker.logs[topic]):
+                    position = self._position(topic, partition)
+                    taken = log[position : position + max_records - len(batch)]
+                    batch.extend(taken)
+                    self._positions[(topic, partition)] = position + len(taken)
+            return batch
+
+        def has_data() -> bool:
+            return any(
+                len(log) > self._position(topic, partition)
+                for topic in config.topics
+                for partition, log in enumerate(self.broker.logs[topic])
+            )
+
+        batch = available()
+        if batch or timeout <= 0:
+            return batch
+        try:
+            async with self.broker.appended:
+                await asyncio.wait_for(self.broker.appended.wait_for(has_data), timeout)
+        except asyncio.TimeoutError:
+            return []
+        return available()
+
+    async def commit(self, offsets: Dict[Tuple[str, int], int]):
+        assert self._config is not None, "backend is not started"
+        await self._round_trip()
+        group = self._config.group_id or ""
+        for (topic, partition), offset in offsets.items():
+            self.broker.committed[(group, topic, partition)] = offset
+
+    def _position(self, topic: str, partition: int) -> int:
+        key = (topic, partition)
+        if key not in self._positions:
+            group = self._config.group_id if self._config else None
+            self._positions[key] = self.broker.committed.get(
+                (group or "", topic, partition), 0
+            )
+        return self._positions[key]
+
+
+class AIOKafkaBackend(KafkaBackend):
+    """``KafkaBackend`` for a real cluster; requires the ``aiokafka`` package."""
+
+    def __init__(self) -> None:
+        self._producer: Any = None
+        self._consumer: Any = None
+
+    async def start(self, config: KafkaConfig):
+        try:
+            import aiokafka
+        except ImportError as e:
+            raise ImportError("AIOKafkaBackend requires the 'aiokafka' package") from e
+
+        self._topic_partition = aiokafka.TopicPartition
+        self._producer = aiokafka.AIOKafkaProducer(
+            bootstrap_servers=config.brokers,
+            linger_ms=config.linger_ms,
+            max_batch_size=config.max_batch_bytes,
+            compression_type=config.compression,
+            acks=config.acks,
+        )
+        await self._producer.start()
+        if config.group_id:
+            self._consumer = aiokafka.AIOKafkaConsumer(
+                *config.topics,
+                bootstrap_servers=config.brokers,
+                group_id=config.group_id,
+                enable_auto_commit=False,
+                max_poll_records=config.consume_batch_size,
+            )
+            await self._consumer.start()
+
+    async def stop(self):
+        if self._consumer is not None:
+            await self._consumer.stop()
+        if self._producer is not None:
+            await self._producer.stop()
+
+    async def send_batch(self, topic: str, records: Sequence[Record]):
+        acks = [
+            await self._producer.send(topic, value, key=key) for key, value in records
+        ]
+        await asyncio.gather(*acks)
+
+    async def fetch(self, max_records: int, timeout: float) -> List[KafkaMessage]:
+        if self._consumer is None:
+            raise RuntimeError("Consuming requires a group_id")
+        fetched = await self._consumer.getmany(
+            timeout_ms=int(timeout * 1000), max_records=max_records
+        )
+        return [
+            KafkaMessage(r.topic, r.partition, r.offset, r.key, r.value, r.timestamp)
+            for records in fetched.values()
+            for r in records
+        ]
+
+    async def commit(self, offsets: Dict[Tuple[str, int], int]):
+        await self._consumer.commit(
+            {self._topic_partition(t, p): offset for (t, p), offset in offsets.items()}
+        )
+
+
+BACKENDS = {"memory": InMemoryBackend, "aiokafka": AIOKafkaBackend}
+
+
+class KafkaAdapter(Adapter):
+    """
+    Batched Kafka producer/consumer.
+
+    ``send()`` only appends to an in-process buffer; a flusher sends a topic's
+    buffer once it holds ``batch_size`` records or ``linger_ms`` has passed,
+    with at most ``max_in_flight`` batches outstanding. When ``max_buffered``
+    records are waiting, ``send()`` blocks; above ``high_watermark`` of that the
+    adapter withdraws its readiness until the buffer drains below
+    ``low_watermark``. ``batches()`` yields lists of messages and commits each
+    batch's offsets once the caller asks for the next one.
+
+    A failed send is retried up to ``retries`` times with exponential backoff
+    from ``retry_backoff_ms``; records that still fail are held back and
+    resent by the next ``flush()``, which raises ``KafkaDeliveryError`` if any
+    remain undelivered. ``shutdown()`` flushes within ``flush_timeout``.
+    """
+
+    def __init__(
+        self,
+        name: str = "kafka",
+        brokers: Optional[str] = None,
+        topic: Optional[str] = None,
+        topics: Optional[List[str]] = None,
+        group_id: Optional[str] = None,
+        backend: Union[str, KafkaBackend, None] = None,
+        linger_ms: int = 5,
+        batch_size: int = 500,
+        max_batch_bytes: int = 1024 * 1024,
+        compression: Optional[str] = None,
+        acks: Union[int, str] = 1,
+        max_in_flight: int = 5,
+        max_buffered: int = 10_000,
+        high_watermark: float = 0.8,
+        low_watermark: float = 0.5,
+        consume_batch_size: int = 500,
+        retries: int = 5,
+        retry_backoff_ms: int = 100,
+        flush_timeout: Optional[float] = 5.0,
+    ):
+        self.name = name
+        self.topic = topic or os.environ.get("KAFKA_TOPIC", "haraka-events")
+        self.config = KafkaConfig(
+            brokers=brokers or os.environ.get("KAFKA_BROKERS", "localhost:9092"),
+            topics=topics or [self.topic],
+            group_id=group_id,
+            linger_ms=linger_ms,
+            batch_size=batch_size,
+            max_batch_bytes=max_batch_bytes,
+            compression=compression,
+            acks=acks,
+            consume_batch_size=consume_batch_size,
+        )
+        if isinstance(backend, KafkaBackend):
+            self.backend = backend
+        else:
+            self.backend = BACKENDS[backend or "aiokafka"]()
+        self.max_in_flight = max_in_flight
+        self.max_buffered = max_buffered
+        self.high_watermark = int(max_buffered * high_watermark)
+        self.low_watermark = int(max_buffered * low_watermark)
+        self.retries = retries
+        self.retry_backoff_ms = retry_backoff_ms
+        self.flush_timeout = flush_timeout
+        self.stats = KafkaStats()
+
+        self._buffers: DefaultDict[str, List[Record]] = defaultdict(list)
+        self._buffer_bytes: DefaultDict[str, int] = defaultdict(int)
+        self._inflight: Set[asyncio.Task] = set()
+        self._undelivered: List[Tuple[str, List[Record]]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._space = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._throttled = False
+
+    async def startup(self):
+        await self.backend.start(self.config)
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._space.set()
+        self._drained.set()
+        self._flusher = asyncio.create_task(
+            self._flush_loop(), name=f"{self.name}:flush"
+        )
+        self._runtime_call("mark_ready")
+
+    async def shutdown(self):
+        try:
+            await self.flush(self.flush_timeout)
+        finally:
+            if self._flusher is not None:
+                self._flusher.cancel()
+                await asyncio.gather(self._flusher, return_exceptions=True)
+                self._flusher = None
+            # Sends still retrying when the flush gave up were reported above
+            pending = list(self._inflight)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await self.backend.stop()
+
+    async def health(self) -> bool:
+        return self._flusher is not None and not self._flusher.done()
+
+    async def send(
+        self, value: bytes, key: Optional[bytes] = None, topic: Optional[str] = None
+    ) -> None:
+        """Buffer one record for batched delivery, waiting if the buffer is full."""
+        while self.stats.buffered >= self.max_buffered:
+            self._space.clear()
+            await self._space.wait()
+        topic = topic or self.topic
+        buffer = self._buffers[topic]
+        buffer.append((key, value))
+        self._buffer_bytes[topic] += len(value)
+        self.stats.buffered += 1
+        self.stats.produced += 1
+        self._drained.clear()
+        self._pending.set()
+        if (
+            len(buffer) >= self.config.batch_size
+            or self._buffer_bytes[topic] >= self.config.max_batch_bytes
+        ):
+            self._full.set()
+        if not self._throttled and self.stats.buffered >= self.high_watermark:
+            self._throttled = True
+            self._runtime_call("mark_unready")
+
+    async def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Send everything buffered now, resending records whose earlier delivery
+        failed, and wait until it is acknowledged.
+
+        Raises:
+            KafkaDeliveryError: If records are still undelivered after their
+                retries, or not yet acknowledged when ``timeout`` passes
+        """
+        self._requeue_undelivered()
+        if self.stats.buffered:
+            self._full.set()
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout)
+            except asyncio.TimeoutError:
+                pending = self.stats.buffered + self.stats.undelivered
+                raise KafkaDeliveryError(
+                    f"{pending} record(s) not delivered within {timeout}s", pending
+                ) from None
+        if self.stats.undelivered:
+            raise KafkaDeliveryError(
+                f"{self.stats.undelivered} record(s) undelivered: "
+                f"{self.stats.last_error}",
+                self.stats.undelivered,
+            )
+
+    async def batches(
+        self, max_records: Optional[int] = None, timeout: float = 1.0
+    ) -> AsyncIterator[List[KafkaMessage]]:
+        """
+        Yield batches of consumed messages until the runtime starts draining.
+
+        A batch's offsets are committed when the caller comes back for the next
+        batch, so a consumer that crashes mid-batch sees it again (at least once).
+        Until then the batch counts as in-flight work of the runtime; once the
+        runtime drains, no further batches are fetched.
+        """
+        limit = max_records or self.config.consume_batch_size
+        runtime = getattr(self, "runtime", None)
+        while runtime is None or runtime.work.admitting:
+            batch = await self.backend.fetch(limit, timeout)
+            if not batch:
+                continue
+            if runtime is not None and not runtime.work.admitting:
+                return  # uncommitted, so redelivered after restart
+            with runtime.work.track(self.name) if runtime else nullcontext():
+                self.stats.consumed += len(batch)
+                yield batch
+                await self.commit(batch)
+
+    async def commit(self, batch: Sequence[KafkaMessage]) -> None:
+        offsets: Dict[Tuple[str, int], int] = {}
+        for message in batch:
+            key = (message.topic, message.partition)
+            offsets[key] = max(offsets.get(key, 0), message.offset + 1)
+        await self.backend.commit(offsets)
+        self.stats.commits += 1
+
+    async def _flush_loop(self) -> None:
+        linger = self.config.linger_ms / 1000
+        while True:
+            await self._pending.wait()
+            if not self._full.is_set() and linger:
+                try:
+                    await asyncio.wait_for(self._full.wait(), linger)
+                except asyncio.TimeoutError:
+                    pass
+            self._pending.clear()
+            self._full.clear()
+            await self._dispatch()
+
+    async def _dispatch(self) -> None:
+        assert self._slots is not None
+        for topic in list(self._buffers):
+            buffer = self._buffers.pop(topic)
+            self._buffer_bytes.pop(topic, None)
+            for chunk in self._chunks(buffer):
+                await self._slots.acquire()
+                task = asyncio.create_task(self._send(topic, chunk))
+                self._inflight.add(task)
+                task.add_done_callback(self._inflight.discard)
+
+    def _chunks(self, records: List[Record]) -> List[List[Record]]:
+        chunks: List[List[Record]] = [[]]
+        size = 0
+        for record in records:
+            full = len(chunks[-1]) >= self.config.batch_size
+            if chunks[-1] and (
+                full or size + len(record[1]) > self.config.max_batch_bytes
+            ):
+                chunks.append([])
+                size = 0
+            chunks[-1].append(record)
+            size += len(record[1])
+        return chunks
+
+    async def _send(self, topic: str, chunk: List[Record]) -> None:
+        assert self._slots is not None
+        self.stats.in_flight += 1
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    await self.backend.send_batch(topic, chunk)
+                except Exception as e:
+                    self.stats.last_error = str(e) or type(e).__name__
+                    if attempt == self.retries:
+                        self.stats.send_errors += len(chunk)
+                        self.stats.undelivered += len(chunk)
+                        self._undelivered.append((topic, chunk))
+                        break
+                    self.stats.send_retries += 1
+                    await asyncio.sleep(self.retry_backoff_ms * 2**attempt / 1000)
+                else:
+                    self.stats.batches_sent += 1
+                    break
+        finally:
+            self.stats.in_flight -= 1
+            self._slots.release()
+            self._settle(len(chunk))
+
+    def _requeue_undelivered(self) -> None:
+        # Ahead of anything buffered since, to keep per-topic order
+        for topic, chunk in reversed(self._undelivered):
+            self._buffers[topic][:0] = chunk
+            self._buffer_bytes[topic] += sum(len(value) for _, value in chunk)
+            self.stats.buffered += len(chunk)
+            self.stats.undelivered -= len(chunk)
+        if self._undelivered:
+            self._undelivered.clear()
+            self._drained.clear()
+            self._pending.set()
+
+    def _settle(self, count: int) -> None:
+        self.stats.buffered -= count
+        if self.stats.buffered < self.max_buffered:
+            self._space.set()
+        if self._throttled and self.stats.buffered <= self.low_watermark:
+            self._throttled = False
+            self._runtime_call("mark_ready")
+        if not self.stats.buffered:
+            self._drained.set()
+
+    def _runtime_call(self, method: str) -> None:
+        runtime = getattr(self, "runtime", None)
+        if runtime is not None:
+            getattr(runtime, method)(self.name)
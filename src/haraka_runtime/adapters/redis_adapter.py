@@ -0,0 +1,520 @@
+import abc
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+from urllib.parse import unquote, urlsplit
+
+from haraka_runtime.core.interfaces import Adapter
+
+Command = Tuple[Any, ...]
+InvalidationCallback = Callable[[Optional[List[bytes]]], None]
+
+_MISS = object()
+
+
+class RedisError(Exception):
+    """Error reply returned by the server for a single command."""
+
+
+class Connection(abc.ABC):
+    """One connection able to send a pipeline of commands in a round trip."""
+
+    @abc.abstractmethod
+    async def execute_many(self, commands: Sequence[Command]) -> List[Any]:
+        """Return one reply per command; error replies come back as RedisError."""
+
+    @abc.abstractmethod
+    async def close(self): ...
+
+
+def encode_command(args: Command) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode()
+        else:
+            data = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Redis connection closed")
+    kind, body = line[:1], line[1:-2]
+    if kind == b"+":
+        return body.decode()
+    if kind == b"-":
+        return RedisError(body.decode())
+    if kind == b":":
+        return int(body)
+    if kind == b"$":
+        size = int(body)
+        if size < 0:
+            return None
+        return (await reader.readexactly(size + 2))[:-2]
+    if kind == b"*":
+        size = int(body)
+        if size < 0:
+            return None
+        return [await read_reply(reader) for _ in range(size)]
+    raise RedisError(f"Unexpected reply: {line!r}")
+
+
+class RespConnection(Connection):
+    """RESP2 connection over asyncio streams; a pipeline is one write, N reads."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def open(cls, url: str) -> "RespConnection":
+        parts = urlsplit(url)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname or "localhost",
+            parts.port or 6379,
+            ssl=parts.scheme == "rediss" or None,
+        )
+        conn = cls(reader, writer)
+        setup: List[Command] = []
+        if parts.password:
+            user = unquote(parts.username) if parts.username else None
+            password = unquote(parts.password)
+            setup.append(("AUTH", user, password) if user else ("AUTH", password))
+        if parts.path.strip("/"):
+            setup.append(("SELECT", parts.path.strip("/")))
+        replies = await conn.execute_many(setup) if setup else []
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                await conn.close()
+                raise reply
+        return conn
+
+    async def execute_many(self, commands: Sequence[Command]) -> List[Any]:
+        self.writer.write(b"".join(encode_command(c) for c in commands))
+        await self.writer.drain()
+        return [await read_reply(self.reader) for _ in commands]
+
+    async def read_push(self) -> Any:
+        return await read_reply(self.reader)
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+class InMemoryRedis:
+    """
+    In-process stand-in for a Redis server supporting the string commands the
+    adapter uses, key expiry and broadcast invalidation of written keys.
+    ``latency`` simulates one network round trip per pipeline.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.data: Dict[bytes, bytes] = {}
+        self.expires: Dict[bytes, float] = {}
+        self.round_trips = 0
+        self.connections = 0
+        self._trackers: List[InvalidationCallback] = []
+
+    async def connect(self) -> "InMemoryConnection":
+        self.connections += 1
+        return InMemoryConnection(self)
+
+    def track(self, callback: InvalidationCallback) -> Callable[[], None]:
+        self._trackers.append(callback)
+        return lambda: self._trackers.remove(callback)
+
+    def execute(self, command: Command) -> Any:
+        name, args = str(command[0]).upper(), [_to_bytes(a) for a in command[1:]]
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return RedisError(f"ERR unknown command '{name}'")
+        try:
+            return handler(*args)
+        except (TypeError, ValueError) as e:
+            return RedisError(f"ERR {e}")
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        deadline = self.expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.get(key)
+
+    def _written(self, *keys: bytes) -> None:
+        for callback in list(self._trackers):
+            callback(list(keys))
+
+    def _cmd_ping(self, *args: bytes) -> Any:
+        return args[0] if args else "PONG"
+
+    def _cmd_get(self, key: bytes) -> Optional[bytes]:
+        return self._live(key)
+
+    def _cmd_mget(self, *keys: bytes) -> List[Optional[bytes]]:
+        return [self._live(k) for k in keys]
+
+    def _cmd_set(self, key: bytes, value: bytes, *options: bytes) -> str:
+        self.data[key] = value
+        self.expires.pop(key, None)
+        opts = [o.upper() for o in options]
+        if b"EX" in opts:
+            seconds = float(opts[opts.index(b"EX") + 1])
+            self.expires[key] = time.monotonic() + seconds
+        self._written(key)
+        return "OK"
+
+    def _cmd_del(self, *keys: bytes) -> int:
+        removed = sum(self._live(k) is not None for k in keys)
+        for key in keys:
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        self._written(*keys)
+        return removed
+
+    def _cmd_incrby(self, key: bytes, amount: bytes) -> int:
+        value = int(self._live(key) or 0) + int(amount)
+        self.data[key] = str(value).encode()
+        self._written(key)
+        return value
+
+    def _cmd_incr(self, key: bytes) -> int:
+        return self._cmd_incrby(key, b"1")
+
+    def _cmd_flushall(self) -> str:
+        self.data.clear()
+        self.expires.clear()
+        for callback in list(self._trackers):
+            callback(None)
+        return "OK"
+
+
+class InMemoryConnection(Connection):
+    def __init__(self, server: InMemoryRedis):
+        self.server = server
+
+    async def execute_many(self, commands: Sequence[Command]) -> List[Any]:
+        self.server.round_trips += 1
+        if self.server.latency:
+            await asyncio.sleep(self.server.latency)
+        return [self.server.execute(c) for c in commands]
+
+    async def close(self):
+        pass
+
+
+def _to_bytes(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class ConnectionPool:
+    """Bounded pool of connections; ``acquire`` waits when all are in use."""
+
+    def __init__(
+        self, factory: Callable[[], Any], max_size: int = 10, min_idle: int = 1
+    ):
+        self.factory = factory
+        self.max_size = max_size
+        self.min_idle = min(min_idle, max_size)
+        self.size = 0
+        self._idle: "asyncio.Queue[Connection]" = asyncio.Queue()
+
+    async def warm(self) -> None:
+        """
+        Open ``min_idle`` connections concurrently.
+
+        Raises:
+            Exception: The first connection error, once the connections that
+                did open have been added to the pool
+        """
+        missing = self.min_idle - self.size
+        self.size += max(missing, 0)
+        results = await asyncio.gather(
+            *(self.factory() for _ in range(missing)), return_exceptions=True
+        )
+        error: Optional[BaseException] = None
+        for result in results:
+            if isinstance(result, BaseException):
+                self.size -= 1
+                error = error or result
+            else:
+                self._idle.put_nowait(result)
+        if error is not None:
+            raise error
+
+    async def acquire(self) -> Connection:
+        if self._idle.empty() and self.size < self.max_size:
+            self.size += 1
+            try:
+                return await self.factory()
+            except BaseException:
+                self.size -= 1
+                raise
+        return await self._idle.get()
+
+    def release(self, conn: Connection) -> None:
+        self._idle.put_nowait(conn)
+
+    async def discard(self, conn: Connection) -> None:
+        self.size -= 1
+        await conn.close()
+
+    async def close(self) -> None:
+        while not self._idle.empty():
+            await self.discard(self._idle.get_nowait())
+
+
+class ClientCache:
+    """LRU read cache with a per-entry TTL, invalidated by server pushes."""
+
+    def __init__(self, max_entries: int = 10_000, ttl: float = 60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.epoch = 0
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: bytes) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return _MISS
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: bytes, value: Any, epoch: int) -> None:
+        """Store ``value`` unless an invalidation arrived since ``epoch``."""
+        if epoch != self.epoch:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, keys: Optional[List[bytes]]) -> None:
+        self.epoch += 1
+        if keys is None:
+            self._entries.clear()
+            return
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisAdapter(Adapter):
+    """
+    Redis client with a pre-warmed connection pool and automatic pipelining.
+
+    Commands issued in the same event-loop tick are coalesced into a single
+    pipeline round trip (split across connections above ``max_pipeline``).
+    With ``client_cache=True``, ``get()`` serves hot keys from process memory;
+    entries expire after ``cache_ttl``, are evicted LRU beyond
+    ``cache_max_entries`` and are dropped when the server reports the key
+    changed (``CLIENT TRACKING`` invalidation pushes). ``url="memory://"``
+    runs against an ``InMemoryRedis`` stand-in.
+    """
+
+    def __init__(
+        self,
+        name: str = "redis",
+        url: Optional[str] = None,
+        pool_size: int = 10,
+        min_idle: int = 2,
+        max_pipeline: int = 1000,
+        client_cache: bool = False,
+        cache_ttl: float = 60.0,
+        cache_max_entries: int = 10_000,
+        server: Optional[InMemoryRedis] = None,
+    ):
+        self.name = name
+        self.url = url or os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+        if server is None and self.url.startswith("memory://"):
+            server = InMemoryRedis()
+        self.server = server
+        self.pool = ConnectionPool(self._connect, pool_size, min_idle)
+        self.max_pipeline = max_pipeline
+        self.client_cache = client_cache
+        self.cache_ttl = cache_ttl
+        self.cache_max_entries = cache_max_entries
+        self.cache: Optional[ClientCache] = None
+        self.pipelines_sent = 0
+
+        self._queue: List[Tuple[Command, asyncio.Future]] = []
+        self._flush_scheduled = False
+        self._inflight: Set[asyncio.Future] = set()
+        self._listener: Optional[asyncio.Task] = None
+        self._untrack: Optional[Callable[[], None]] = None
+        self._tracking_id: Optional[int] = None
+
+    async def startup(self):
+        if self.client_cache:
+            # Entries from a previous run missed invalidations: start empty
+            self.cache = ClientCache(self.cache_max_entries, self.cache_ttl)
+            await self._start_invalidation_listener()
+        await self.pool.warm()
+        runtime = getattr(self, "runtime", None)
+        if runtime is not None:
+            runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        if self._untrack is not None:
+            self._untrack()
+            self._untrack = None
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._tracking_id = None
+        self.cache = None
+        await self.pool.close()
+
+    async def health(self) -> bool:
+        return await self.execute("PING") in ("PONG", b"PONG")
+
+    def execute(self, *args: Any) -> "asyncio.Future[Any]":
+        """Queue a command for the next pipeline and return its reply future."""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((args, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return future
+
+    async def get(self, key: Union[str, bytes]) -> Optional[bytes]:
+        cache = self.cache
+        if cache is None:
+            return await self.execute("GET", key)
+        raw = _to_bytes(key)
+        cached = cache.get(raw)
+        if cached is not _MISS:
+            return cached
+        epoch = cache.epoch
+        value = await self.execute("GET", raw)
+        cache.put(raw, value, epoch)
+        return value
+
+    async def set(
+        self, key: Union[str, bytes], value: Any, ex: Optional[float] = None
+    ) -> Any:
+        if self.cache is not None:
+            self.cache.invalidate([_to_bytes(key)])
+        if ex is None:
+            return await self.execute("SET", key, value)
+        return await self.execute("SET", key, value, "EX", ex)
+
+    async def delete(self, *keys: Union[str, bytes]) -> int:
+        if self.cache is not None:
+            self.cache.invalidate([_to_bytes(k) for k in keys])
+        return await self.execute("DEL", *keys)
+
+    async def incr(self, key: Union[str, bytes], amount: int = 1) -> int:
+        return await self.execute("INCRBY", key, amount)
+
+    async def mget(self, *keys: Union[str, bytes]) -> List[Optional[bytes]]:
+        return await self.execute("MGET", *keys)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        for start in range(0, len(queue), self.max_pipeline):
+            chunk = queue[start : start + self.max_pipeline]
+            task = asyncio.ensure_future(self._send(chunk))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _send(self, chunk: List[Tuple[Command, asyncio.Future]]) -> None:
+        try:
+            conn = await self.pool.acquire()
+        except Exception as e:
+            _fail(chunk, e)
+            return
+        try:
+            replies = await conn.execute_many([command for command, _ in chunk])
+        except Exception as e:
+            await self.pool.discard(conn)
+            _fail(chunk, e)
+            return
+        self.pool.release(conn)
+        self.pipelines_sent += 1
+        for (_, future), reply in zip(chunk, replies):
+            if future.done():
+                continue
+            if isinstance(reply, RedisError):
+                future.set_exception(reply)
+            else:
+                future.set_result(reply)
+
+    async def _connect(self) -> Connection:
+        if self.server is not None:
+            return await self.server.connect()
+        conn = await RespConnection.open(self.url)
+        if self._tracking_id is not None:
+            (reply,) = await conn.execute_many(
+                [("CLIENT", "TRACKING", "ON", "REDIRECT", self._tracking_id)]
+            )
+            if isinstance(reply, RedisError):
+                await conn.close()
+                raise reply
+        return conn
+
+    async def _start_invalidation_listener(self) -> None:
+        assert self.cache is not None
+        if self.server is not None:
+            self._untrack = self.server.track(self.cache.invalidate)
+            return
+        conn = await RespConnection.open(self.url)
+        client_id, subscribed = await conn.execute_many(
+            [("CLIENT", "ID"), ("SUBSCRIBE", "__redis__:invalidate")]
+        )
+        if isinstance(client_id, RedisError):
+            await conn.close()
+            raise client_id
+        self._tracking_id = client_id
+        self._listener = asyncio.create_task(
+            self._listen(conn), name=f"{self.name}:invalidations"
+        )
+
+    async def _listen(self, conn: RespConnection) -> None:
+        cache = self.cache
+        assert cache is not None
+        try:
+            while True:
+                push = await conn.read_push()
+                if isinstance(push, list) and len(push) == 3 and push[0] == b"message":
+                    cache.invalidate(push[2])
+        except Exception:
+            # Without invalidations the cache could serve stale data: stop using
+            # it, and stop redirecting new connections' tracking to a dead client
+            cache.invalidate(None)
+            if self.cache is cache:
+                self.cache = None
+                self._tracking_id = None
+        finally:
+            await conn.close()
+
+
+def _fail(chunk: List[Tuple[Command, asyncio.Future]], error: Exception) -> None:
+    for _, future in chunk:
+        if not future.done():
+            future.set_exception(error)
@@ -11,6 +11,10 @@ class Adapter(abc.ABC):
     @abc.abstractmethod
     async def shutdown(self): ...
 
+    # Optional: override to have the orchestrator probe this adapter periodically
+    async def health(self) -> bool:
+        return True
+
 
 class DocsProvider(Protocol):
     docs_url: str
@@ -0,0 +1,98 @@
+import asyncio
+import importlib
+from types import ModuleType
+from typing import Any, Dict, Optional, Tuple, Type
+
+from haraka_runtime.core.interfaces import Adapter
+
+
+def parse_entrypoint(entrypoint: str) -> Tuple[str, str]:
+    module_path, sep, class_name = entrypoint.partition(":")
+    if not sep or not module_path or not class_name:
+        raise ValueError(f"Entrypoint must look like 'module:Class': {entrypoint}")
+    return module_path, class_name
+
+
+def import_entrypoint(entrypoint: str) -> Type[Adapter]:
+    """
+    Import ``module:Class`` and check that it implements ``Adapter``.
+
+    Raises:
+        ImportError: If the module or class cannot be found
+        TypeError: If the class is not an ``Adapter``
+    """
+    module_path, class_name = parse_entrypoint(entrypoint)
+    try:
+        module: ModuleType = importlib.import_module(module_path)
+        cls = getattr(module, class_name)
+    except (ImportError, AttributeError) as e:
+        raise ImportError(f"Failed to import adapter: {entrypoint}") from e
+
+    if not isinstance(cls, type) or not issubclass(cls, Adapter):
+        raise TypeError(f"{class_name} does not implement the Adapter interface")
+    return cls
+
+
+class LazyAdapter(Adapter):
+    """
+    Stand-in registered for a manifest with ``lazy: true``.
+
+    The entrypoint is imported (in the default executor, off the event loop)
+    and instantiated only when the orchestrator starts the adapter, so
+    adapters that are never started never pay for their imports.
+    """
+
+    def __init__(
+        self, name: str, entrypoint: str, settings: Optional[Dict[str, Any]] = None
+    ):
+        parse_entrypoint(entrypoint)
+        self.name = name
+        self.entrypoint = entrypoint
+        self.settings = dict(settings or {})
+        self.target: Optional[Adapter] = None
+        self._resolving: Optional[asyncio.Future] = None
+
+    async def resolve(self) -> Adapter:
+        """Import and instantiate the real adapter once; later calls reuse it."""
+        if self.target is not None:
+            return self.target
+        if self._resolving is None:
+            loop = asyncio.get_running_loop()
+            self._resolving = loop.run_in_executor(
+                None, import_entrypoint, self.entrypoint
+            )
+        try:
+            cls = await asyncio.shield(self._resolving)
+        except BaseException:
+            if self._resolving.done():
+                self._resolving = None
+            raise
+        if self.target is None:
+            target = cls(**self.settings)
+            target.name = self.name
+            if "runtime" in self.__dict__:
+                setattr(target, "runtime", self.__dict__["runtime"])
+            self.target = target
+        return self.target
+
+    async def startup(self):
+        target = await self.resolve()
+        await target.startup()
+
+    async def shutdown(self):
+        if self.target is not None:
+            await self.target.shutdown()
+
+    async def health(self) -> bool:
+        if self.target is None:
+            return True
+        return await self.target.health()
+
+    def __getattr__(self, item: str) -> Any:
+        target = self.__dict__.get("target")
+        if target is None:
+            raise AttributeError(
+                f"'{item}' is unavailable until lazy adapter "
+                f"'{self.__dict__.get('name')}' has been started"
+            )
+        return getattr(target, item)
@@ -1,43 +1,212 @@
-import importlib
+import glob
+import os
+import threading
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.loader.entrypoint import LazyAdapter, import_entrypoint
 from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.supervision import Backoff
 
+# libyaml's C loader is several times faster than the pure-Python one
+_YamlLoader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
-def load_adapter_from_manifest(path: Path, runtime: Orchestrator) -> Adapter:
-    """
-    Load and register an adapter defined by a adapter.yaml file.
+ACTIVATION_EAGER = "eager"
+ACTIVATION_ON_DEMAND = "on_demand"
 
-    Args:
-        path (Path): Path to the adapter.yaml file
-        runtime (Orchestrator): The Haraka Runtime instance
+_manifest_cache: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+_manifest_cache_lock = threading.Lock()
 
-    Returns:
-        Adapter: Instantiated and registered adapter
+
+class ManifestValidationError(ValueError):
+    """Raised by the bulk loader with every manifest error it found."""
+
+    def __init__(self, errors: List[Tuple[Path, Exception]]):
+        self.errors = errors
+        details = "\n".join(f"  {path}: {error}" for path, error in errors)
+        super().__init__(f"{len(errors)} invalid adapter manifest(s):\n{details}")
+
+
+def clear_manifest_cache() -> None:
+    with _manifest_cache_lock:
+        _manifest_cache.clear()
+
+
+def read_manifest(path: Path) -> Dict[str, Any]:
     """
-    manifest = yaml.safe_load(path.read_text())
+    Parse a manifest, reusing the cached result while its mtime and size match.
 
+    The returned dict is shared with the cache and must not be mutated.
+    """
+    stat = path.stat()
+    key = path.resolve()
+    with _manifest_cache_lock:
+        cached = _manifest_cache.get(key)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    manifest = yaml.load(path.read_bytes(), Loader=_YamlLoader) or {}
+    if not isinstance(manifest, dict):
+        raise ValueError(f"Manifest is not a mapping: {path}")
+    with _manifest_cache_lock:
+        _manifest_cache[key] = (stat.st_mtime_ns, stat.st_size, manifest)
+    return manifest
+
+
+def _build_adapter(manifest: Dict[str, Any], path: Path) -> Adapter:
     if not manifest.get("entrypoint"):
         raise ValueError(f"Missing 'entrypoint' in manifest: {path}")
 
-    module_path, class_name = manifest["entrypoint"].split(":")
-    try:
-        module: ModuleType = importlib.import_module(module_path)
-        cls = getattr(module, class_name)
-    except (ImportError, AttributeError) as e:
-        raise ImportError(f"Failed to import adapter: {manifest['entrypoint']}") from e
+    settings = manifest.get("settings", {})
+    if manifest.get("lazy"):
+        name = manifest.get("name") or settings.get("name")
+        if not name:
+            raise ValueError(f"Lazy manifest needs a 'name': {path}")
+        return LazyAdapter(name, manifest["entrypoint"], settings)
+
+    cls = import_entrypoint(manifest["entrypoint"])
+    return cls(**settings)
+
+
+def _startup_options(manifest: Dict[str, Any], path: Path) -> Dict[str, Any]:
+    """
+    ``Orchestrator.use`` keywords for when the adapter starts: ``optional``
+    (or ``background``) with a ``retry`` mapping of ``Backoff`` fields, or
+    ``activation: on_demand`` with an ``idle_timeout`` in seconds.
+    """
+    optional = bool(manifest.get("optional") or manifest.get("background"))
+    activation = manifest.get("activation", ACTIVATION_EAGER)
+    if activation not in (ACTIVATION_EAGER, ACTIVATION_ON_DEMAND):
+        raise ValueError(f"Unknown activation '{activation}' in manifest: {path}")
+    on_demand = activation == ACTIVATION_ON_DEMAND
+    if optional and on_demand:
+        raise ValueError(f"An optional adapter cannot be activated on demand: {path}")
+
+    idle_timeout = manifest.get("idle_timeout")
+    if idle_timeout is not None:
+        if not on_demand:
+            raise ValueError(f"'idle_timeout' only applies on demand: {path}")
+        if not isinstance(idle_timeout, (int, float)) or idle_timeout <= 0:
+            raise ValueError(f"'idle_timeout' must be a positive number: {path}")
 
-    if not issubclass(cls, Adapter):
-        raise TypeError(f"{class_name} does not implement the Adapter interface")
+    retry = manifest.get("retry")
+    if retry is not None:
+        if not optional:
+            raise ValueError(f"'retry' only applies to optional adapters: {path}")
+        if not isinstance(retry, dict):
+            raise ValueError(f"'retry' is not a mapping: {path}")
+        try:
+            retry = Backoff(**retry)
+        except TypeError as e:
+            raise ValueError(f"Invalid 'retry' in manifest {path}: {e}") from None
+    return {
+        "optional": optional,
+        "retry": retry,
+        "on_demand": on_demand,
+        "idle_timeout": idle_timeout,
+    }
 
-    adapter = cls(**manifest.get("settings", {}))
 
+def _register(
+    runtime: Orchestrator, adapter: Adapter, manifest: Dict[str, Any], path: Path
+):
     runtime.use(
         adapter,
         priority=manifest.get("priority", 0),
         dependencies=manifest.get("dependencies", []),
+        resources=manifest.get("resources"),
+        **_startup_options(manifest, path),
     )
+
+
+def load_adapter_from_manifest(path: Path, runtime: Orchestrator) -> Adapter:
+    """
+    Load and register an adapter defined by a adapter.yaml file.
+
+    Args:
+        path (Path): Path to the adapter.yaml file
+        runtime (Orchestrator): The Haraka Runtime instance
+
+    Returns:
+        Adapter: Instantiated and registered adapter
+    """
+    manifest = read_manifest(path)
+    _startup_options(manifest, path)
+    adapter = _build_adapter(manifest, path)
+    _register(runtime, adapter, manifest, path)
     return adapter
+
+
+def discover_manifests(
+    source: Union[str, Path, Iterable[Path]], pattern: str = "service.yaml"
+) -> List[Path]:
+    """
+    Expand a directory (searched recursively for ``pattern``), a glob
+    expression or an explicit collection of paths into sorted manifest paths.
+    """
+    if isinstance(source, (str, Path)):
+        if Path(source).is_dir():
+            return sorted(Path(source).rglob(pattern))
+        return sorted(Path(p) for p in glob.glob(str(source), recursive=True))
+    return sorted(Path(p) for p in source)
+
+
+def load_adapters_from_manifests(
+    source: Union[str, Path, Iterable[Path]],
+    runtime: Orchestrator,
+    pattern: str = "service.yaml",
+    max_workers: Optional[int] = None,
+) -> List[Adapter]:
+    """
+    Load and register every adapter found under ``source`` in one batch.
+
+    Manifests are read and parsed in parallel on a thread pool; entrypoints are
+    then imported and instantiated on the calling thread. Nothing is registered
+    unless every manifest is valid.
+
+    Args:
+        source: Directory, glob expression or iterable of manifest paths
+        runtime (Orchestrator): The Haraka Runtime instance
+        pattern (str): File name matched when ``source`` is a directory
+        max_workers (Optional[int]): Size of the parsing thread pool
+
+    Returns:
+        List[Adapter]: Instantiated adapters, in manifest path order
+
+    Raises:
+        ManifestValidationError: Listing every manifest that failed.
+    """
+    paths = discover_manifests(source, pattern)
+    errors: List[Tuple[Path, Exception]] = []
+
+    def parse(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return read_manifest(path)
+        except Exception as e:
+            errors.append((path, e))
+            return None
+
+    workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        manifests = list(pool.map(parse, paths))
+
+    loaded: List[Tuple[Adapter, Dict[str, Any], Path]] = []
+    for path, manifest in zip(paths, manifests):
+        if manifest is None:
+            continue
+        try:
+            _startup_options(manifest, path)
+            loaded.append((_build_adapter(manifest, path), manifest, path))
+        except (ValueError, ImportError, TypeError) as e:
+            errors.append((path, e))
+
+    if errors:
+        errors.sort(key=lambda item: str(item[0]))
+        raise ManifestValidationError(errors)
+
+    for adapter, manifest, path in loaded:
+        _register(runtime, adapter, manifest, path)
+    return [adapter for adapter, _, _ in loaded]
@@ -0,0 +1,256 @@
+"""
+Precompiled startup plans.
+
+``compile_startup_plan`` runs the full manifest path once (parse, import and
+validate every entrypoint, resolve the dependency order) and captures the
+result, with a hash of the manifests' contents, as JSON. At image build time::
+
+    python -m haraka_runtime.loader.startup_plan services/ -o startup-plan.json
+
+``load_startup_plan`` then registers adapters straight from the plan, skipping
+YAML parsing, ``Adapter`` validation and order resolution. If the plan is
+missing, unreadable or its hash no longer matches the manifests, it falls back
+to ``load_adapters_from_manifests``.
+"""
+
+import argparse
+import hashlib
+import importlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.loader.entrypoint import LazyAdapter, parse_entrypoint
+from haraka_runtime.loader.manifest_loader import (
+    discover_manifests,
+    load_adapters_from_manifests,
+    read_manifest,
+)
+from haraka_runtime.orchestrator.graph import StartPlan
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.supervision import Backoff
+
+PLAN_VERSION = 1
+
+Source = Union[str, Path, Iterable[Path]]
+
+
+@dataclass(frozen=True)
+class PlannedAdapter:
+    name: str
+    entrypoint: str
+    settings: Dict[str, Any]
+    priority: int
+    dependencies: Tuple[str, ...]
+    lazy: bool = False
+    resources: Tuple[str, ...] = ()
+    optional: bool = False
+    # ``Backoff`` fields for retrying an optional adapter's startup
+    retry: Optional[Dict[str, Any]] = None
+    on_demand: bool = False
+    idle_timeout: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class CompiledPlan:
+    """Adapters in registration order plus their resolved ``StartPlan``."""
+
+    manifest_hash: str
+    adapters: Tuple[PlannedAdapter, ...]
+    order: Tuple[str, ...]
+    waves: Tuple[Tuple[str, ...], ...]
+    version: int = PLAN_VERSION
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2, sort_keys=True) + "\n"
+
+    @classmethod
+    def from_json(cls, text: str) -> "CompiledPlan":
+        data = json.loads(text)
+        if data.get("version") != PLAN_VERSION:
+            raise ValueError(f"Unsupported startup plan version: {data.get('version')}")
+        return cls(
+            manifest_hash=data["manifest_hash"],
+            adapters=tuple(
+                PlannedAdapter(
+                    **{
+                        **a,
+                        "dependencies": tuple(a["dependencies"]),
+                        "resources": tuple(a.get("resources", ())),
+                    }
+                )
+                for a in data["adapters"]
+            ),
+            order=tuple(data["order"]),
+            waves=tuple(tuple(wave) for wave in data["waves"]),
+        )
+
+
+def hash_manifests(paths: Iterable[Path]) -> str:
+    """
+    SHA-256 over the manifests' raw bytes and their paths relative to one
+    another, so the hash survives moving the tree. Nothing is parsed.
+    """
+    paths = sorted(Path(p) for p in paths)
+    root = os.path.commonpath([p.parent for p in paths]) if paths else ""
+    digest = hashlib.sha256(f"haraka-startup-plan/{PLAN_VERSION}".encode())
+    for path in paths:
+        data = path.read_bytes()
+        relative = path.relative_to(root).as_posix()
+        digest.update(f"\0{relative}\0{len(data)}\0".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def compile_startup_plan(source: Source, pattern: str = "service.yaml") -> CompiledPlan:
+    """
+    Load ``source`` through the full manifest path and capture the result.
+
+    Raises:
+        ManifestValidationError: If any manifest is invalid.
+        RuntimeError: On an unknown dependency or a dependency cycle.
+    """
+    paths = discover_manifests(source, pattern)
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    adapters = load_adapters_from_manifests(paths, runtime)
+
+    planned = []
+    for path, adapter in zip(paths, adapters):
+        manifest = read_manifest(path)
+        _, priority, deps = runtime._registry[adapter.name]
+        retry = runtime._optional.get(adapter.name)
+        activation = runtime._on_demand.get(adapter.name)
+        planned.append(
+            PlannedAdapter(
+                name=adapter.name,
+                entrypoint=manifest["entrypoint"],
+                settings=dict(manifest.get("settings", {})),
+                priority=priority,
+                dependencies=tuple(deps),
+                lazy=bool(manifest.get("lazy")),
+                resources=tuple(manifest.get("resources") or ()),
+                optional=retry is not None,
+                retry=asdict(retry) if retry is not None else None,
+                on_demand=activation is not None,
+                idle_timeout=activation.idle_timeout if activation else None,
+            )
+        )
+    resolved = runtime._graph.resolve()
+    return CompiledPlan(
+        manifest_hash=hash_manifests(paths),
+        adapters=tuple(planned),
+        order=resolved.order,
+        waves=resolved.waves,
+    )
+
+
+def write_startup_plan(plan: CompiledPlan, path: Path) -> None:
+    path.write_text(plan.to_json())
+
+
+def read_startup_plan(path: Path) -> CompiledPlan:
+    return CompiledPlan.from_json(path.read_text())
+
+
+def load_startup_plan(
+    plan_path: Path,
+    source: Source,
+    runtime: Orchestrator,
+    pattern: str = "service.yaml",
+) -> List[Adapter]:
+    """
+    Register the adapters described by the plan at ``plan_path``.
+
+    The plan is used only if its hash matches the manifests currently under
+    ``source``; otherwise the manifests are loaded the normal way. Its start
+    order is adopted only if the runtime holds exactly the planned adapters.
+
+    Args:
+        plan_path (Path): Plan written by ``write_startup_plan``
+        source: Directory, glob expression or iterable of manifest paths
+        runtime (Orchestrator): The Haraka Runtime instance
+        pattern (str): File name matched when ``source`` is a directory
+
+    Returns:
+        List[Adapter]: Instantiated adapters, in registration order
+    """
+    paths = discover_manifests(source, pattern)
+    try:
+        plan = read_startup_plan(plan_path)
+        reason = None if plan.manifest_hash == hash_manifests(paths) else "stale"
+        adapters = _instantiate(plan) if reason is None else []
+    except (
+        OSError,
+        ValueError,
+        KeyError,
+        TypeError,
+        ImportError,
+        AttributeError,
+    ) as e:
+        reason = str(e) or type(e).__name__
+    if reason is not None:
+        runtime.logger.warn(
+            "⚠️ Startup plan unusable, loading manifests", extra={"reason": reason}
+        )
+        return load_adapters_from_manifests(paths, runtime)
+
+    for adapter, planned in zip(adapters, plan.adapters):
+        runtime.use(
+            adapter,
+            planned.priority,
+            list(planned.dependencies),
+            resources=list(planned.resources),
+            optional=planned.optional,
+            retry=Backoff(**planned.retry) if planned.retry else None,
+            on_demand=planned.on_demand,
+            idle_timeout=planned.idle_timeout,
+        )
+    # Adapters registered outside the plan (a gRPC or HTTP server, say) make
+    # its order incomplete; the graph is then resolved as usual at run()
+    try:
+        runtime.adopt_start_plan(StartPlan(plan.order, plan.waves))
+    except ValueError as e:
+        runtime.logger.warn(
+            "⚠️ Startup plan order not adopted, resolving it at startup",
+            extra={"reason": str(e)},
+        )
+    return adapters
+
+
+def _instantiate(plan: CompiledPlan) -> List[Adapter]:
+    # Entrypoints were validated when the plan was compiled; only import them
+    adapters: List[Adapter] = []
+    for planned in plan.adapters:
+        if planned.lazy:
+            adapter: Adapter = LazyAdapter(
+                planned.name, planned.entrypoint, planned.settings
+            )
+        else:
+            module_path, class_name = parse_entrypoint(planned.entrypoint)
+            cls = getattr(importlib.import_module(module_path), class_name)
+            adapter = cls(**planned.settings)
+        if adapter.name != planned.name:
+            raise ValueError(
+                f"{planned.entrypoint} is now named '{adapter.name}', "
+                f"plan expects '{planned.name}'"
+            )
+        adapters.append(adapter)
+    return adapters
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Compile a Haraka startup plan")
+    parser.add_argument("source", help="Manifest directory or glob")
+    parser.add_argument("-o", "--output", type=Path, default=Path("startup-plan.json"))
+    parser.add_argument("--pattern", default="service.yaml")
+    args = parser.parse_args(argv)
+    plan = compile_startup_plan(args.source, args.pattern)
+    write_startup_plan(plan, args.output)
+    print(f"Compiled {len(plan.adapters)} adapter(s) into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
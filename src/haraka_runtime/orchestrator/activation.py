@@ -0,0 +1,120 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+
+class OnDemand:
+    """
+    Starts one adapter on first use and, optionally, stops it when idle.
+
+    ``activate()`` runs ``start`` once; concurrent first callers wait on the
+    same in-flight startup, and a failed startup is retried by the next
+    caller; ``cancel()`` abandons it. With ``idle_timeout``, ``stop`` runs once the adapter has gone
+    that long without being activated or held (see ``hold``); the next use
+    starts it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        start: Callable[[], Awaitable[None]],
+        stop: Callable[[], Awaitable[None]],
+        idle_timeout: Optional[float] = None,
+    ):
+        if idle_timeout is not None and idle_timeout <= 0:
+            raise ValueError("idle_timeout must be positive")
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self.active = False
+        self.users = 0
+        self.activations = 0
+        self.closed = False
+        self._start = start
+        self._stop = stop
+        self._starting: Optional[asyncio.Future] = None
+        self._stopping: Optional[asyncio.Future] = None
+        self._idle: Optional[asyncio.TimerHandle] = None
+
+    async def activate(self) -> None:
+        """
+        Start the adapter unless it is already running.
+
+        Raises:
+            Exception: Whatever the startup raised, to every waiting caller
+            RuntimeError: If the startup was cancelled
+        """
+        while self._stopping is not None:
+            await asyncio.shield(self._stopping)
+        if not self.active:
+            if self._starting is None:
+                self._starting = asyncio.ensure_future(self._run_start())
+            starting = self._starting
+            try:
+                # One caller giving up must not cancel the startup the others await
+                await asyncio.shield(starting)
+            except asyncio.CancelledError:
+                if not starting.cancelled():
+                    raise
+                raise RuntimeError(f"Startup of '{self.name}' was cancelled") from None
+        self._touch()
+
+    @asynccontextmanager
+    async def hold(self) -> AsyncIterator[None]:
+        """Activate the adapter and keep it from idling out until exit."""
+        self.users += 1
+        self._cancel_idle()
+        try:
+            await self.activate()
+            yield
+        finally:
+            self.users -= 1
+            self._touch()
+
+    def reset(self) -> None:
+        """Forget the adapter was running, after it was stopped externally."""
+        self._cancel_idle()
+        self.active = False
+
+    def close(self) -> None:
+        """Stop idle tracking for good, e.g. at shutdown."""
+        self.closed = True
+        self._cancel_idle()
+
+    async def cancel(self) -> None:
+        """Cancel an in-flight startup and wait for it to unwind."""
+        starting = self._starting
+        if starting is not None:
+            starting.cancel()
+            await asyncio.gather(starting, return_exceptions=True)
+
+    async def _run_start(self) -> None:
+        try:
+            await self._start()
+            self.active = True
+            self.activations += 1
+        finally:
+            self._starting = None
+
+    async def _run_stop(self) -> None:
+        try:
+            await self._stop()
+        finally:
+            self.active = False
+            self._stopping = None
+
+    def _touch(self) -> None:
+        self._cancel_idle()
+        if self.idle_timeout is None or self.users or not self.active or self.closed:
+            return
+        loop = asyncio.get_running_loop()
+        self._idle = loop.call_later(self.idle_timeout, self._expire)
+
+    def _expire(self) -> None:
+        self._idle = None
+        if self.active and not self.users and not self.closed and not self._stopping:
+            self._stopping = asyncio.ensure_future(self._run_stop())
+
+    def _cancel_idle(self) -> None:
+        if self._idle is not None:
+            self._idle.cancel()
+            self._idle = None
@@ -0,0 +1,282 @@
+import asyncio
+from collections import deque
+from typing import (
+    AsyncIterator,
+    Deque,
+    Dict,
+    Generic,
+    Iterable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+)
+
+from haraka_runtime.orchestrator.log import OverflowPolicy
+from haraka_runtime.orchestrator.metrics import Counter, Family, MetricsRegistry
+
+T = TypeVar("T")
+
+
+class BusClosed(RuntimeError):
+    """Raised when receiving from a subscription that is closed and drained."""
+
+
+class Subscription(Generic[T]):
+    """
+    One subscriber's bounded queue on a topic.
+
+    When the queue holds ``maxsize`` items, ``overflow`` decides whether
+    publishers wait for room (``BLOCK``) or the newest or oldest item is
+    dropped (counted in ``dropped``). Payloads are queued by reference.
+    """
+
+    def __init__(
+        self,
+        topic: "Topic[T]",
+        name: str,
+        maxsize: int,
+        overflow: OverflowPolicy,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.topic = topic
+        self.name = name
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self.closed = False
+        self._items: Deque[T] = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def get(self, timeout: Optional[float] = None) -> T:
+        """
+        Receive the next item.
+
+        Raises:
+            asyncio.TimeoutError: If nothing arrives within ``timeout``
+            BusClosed: Once the subscription is closed and drained
+        """
+        if not await self._wait(timeout):
+            raise asyncio.TimeoutError()
+        item = self._items.popleft()
+        self._taken()
+        return item
+
+    async def get_batch(
+        self, max_items: int = 100, timeout: Optional[float] = None
+    ) -> List[T]:
+        """
+        Wait for at least one item and return up to ``max_items`` of them;
+        an empty list if nothing arrives within ``timeout``.
+
+        Raises:
+            BusClosed: Once the subscription is closed and drained
+        """
+        if not await self._wait(timeout):
+            return []
+        items = self._items
+        batch = [items.popleft() for _ in range(min(max_items, len(items)))]
+        self._taken()
+        return batch
+
+    async def batches(self, max_items: int = 100) -> AsyncIterator[List[T]]:
+        """Yield batches until the subscription is closed and drained."""
+        while True:
+            try:
+                yield await self.get_batch(max_items)
+            except BusClosed:
+                return
+
+    def __aiter__(self) -> AsyncIterator[T]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[T]:
+        while True:
+            try:
+                yield await self.get()
+            except BusClosed:
+                return
+
+    def close(self) -> None:
+        """Unsubscribe; items already queued can still be received."""
+        if self.closed:
+            return
+        self.closed = True
+        self.topic._unsubscribe(self)
+        # Wake receivers and blocked publishers so they see the close
+        self._not_empty.set()
+        self._not_full.set()
+
+    def _offer(self, item: T) -> bool:
+        """Queue ``item`` without waiting; False if a ``BLOCK`` queue is full."""
+        items = self._items
+        if len(items) >= self.maxsize:
+            if self.overflow is OverflowPolicy.BLOCK:
+                self._not_full.clear()
+                return False
+            self.dropped += 1
+            if self.overflow is OverflowPolicy.DROP_NEWEST:
+                return True
+            items.popleft()
+        items.append(item)
+        self._not_empty.set()
+        return True
+
+    async def _put(self, item: T) -> None:
+        while not self._offer(item):
+            await self._not_full.wait()
+            if self.closed:
+                return  # nobody left to deliver to
+
+    async def _wait(self, timeout: Optional[float]) -> bool:
+        while not self._items:
+            if self.closed:
+                raise BusClosed(f"Subscription '{self.name}' is closed")
+            self._not_empty.clear()
+            try:
+                await asyncio.wait_for(self._not_empty.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def _taken(self) -> None:
+        if not self._items and not self.closed:
+            self._not_empty.clear()
+        self._not_full.set()
+
+
+class Topic(Generic[T]):
+    """A named stream of ``payload_type`` items fanned out to every subscription."""
+
+    def __init__(
+        self, name: str, payload_type: Type[T], published: Optional[Counter] = None
+    ):
+        self.name = name
+        self.payload_type = payload_type
+        self.subscriptions: List[Subscription[T]] = []
+        self._published = published or Counter()
+
+    @property
+    def published(self) -> int:
+        return int(self._published.value)
+
+    def subscribe(
+        self,
+        name: str,
+        maxsize: int = 1000,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ) -> Subscription[T]:
+        if any(sub.name == name for sub in self.subscriptions):
+            raise ValueError(f"'{name}' is already subscribed to '{self.name}'")
+        subscription = Subscription(self, name, maxsize, overflow)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    async def publish(self, item: T) -> None:
+        """
+        Deliver ``item`` to every subscription, waiting for room in ``BLOCK``
+        queues.
+
+        Raises:
+            TypeError: If ``item`` is not an instance of the topic's type
+        """
+        if not isinstance(item, self.payload_type):
+            raise TypeError(
+                f"Topic '{self.name}' carries {self.payload_type.__name__}, "
+                f"got {type(item).__name__}"
+            )
+        self._published.value += 1
+        for subscription in list(self.subscriptions):
+            if not subscription._offer(item):
+                await subscription._put(item)
+
+    async def publish_batch(self, items: Iterable[T]) -> None:
+        """Deliver ``items`` in order, as ``publish`` does for each."""
+        items = list(items)
+        for item in items:
+            if not isinstance(item, self.payload_type):
+                raise TypeError(
+                    f"Topic '{self.name}' carries {self.payload_type.__name__}, "
+                    f"got {type(item).__name__}"
+                )
+        self._published.value += len(items)
+        for subscription in list(self.subscriptions):
+            for item in items:
+                if not subscription._offer(item):
+                    await subscription._put(item)
+
+    def _unsubscribe(self, subscription: Subscription[T]) -> None:
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe between adapters.
+
+    ``topic(name, payload_type)`` returns the same ``Topic`` for every caller, so a
+    producer and its consumers only share the topic name and payload type.
+    Payloads are passed by reference and never copied; publish a
+    ``memoryview`` to hand out a zero-copy window onto a buffer. With a
+    ``metrics`` registry, queue depths, drops and publish counts are exported.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRegistry] = None):
+        self._topics: Dict[str, Topic] = {}
+        self._published: Optional[Family[Counter]] = None
+        if metrics is not None:
+            self._published = metrics.counter(
+                "haraka_bus_published_total", "Items published to a topic", ["topic"]
+            )
+            self._depth = metrics.gauge(
+                "haraka_bus_queue_depth",
+                "Items waiting in a subscriber's queue",
+                ["topic", "subscriber"],
+            )
+            self._dropped = metrics.counter(
+                "haraka_bus_dropped_total",
+                "Items dropped from a full subscriber queue",
+                ["topic", "subscriber"],
+            )
+            metrics.collector(self._collect)
+
+    def topic(
+        self, name: str, payload_type: Type[T] = object  # type: ignore[assignment]
+    ) -> Topic[T]:
+        """
+        Get or create topic ``name`` carrying ``payload_type`` items.
+
+        Raises:
+            TypeError: If the topic exists with a different payload type
+        """
+        topic = self._topics.get(name)
+        if topic is None:
+            published = self._published.labels(name) if self._published else None
+            topic = self._topics[name] = Topic(name, payload_type, published)
+        elif topic.payload_type is not payload_type:
+            raise TypeError(
+                f"Topic '{name}' carries {topic.payload_type.__name__}, "
+                f"not {payload_type.__name__}"
+            )
+        return topic
+
+    def topics(self) -> List[str]:
+        return list(self._topics)
+
+    def close(self) -> None:
+        """Close every subscription; receivers drain what is queued, then stop."""
+        for topic in self._topics.values():
+            for subscription in list(topic.subscriptions):
+                subscription.close()
+
+    def _collect(self) -> None:
+        for topic in self._topics.values():
+            for sub in topic.subscriptions:
+                self._depth.labels(topic.name, sub.name).value = len(sub)
+                self._dropped.labels(topic.name, sub.name).value = sub.dropped
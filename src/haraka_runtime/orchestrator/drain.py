@@ -0,0 +1,61 @@
+import asyncio
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+
+class AdmissionClosed(RuntimeError):
+    """Raised when new work is offered after the runtime started draining."""
+
+
+class WorkTracker:
+    """
+    Counts in-flight units of work (requests, batches, jobs) per owner.
+
+    Wrap each unit in ``with tracker.track(owner):``. Once ``close()`` is
+    called no new work is admitted (``track`` raises ``AdmissionClosed``) and
+    ``wait_idle`` waits for the work already admitted to finish.
+    """
+
+    def __init__(self) -> None:
+        self.admitting = True
+        self._counts: Dict[str, int] = {}
+        self._total = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    @contextmanager
+    def track(self, owner: str) -> Iterator[None]:
+        if not self.admitting:
+            raise AdmissionClosed(f"Not admitting new work for '{owner}': draining")
+        self._counts[owner] = self._counts.get(owner, 0) + 1
+        self._total += 1
+        try:
+            yield
+        finally:
+            self._counts[owner] -= 1
+            if not self._counts[owner]:
+                del self._counts[owner]
+            self._total -= 1
+            if not self._total and self._idle is not None:
+                self._idle.set()
+
+    def in_flight(self, owner: Optional[str] = None) -> int:
+        return self._total if owner is None else self._counts.get(owner, 0)
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self._counts)
+
+    def close(self) -> None:
+        """Stop admitting new work."""
+        self.admitting = False
+
+    async def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until nothing is in flight; returns False if ``timeout`` passes first."""
+        if not self._total:
+            return True
+        if self._idle is None or self._idle.is_set():
+            self._idle = asyncio.Event()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
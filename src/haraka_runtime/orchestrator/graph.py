@@ -0,0 +1,132 @@
+import heapq
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class StartPlan:
+    """Resolved startup plan: a priority-aware topological order and its waves."""
+
+    order: Tuple[str, ...]
+    waves: Tuple[Tuple[str, ...], ...]
+
+
+class DependencyGraph:
+    """
+    Adapter dependency graph maintained incrementally as adapters register.
+
+    Keeps a forward index (adapter -> its dependencies) and a reverse index
+    (adapter -> adapters depending on it) so lookups in either direction are
+    O(1). The resolved ``StartPlan`` is cached until the graph changes.
+    """
+
+    def __init__(self) -> None:
+        self._priority: Dict[str, int] = {}
+        self._seq: Dict[str, int] = {}
+        self._dependencies: Dict[str, Tuple[str, ...]] = {}
+        self._dependents: Dict[str, List[str]] = {}
+        self._plan: Optional[StartPlan] = None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._dependencies
+
+    def __len__(self) -> int:
+        return len(self._dependencies)
+
+    def add(self, name: str, priority: int, dependencies: Iterable[str]) -> None:
+        if name in self._dependencies:
+            raise ValueError(f"Adapter '{name}' is already in the graph")
+        deps = tuple(dict.fromkeys(dependencies))
+        self._priority[name] = priority
+        self._seq[name] = len(self._seq)
+        self._dependencies[name] = deps
+        for dep in deps:
+            self._dependents.setdefault(dep, []).append(name)
+        self._plan = None
+
+    def dependencies(self, name: str) -> Tuple[str, ...]:
+        return self._dependencies[name]
+
+    def dependents(self, name: str) -> List[str]:
+        return self._dependents.get(name, [])
+
+    def dependent_closure(self, name: str) -> Tuple[str, ...]:
+        """``name`` plus everything depending on it, transitively, in start order."""
+        seen = {name}
+        stack = [name]
+        while stack:
+            for dependent in self.dependents(stack.pop()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    stack.append(dependent)
+        return tuple(n for n in self.resolve().order if n in seen)
+
+    def resolve(self) -> StartPlan:
+        """
+        Resolve the start order with Kahn's algorithm in O((V + E) log V).
+
+        Among adapters whose dependencies are all satisfied, the highest
+        priority goes first (registration order breaks ties), so priority never
+        overrides a dependency edge.
+
+        Raises:
+            RuntimeError: On an unknown dependency or a dependency cycle.
+        """
+        if self._plan is not None:
+            return self._plan
+
+        missing: Dict[str, int] = {}
+        for name, deps in self._dependencies.items():
+            for dep in deps:
+                if dep not in self._dependencies:
+                    raise RuntimeError(
+                        f"Unknown dependency '{dep}' for adapter '{name}'"
+                    )
+            missing[name] = len(deps)
+
+        heap = [self._heap_key(name) for name, count in missing.items() if not count]
+        heapq.heapify(heap)
+        order: List[str] = []
+        level: Dict[str, int] = {}
+        waves: List[List[str]] = []
+        while heap:
+            name = heapq.heappop(heap)[2]
+            order.append(name)
+            depth = max((level[dep] + 1 for dep in self._dependencies[name]), default=0)
+            level[name] = depth
+            if depth == len(waves):
+                waves.append([])
+            waves[depth].append(name)
+            for dependent in self.dependents(name):
+                missing[dependent] -= 1
+                if not missing[dependent]:
+                    heapq.heappush(heap, self._heap_key(dependent))
+
+        if len(order) != len(self._dependencies):
+            stuck = [name for name, count in missing.items() if count]
+            raise RuntimeError(
+                f"Circular dependency detected at {stuck[0]} "
+                f"(unresolved: {', '.join(stuck)})"
+            )
+
+        self._plan = StartPlan(tuple(order), tuple(tuple(w) for w in waves))
+        return self._plan
+
+    def adopt(self, plan: StartPlan) -> None:
+        """
+        Use a previously resolved plan for the current graph instead of resolving.
+
+        Raises:
+            ValueError: If the plan does not cover exactly the registered adapters
+                or orders an adapter before one of its dependencies.
+        """
+        if sorted(plan.order) != sorted(self._dependencies):
+            raise ValueError("Start plan does not match the registered adapters")
+        position = {name: i for i, name in enumerate(plan.order)}
+        for name, deps in self._dependencies.items():
+            if any(position[dep] > position[name] for dep in deps):
+                raise ValueError(f"Start plan starts '{name}' before its dependencies")
+        self._plan = plan
+
+    def _heap_key(self, name: str) -> Tuple[int, int, str]:
+        return (-self._priority[name], self._seq[name], name)
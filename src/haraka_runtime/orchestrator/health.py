@@ -0,0 +1,144 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+HealthCheck = Callable[[], Awaitable[bool]]
+
+NOT_STARTED = "not started"
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    healthy: bool
+    checked_at: float
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class HealthSnapshot:
+    """Aggregated view of the latest result of every health check."""
+
+    healthy: bool
+    checks: Dict[str, Optional[CheckResult]] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "healthy": self.healthy,
+            "checks": {
+                name: None if result is None else result.__dict__
+                for name, result in self.checks.items()
+            },
+        }
+
+
+class HealthMonitor:
+    """
+    Runs adapter health checks in the background and caches their results.
+
+    Each check runs immediately when the monitor starts and then every
+    ``interval`` seconds (randomised by ``±jitter`` so replicas don't probe a
+    backend in lockstep), bounded by ``timeout``. A check that has not reported
+    yet counts as failing. Readers only ever see cached data: ``healthy`` is
+    O(1) and ``snapshot()`` is rebuilt only after a new result arrives.
+
+    While ``is_active(name)`` is false (the adapter is not running) its check
+    is not called; it is reported unhealthy with ``NOT_STARTED`` as the error
+    but does not count against ``healthy``.
+    """
+
+    def __init__(
+        self,
+        interval: float = 10.0,
+        timeout: float = 2.0,
+        jitter: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+        is_active: Optional[Callable[[str], bool]] = None,
+    ):
+        self.interval = interval
+        self.timeout = timeout
+        self.jitter = jitter
+        self.clock = clock
+        self.is_active = is_active
+        self._checks: Dict[str, HealthCheck] = {}
+        self._results: Dict[str, Optional[CheckResult]] = {}
+        self._failing: Set[str] = set()
+        self._noncritical: Set[str] = set()
+        self._snapshot: Optional[HealthSnapshot] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    def register(self, name: str, check: HealthCheck, critical: bool = True) -> None:
+        """Add a check; failures of a non-``critical`` one don't affect ``healthy``."""
+        self._checks[name] = check
+        self._results[name] = None
+        if critical:
+            self._failing.add(name)
+        else:
+            self._noncritical.add(name)
+        self._snapshot = None
+
+    @property
+    def healthy(self) -> bool:
+        return not self._failing
+
+    def snapshot(self) -> HealthSnapshot:
+        if self._snapshot is None:
+            self._snapshot = HealthSnapshot(self.healthy, dict(self._results))
+        return self._snapshot
+
+    async def check(self, name: str) -> CheckResult:
+        """Run one check now and cache its result."""
+        if self.is_active is not None and not self.is_active(name):
+            result = CheckResult(False, self.clock(), 0.0, NOT_STARTED)
+            self._record(name, result, probed=False)
+            return result
+        began = self.clock()
+        error: Optional[str] = None
+        try:
+            healthy = bool(await asyncio.wait_for(self._checks[name](), self.timeout))
+        except asyncio.TimeoutError:
+            healthy, error = False, f"timed out after {self.timeout}s"
+        except Exception as e:
+            healthy, error = False, str(e) or type(e).__name__
+        ended = self.clock()
+        result = CheckResult(healthy, ended, ended - began, error)
+        self._record(name, result)
+        return result
+
+    async def check_all(self) -> HealthSnapshot:
+        await asyncio.gather(*(self.check(name) for name in self._checks))
+        return self.snapshot()
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._running = True
+        for name in self._checks:
+            task = asyncio.create_task(self._run(name), name=f"health:{name}")
+            self._tasks.append(task)
+
+    async def stop(self) -> None:
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _run(self, name: str) -> None:
+        # On Python < 3.12 wait_for() can swallow a cancel that races with the
+        # check completing, so the loop also watches the flag
+        while self._running:
+            await self.check(name)
+            spread = self.interval * self.jitter
+            await asyncio.sleep(self.interval + random.uniform(-spread, spread))
+
+    def _record(self, name: str, result: CheckResult, probed: bool = True) -> None:
+        self._results[name] = result
+        if result.healthy or not probed or name in self._noncritical:
+            self._failing.discard(name)
+        else:
+            self._failing.add(name)
+        self._snapshot = None
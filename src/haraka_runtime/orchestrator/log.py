@@ -0,0 +1,218 @@
+import os
+import queue
+import sys
+import threading
+import time
+from enum import Enum, IntEnum, auto
+from typing import Any, Optional, TextIO, Tuple
+
+from haraka.utils import Logger
+
+
+class LogLevel(IntEnum):
+    TRACE = 5
+    DEBUG = 10
+    INFO = 20
+    WARN = 30
+    ERROR = 40
+
+    @classmethod
+    def parse(cls, value: Optional[str]) -> "LogLevel":
+        """Map a ``RUNTIME_LOG_LEVEL`` style name to a level; INFO if unknown."""
+        if not value:
+            return cls.INFO
+        return cls.__members__.get(value.strip().upper(), cls.INFO)
+
+
+class OverflowPolicy(Enum):
+    DROP_NEWEST = auto()
+    DROP_OLDEST = auto()
+    BLOCK = auto()
+
+
+_TAGS = {
+    LogLevel.TRACE: "🔴 TRACE",
+    LogLevel.DEBUG: "🔴 DEBUG",
+    LogLevel.INFO: "INFO",
+    LogLevel.WARN: "⚠️ WARNING",
+    LogLevel.ERROR: "❌ ERROR",
+}
+
+# (level, message, args, extra, stream)
+_Record = Tuple[LogLevel, str, tuple, Optional[dict], Optional[TextIO]]
+
+
+class RuntimeLogger:
+    """
+    Drop-in for ``haraka.utils.Logger`` with level checks and lazy formatting.
+
+    Messages take ``%``-style arguments that are only interpolated if the
+    record passes the level check (``logger.debug("Registered %s", name)``).
+    Lines match ``haraka.utils.Logger``'s format.
+
+    Once ``start()`` is called, records are handed to a daemon thread through a
+    bounded queue and formatted and written there, so the event loop never
+    blocks on I/O. When the queue is full, ``overflow`` decides whether the new
+    record or the oldest queued one is dropped (counted in ``dropped``), or the
+    caller blocks. ``flush``/``close`` drain the queue within a timeout.
+    """
+
+    def __init__(
+        self,
+        label: str = "",
+        level: LogLevel = LogLevel.INFO,
+        maxsize: int = 10_000,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_NEWEST,
+        stream: Optional[TextIO] = None,
+        error_stream: Optional[TextIO] = None,
+    ):
+        self.label = label
+        self.level = level
+        self.overflow = overflow
+        self.stream = stream
+        self.error_stream = error_stream
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize)
+        self._writer: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_variant(cls, variant: str, level: Optional[str] = None, **kwargs: Any):
+        """Logger labelled like ``Logger(variant)``, levelled by ``RUNTIME_LOG_LEVEL``."""
+        return cls(
+            Logger.get_label(variant),
+            LogLevel.parse(level or os.environ.get("RUNTIME_LOG_LEVEL")),
+            **kwargs,
+        )
+
+    @property
+    def asynchronous(self) -> bool:
+        return self._writer is not None
+
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        return level >= self.level
+
+    def trace(self, msg: str, *args: Any, extra: Optional[dict] = None) -> None:
+        if LogLevel.TRACE >= self.level:
+            self._log(LogLevel.TRACE, msg, args, extra, None)
+
+    def debug(self, msg: str, *args: Any, extra: Optional[dict] = None) -> None:
+        if LogLevel.DEBUG >= self.level:
+            self._log(LogLevel.DEBUG, msg, args, extra, None)
+
+    def info(self, msg: str, *args: Any, extra: Optional[dict] = None) -> None:
+        if LogLevel.INFO >= self.level:
+            self._log(LogLevel.INFO, msg, args, extra, None)
+
+    def warn(
+        self,
+        msg: str,
+        *args: Any,
+        file: Optional[TextIO] = None,
+        extra: Optional[dict] = None,
+    ) -> None:
+        if LogLevel.WARN >= self.level:
+            self._log(LogLevel.WARN, msg, args, extra, file)
+
+    warning = warn
+
+    def error(
+        self,
+        msg: str,
+        *args: Any,
+        file: Optional[TextIO] = None,
+        extra: Optional[dict] = None,
+    ) -> None:
+        if LogLevel.ERROR >= self.level:
+            self._log(LogLevel.ERROR, msg, args, extra, file)
+
+    def start(self) -> None:
+        """Switch to asynchronous mode, writing from a background thread."""
+        if self._writer is not None:
+            return
+        self._writer = threading.Thread(
+            target=self._drain, name="runtime-logger", daemon=True
+        )
+        self._writer.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; False on timeout."""
+        if self._writer is None:
+            return True
+        marker = threading.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return marker.wait(remaining)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush and stop the writer thread; later records are written inline."""
+        if self._writer is None:
+            return True
+        flushed = self.flush(timeout)
+        writer, self._writer = self._writer, None
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # the daemon writer dies with the process
+        else:
+            writer.join(timeout=0 if not flushed else timeout)
+        return flushed
+
+    def _log(
+        self,
+        level: LogLevel,
+        msg: str,
+        args: tuple,
+        extra: Optional[dict],
+        stream: Optional[TextIO],
+    ) -> None:
+        record = (level, msg, args, extra, stream)
+        if self._writer is None:
+            self._write(record)
+            return
+        if self.overflow is OverflowPolicy.BLOCK:
+            self._queue.put(record)
+            return
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        self.dropped += 1
+        if self.overflow is OverflowPolicy.DROP_OLDEST:
+            try:
+                oldest = self._queue.get_nowait()
+                if isinstance(oldest, threading.Event):
+                    oldest.set()  # release the flush waiting on it
+                self._queue.put_nowait(record)
+            except (queue.Empty, queue.Full):
+                pass
+
+    def _drain(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._write(item)
+            except Exception:
+                pass  # a broken stream must not kill the writer
+
+    def _write(self, record: _Record) -> None:
+        level, msg, args, extra, stream = record
+        if args:
+            msg = msg % args
+        if extra:
+            msg += " | " + " ".join(f"{k}={v}" for k, v in extra.items())
+        if stream is None:
+            if level >= LogLevel.WARN:
+                stream = self.error_stream or sys.stderr
+            else:
+                stream = self.stream or sys.stdout
+        print(f"{self.label} {_TAGS[level]}: {msg}", file=stream)
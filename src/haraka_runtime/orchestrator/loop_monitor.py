@@ -0,0 +1,151 @@
+import asyncio
+import bisect
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Sequence, Tuple
+
+DEFAULT_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class LagHistogram:
+    """Fixed-bucket histogram of event-loop lag samples, in seconds."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LAG_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the ``q`` quantile."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Cumulative ``(upper_bound, count)`` pairs, ending with ``+inf``."""
+        out, seen = [], 0
+        for bound, n in zip(self.bounds + (float("inf"),), self.counts):
+            seen += n
+            out.append((bound, seen))
+        return out
+
+
+@dataclass(frozen=True)
+class SlowCallback:
+    """The loop was blocked for at least ``blocked_for`` seconds by ``task``."""
+
+    task: Optional[str]
+    blocked_for: float
+    location: Optional[str]
+    detected_at: float
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and names whatever is blocking the loop.
+
+    A sampler coroutine sleeps for ``interval`` and records how late it woke
+    up. A daemon watchdog thread watches the sampler's heartbeat; when the loop
+    has not ticked for ``threshold`` seconds it records the running task's name
+    (adapter startups, health checks and supervised tasks are named after their
+    owner) and the innermost Python frame on the loop thread.
+    """
+
+    def __init__(
+        self,
+        logger: Any,
+        interval: float = 0.05,
+        threshold: float = 0.1,
+        buckets: Sequence[float] = DEFAULT_LAG_BUCKETS,
+        history: int = 100,
+    ):
+        self.logger = logger
+        self.interval = interval
+        self.threshold = threshold
+        self.histogram = LagHistogram(buckets)
+        self.slow_callbacks: Deque[SlowCallback] = deque(maxlen=history)
+        self._heartbeat = time.perf_counter()
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._stopped.clear()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.create_task(self._sample(), name="loop-monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            args=(loop, threading.get_ident()),
+            name="loop-watchdog",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.threshold)
+            self._watchdog = None
+
+    async def _sample(self) -> None:
+        clock = time.perf_counter
+        while True:
+            began = clock()
+            await asyncio.sleep(self.interval)
+            now = clock()
+            self._heartbeat = now
+            self.histogram.observe(max(0.0, now - began - self.interval))
+
+    def _watch(self, loop: asyncio.AbstractEventLoop, loop_thread: int) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._heartbeat
+            stalled = time.perf_counter() - beat - self.interval
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            task = asyncio.current_task(loop)
+            record = SlowCallback(
+                task=task.get_name() if task is not None else None,
+                blocked_for=stalled,
+                location=self._innermost_frame(loop_thread),
+                detected_at=time.perf_counter(),
+            )
+            self.slow_callbacks.append(record)
+            self.logger.warn(
+                f"🐢 Event loop blocked for {stalled:.3f}s by {record.task or 'a callback'}",
+                extra={"location": record.location},
+            )
+
+    @staticmethod
+    def _innermost_frame(thread_id: int) -> Optional[str]:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            return None
+        code = frame.f_code
+        return f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
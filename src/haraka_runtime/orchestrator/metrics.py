@@ -0,0 +1,335 @@
+import bisect
+import math
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from haraka_runtime.orchestrator.loop_monitor import DEFAULT_LAG_BUCKETS
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Number = Union[int, float]
+
+
+class Counter:
+    """Monotonic counter; ``inc()`` is a single attribute add."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: Number = 0
+
+    def inc(self, amount: Number = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Value that can go up and down."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value: Number = 0
+
+    def set(self, value: Number) -> None:
+        self.value = value
+
+    def inc(self, amount: Number = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: Number = 1) -> None:
+        self.value -= amount
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe()`` is a bisect and three adds."""
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def buckets(self) -> List[Tuple[float, int]]:
+        """Cumulative ``(upper_bound, count)`` pairs, ending with ``+inf``."""
+        out, seen = [], 0
+        for bound, n in zip(self.bounds + (math.inf,), self.counts):
+            seen += n
+            out.append((bound, seen))
+        return out
+
+
+M = TypeVar("M", Counter, Gauge, Histogram)
+
+
+class Family(Generic[M]):
+    """
+    A named metric and its children, one per combination of label values.
+
+    ``labels(...)`` creates a child on first use and returns the same object
+    afterwards, so hot paths should look it up once and keep it; a family
+    without label names has a single child, ``labels()``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        kind: str,
+        labelnames: Tuple[str, ...],
+        factory: Callable[[], M],
+    ):
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self.labelnames = labelnames
+        self._factory: Callable[[], M] = factory
+        self._children: Dict[Tuple[str, ...], M] = {}
+        # Rendered label sets, built once per child rather than per scrape
+        self._label_text: Dict[Tuple[str, ...], str] = {}
+
+    def labels(self, *values: object) -> M:
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"Metric '{self.name}' expects labels {self.labelnames}, got {key}"
+                )
+            child = self._children[key] = self._factory()
+            self._label_text[key] = ",".join(
+                f'{n}="{_escape_label(v)}"' for n, v in zip(self.labelnames, key)
+            )
+        return child
+
+    def children(self) -> Iterator[Tuple[Tuple[str, ...], M]]:
+        return iter(list(self._children.items()))
+
+    def render(self, out: List[str]) -> None:
+        out.append(f"# HELP {self.name} {_escape_help(self.description)}")
+        out.append(f"# TYPE {self.name} {self.kind}")
+        for key, child in self._children.items():
+            labels = self._label_text[key]
+            suffix = f"{{{labels}}}" if labels else ""
+            if isinstance(child, Histogram):
+                prefix = f"{labels}," if labels else ""
+                for bound, seen in child.buckets():
+                    out.append(
+                        f'{self.name}_bucket{{{prefix}le="{_number(bound)}"}} {seen}'
+                    )
+                out.append(f"{self.name}_sum{suffix} {_number(child.total)}")
+                out.append(f"{self.name}_count{suffix} {child.count}")
+            else:
+                out.append(f"{self.name}{suffix} {_number(child.value)}")
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and histograms with a Prometheus text exporter.
+
+    Metrics are plain objects updated without locks: the runtime is a single
+    event loop, and a lost update from another thread costs one sample, not
+    correctness. Values that are cheap to read but costly to push on every
+    change (readiness, per-task restart counts...) are refreshed by
+    ``collector`` callbacks right before ``render()``.
+    """
+
+    def __init__(self) -> None:
+        self._families: Dict[str, Family] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def counter(
+        self, name: str, description: str, labelnames: Sequence[str] = ()
+    ) -> Family[Counter]:
+        return self._family(name, description, "counter", labelnames, Counter)
+
+    def gauge(
+        self, name: str, description: str, labelnames: Sequence[str] = ()
+    ) -> Family[Gauge]:
+        return self._family(name, description, "gauge", labelnames, Gauge)
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Family[Histogram]:
+        return self._family(
+            name, description, "histogram", labelnames, lambda: Histogram(buckets)
+        )
+
+    def collector(self, collect: Callable[[], None]) -> None:
+        """Run ``collect`` before every ``render()`` to refresh derived values."""
+        self._collectors.append(collect)
+
+    def get(self, name: str) -> Family:
+        try:
+            return self._families[name]
+        except KeyError:
+            raise ValueError(f"Unknown metric '{name}'") from None
+
+    def render(self) -> str:
+        """Snapshot every metric in the Prometheus text exposition format."""
+        for collect in self._collectors:
+            collect()
+        out: List[str] = []
+        for family in self._families.values():
+            family.render(out)
+        out.append("")
+        return "\n".join(out)
+
+    def _family(
+        self,
+        name: str,
+        description: str,
+        kind: str,
+        labelnames: Sequence[str],
+        factory: Callable[[], M],
+    ) -> Family[M]:
+        labels = tuple(labelnames)
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = Family(
+                name, description, kind, labels, factory
+            )
+        elif family.kind != kind or family.labelnames != labels:
+            raise ValueError(
+                f"Metric '{name}' is already registered as a {family.kind} "
+                f"with labels {family.labelnames}"
+            )
+        return family
+
+
+def _number(value: Number) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(value)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _escape_help(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n")
+
+
+class RuntimeMetrics:
+    """
+    The orchestrator's built-in metrics.
+
+    Lifecycle durations, readiness, task restarts, in-flight work and loop lag
+    are read from the orchestrator when scraped, so none of them costs anything
+    between scrapes; adapter restarts are counted as they happen.
+    """
+
+    def __init__(self, registry: MetricsRegistry, runtime: Any):
+        self.runtime = runtime
+        self.startup = registry.gauge(
+            "haraka_startup_seconds", "Duration of the last run() until started"
+        ).labels()
+        self.live = registry.gauge(
+            "haraka_live", "1 unless the runtime has been shut down"
+        ).labels()
+        self.ready = registry.gauge(
+            "haraka_ready", "1 if the runtime is ready to serve"
+        ).labels()
+        self.adapter_ready = registry.gauge(
+            "haraka_adapter_ready",
+            "1 if the adapter has signalled readiness",
+            ["adapter"],
+        )
+        self.adapter_degraded = registry.gauge(
+            "haraka_adapter_degraded",
+            "1 if the optional adapter's last startup attempt failed",
+            ["adapter"],
+        )
+        self.adapter_activations = registry.counter(
+            "haraka_adapter_activations_total",
+            "Startups of an on-demand adapter on first use",
+            ["adapter"],
+        )
+        self.adapter_startup = registry.gauge(
+            "haraka_adapter_startup_seconds",
+            "Duration of the adapter's last startup()",
+            ["adapter"],
+        )
+        self.adapter_shutdown = registry.gauge(
+            "haraka_adapter_shutdown_seconds",
+            "Duration of the adapter's last shutdown()",
+            ["adapter"],
+        )
+        self.adapter_restarts = registry.counter(
+            "haraka_adapter_restarts_total",
+            "Hot restarts that included the adapter",
+            ["adapter"],
+        )
+        self.task_restarts = registry.counter(
+            "haraka_task_restarts_total", "Restarts of a supervised task", ["task"]
+        )
+        self.work = registry.gauge(
+            "haraka_work_in_flight", "Tracked units of work in flight", ["owner"]
+        )
+        self.loop_lag = registry.histogram(
+            "haraka_event_loop_lag_seconds",
+            "Event-loop lag samples",
+            buckets=DEFAULT_LAG_BUCKETS,
+        ).labels()
+        self.dropped_logs = registry.counter(
+            "haraka_log_records_dropped_total", "Log records dropped on overflow"
+        ).labels()
+        registry.collector(self.collect)
+
+    def collect(self) -> None:
+        runtime = self.runtime
+        self.live.value = int(runtime.is_live())
+        self.ready.value = int(runtime.is_ready())
+        for name, event in runtime._adapter_events.items():
+            self.adapter_ready.labels(name).value = int(event.is_set())
+        degraded = runtime._degraded
+        for name in runtime._optional:
+            self.adapter_degraded.labels(name).value = int(name in degraded)
+        for name, activation in runtime._on_demand.items():
+            self.adapter_activations.labels(name).value = activation.activations
+        for name, timing in runtime.timings.adapters.items():
+            if timing.startup_duration is not None:
+                self.adapter_startup.labels(name).value = timing.startup_duration
+            if timing.shutdown_duration is not None:
+                self.adapter_shutdown.labels(name).value = timing.shutdown_duration
+        for name, status in runtime.task_status().items():
+            self.task_restarts.labels(name).value = status.restarts
+
+        in_flight = runtime.work.snapshot()
+        for (owner,), gauge in self.work.children():
+            gauge.value = in_flight.pop(owner, 0)
+        for owner, count in in_flight.items():
+            self.work.labels(owner).value = count
+
+        monitor = runtime.loop_monitor
+        if monitor is not None:
+            lag = monitor.histogram
+            self.loop_lag.counts[:] = lag.counts
+            self.loop_lag.count = lag.count
+            self.loop_lag.total = lag.total
+        self.dropped_logs.value = runtime.logger.dropped
@@ -1,12 +1,41 @@
 import asyncio
+import functools
 import signal
 import socket
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Set, Protocol
-
-from haraka.utils import Logger
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Set,
+    Protocol,
+)
 
 from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.activation import OnDemand
+from haraka_runtime.orchestrator.bus import EventBus
+from haraka_runtime.orchestrator.drain import WorkTracker
+from haraka_runtime.orchestrator.graph import DependencyGraph, StartPlan
+from haraka_runtime.orchestrator.health import HealthMonitor, HealthSnapshot
+from haraka_runtime.orchestrator.log import RuntimeLogger
+from haraka_runtime.orchestrator.loop_monitor import LoopMonitor
+from haraka_runtime.orchestrator.metrics import MetricsRegistry, RuntimeMetrics
+from haraka_runtime.orchestrator.resources import ResourceRegistry
+from haraka_runtime.orchestrator.supervision import (
+    Backoff,
+    RestartPolicy,
+    SupervisedTask,
+    TaskStatus,
+)
+from haraka_runtime.orchestrator.timing import LifecycleTimings, StartupReport
 
 
 class DocsProvider(Protocol):
@@ -23,158 +52,977 @@ class LifecycleState(Enum):
     DESTROYED = auto()
 
 
+class StartupMode(Enum):
+    SEQUENTIAL = auto()
+    CONCURRENT = auto()
+    READY_GATED = auto()
+
+
+@dataclass
+class ShutdownReport:
+    """Outcome of a shutdown, keyed by adapter name."""
+
+    stopped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    # Work still in flight, per owner, when the drain phase ran out of time
+    abandoned_work: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def overran(self) -> List[str]:
+        return self.timed_out + self.skipped
+
+
 class Orchestrator:
-    def __init__(self, variant: str = "PyFast"):
+    def __init__(
+        self,
+        variant: str = "PyFast",
+        startup_mode: StartupMode = StartupMode.SEQUENTIAL,
+        shutdown_timeout: float = 25.0,
+        adapter_shutdown_timeout: Optional[float] = 10.0,
+        readiness_timeout: Optional[float] = 30.0,
+        health_interval: float = 10.0,
+        health_timeout: float = 2.0,
+        task_restart_policy: RestartPolicy = RestartPolicy.ON_FAILURE,
+        loop_lag_threshold: Optional[float] = 0.1,
+        drain_timeout: Optional[float] = 10.0,
+        handle_signals: bool = True,
+        log_level: Optional[str] = None,
+        async_logging: bool = False,
+    ):
         self.variant = variant
-        self.logger = Logger(self.variant).start_logger()
+        self.startup_mode = startup_mode
+        self.shutdown_timeout = shutdown_timeout
+        self.adapter_shutdown_timeout = adapter_shutdown_timeout
+        self.readiness_timeout = readiness_timeout
+        self.task_restart_policy = task_restart_policy
+        self.loop_lag_threshold = loop_lag_threshold
+        self.drain_timeout = drain_timeout
+        self.handle_signals = handle_signals
+        self.loop_monitor: Optional[LoopMonitor] = None
+        self.logger = RuntimeLogger.for_variant(self.variant, log_level)
+        if async_logging:
+            self.logger.start()
         self.state = LifecycleState.UNINITIALIZED
 
         self._registry: Dict[str, Tuple[Adapter, int, List[str]]] = {}
         self._adapter_events: Dict[str, asyncio.Event] = {}
+        self._unready: Set[str] = set()
+        self._restarting: Set[str] = set()
+        # Adapters left stopped by a failed restart
+        self._down: Set[str] = set()
+        self._restart_lock = asyncio.Lock()
+        # Optional adapters start in the background; failures leave them degraded
+        self._optional: Dict[str, Backoff] = {}
+        self._optional_started: Set[str] = set()
+        self._degraded: Dict[str, str] = {}
+        self._background: Optional[asyncio.Task] = None
+        # Adapters started on first use rather than by run()
+        self._on_demand: Dict[str, OnDemand] = {}
+        self._graph = DependencyGraph()
+        self.timings = LifecycleTimings()
+        self.health_monitor = HealthMonitor(
+            health_interval, health_timeout, is_active=self._is_running
+        )
 
         self.startup_tasks: List[Callable[[], Awaitable]] = []
         self.shutdown_tasks: List[Callable[[], Awaitable]] = []
-        self._running_tasks: List[asyncio.Task] = []
+        self._supervised: Dict[str, SupervisedTask] = {}
+        self.resources = ResourceRegistry(self.logger)
+        self.work = WorkTracker()
+        self.metrics = MetricsRegistry()
+        self._metrics = RuntimeMetrics(self.metrics, self)
+        self.bus = EventBus(self.metrics)
+        self._shutdown: Optional[asyncio.Future] = None
+        self._resource_needs: Dict[str, List[str]] = {}
 
-        signal.signal(signal.SIGINT, self._handle_signal)
-        signal.signal(signal.SIGTERM, self._handle_signal)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self._handle_signal)
+            signal.signal(signal.SIGTERM, self._handle_signal)
 
     def use(
         self,
         adapter: Adapter,
         priority: int = 0,
         dependencies: Optional[List[str]] = None,
+        resources: Optional[List[str]] = None,
+        optional: bool = False,
+        retry: Optional[Backoff] = None,
+        on_demand: bool = False,
+        idle_timeout: Optional[float] = None,
     ) -> None:
+        """
+        Register ``adapter`` to be started by ``run()``.
+
+        An ``optional`` adapter is started in the background once the required
+        ones are up, so it never delays ``STARTED`` or readiness; a failed
+        startup is retried with ``retry`` backoff (up to ``max_restarts``
+        retries) and leaves the adapter in ``degraded()`` meanwhile.
+
+        An ``on_demand`` adapter is not started by ``run()`` but by the first
+        ``get_adapter()`` or ``using()`` call, and stopped again once unused for
+        ``idle_timeout`` seconds.
+
+        Raises:
+            ValueError: If ``on_demand`` is combined with ``optional``, or
+                ``idle_timeout`` is given without ``on_demand``
+        """
         name = adapter.name
         deps = dependencies or []
+        if on_demand and optional:
+            raise ValueError(f"Adapter '{name}' cannot be both optional and on demand")
+        if idle_timeout is not None and not on_demand:
+            raise ValueError(f"idle_timeout only applies to on-demand adapters: {name}")
         if name in self._registry:
-            self.logger.warn(f"⚠️ Adapter '{name}' already registered")
+            self.logger.warn("⚠️ Adapter '%s' already registered", name)
             return
+        if on_demand:
+            self._on_demand[name] = OnDemand(
+                name,
+                functools.partial(self._activate, name),
+                functools.partial(self._stop_idle, name),
+                idle_timeout,
+            )
         self._registry[name] = (adapter, priority, deps)
+        if resources:
+            self._resource_needs[name] = list(resources)
+        if optional:
+            self._optional[name] = retry or Backoff()
+        self._graph.add(name, priority, deps)
+        if getattr(type(adapter), "health", Adapter.health) is not Adapter.health:
+            critical = not optional and not on_demand
+            self.health_monitor.register(name, adapter.health, critical=critical)
         self._adapter_events[name] = asyncio.Event()
         # set runtime attribute dynamically
         setattr(adapter, "runtime", self)
         self.logger.debug(
-            f"🛎️ Registered adapter: {name} "
-            f"(priority={priority}, "
-            f"dependencies={deps})"
+            "🛎️ Registered adapter: %s (priority=%s, dependencies=%s)",
+            name,
+            priority,
+            deps,
         )
 
     def mark_ready(self, name: str):
         event = self._adapter_events.get(name)
         if event and not event.is_set():
             event.set()
-            self.logger.info(f"✅ Adapter '{name}' is ready.")
+            if name in self._unready:
+                self._unready.discard(name)
+                self.logger.info("✅ Adapter '%s' is ready again.", name)
+            else:
+                self.timings.record(name, "ready_at")
+                self.logger.info("✅ Adapter '%s' is ready.", name)
         elif event:
-            self.logger.debug(f"🔁 Adapter '{name}' was already marked ready.")
+            self.logger.debug("🔁 Adapter '%s' was already marked ready.", name)
         else:
-            self.logger.warn(f"⚠️ Tried to mark unknown adapter '{name}' as ready")
+            self.logger.warn("⚠️ Tried to mark unknown adapter '%s' as ready", name)
 
-    async def wait_for_all_ready(self, timeout: float = 30.0):
+    def mark_unready(self, name: str) -> None:
+        """Withdraw an adapter's readiness, e.g. while it applies backpressure."""
+        event = self._adapter_events.get(name)
+        if event is None:
+            self.logger.warn("⚠️ Tried to mark unknown adapter '%s' as unready", name)
+        elif name not in self._unready:
+            event.clear()
+            self._unready.add(name)
+            self.logger.warn("⏸️ Adapter '%s' is no longer ready.", name)
+
+    async def wait_for_ready(self, names: Iterable[str], timeout: float = 30.0):
+        """
+        Wait until every adapter in ``names`` has called ``mark_ready``.
+
+        Raises:
+            ValueError: If a name is not registered
+            asyncio.TimeoutError: If any of them is still unready at ``timeout``
+        """
+        names = list(names)
+        unknown = [n for n in names if n not in self._adapter_events]
+        if unknown:
+            raise ValueError(f"Unknown adapter(s): {', '.join(unknown)}")
         try:
             await asyncio.wait_for(
-                asyncio.gather(*(evt.wait() for evt in self._adapter_events.values())),
+                asyncio.gather(*(self._adapter_events[n].wait() for n in names)),
                 timeout=timeout,
             )
-            self.logger.info("✅ All declared adapters are up and running!")
         except asyncio.TimeoutError:
-            unready = [n for n, e in self._adapter_events.items() if not e.is_set()]
+            unready = [n for n in names if not self._adapter_events[n].is_set()]
             self.logger.error(
                 "❌ Timed out waiting for adapters", extra={"unready_adapters": unready}
             )
             raise
 
-    def _resolve_start_order(self) -> List[Adapter]:
-        graph: Dict[str, Set[str]] = {
-            name: set(deps) for name, (_, _, deps) in self._registry.items()
-        }
-        order: List[str] = []
-        temp = set()
-
-        def visit(node: str):
-            if node in temp:
-                raise RuntimeError(f"Circular dependency detected at {node}")
-            if node not in order:
-                temp.add(node)
-                for dep in graph.get(node, []):
-                    if dep not in graph:
-                        raise RuntimeError(
-                            f"Unknown dependency '{dep}' for adapter '{node}'"
-                        )
-                    visit(dep)
-                temp.remove(node)
-                order.append(node)
+    async def wait_for_all_ready(self, timeout: float = 30.0):
+        """Wait for every required adapter; optional and on-demand ones are not."""
+        required = [n for n in self._adapter_events if self._is_required(n)]
+        await self.wait_for_ready(required, timeout=timeout)
+        self.logger.info("✅ All declared adapters are up and running!")
+
+    def supervise(
+        self,
+        fn: Callable[[], Awaitable],
+        name: Optional[str] = None,
+        policy: RestartPolicy = RestartPolicy.ON_FAILURE,
+        backoff: Backoff = Backoff(),
+        workers: int = 1,
+        max_concurrency: Optional[int] = None,
+    ) -> SupervisedTask:
+        """
+        Run ``fn`` as a supervised background task for the runtime's lifetime.
+
+        Tasks registered before ``run()`` start once the adapters are up; later
+        ones start immediately. Failed runs are restarted according to
+        ``policy`` with exponential ``backoff``; ``workers`` copies of ``fn``
+        run side by side, at most ``max_concurrency`` of them at once.
+        """
+        base = name if name else str(getattr(fn, "__name__", "task"))
+        unique, n = base, 1
+        while unique in self._supervised:
+            n += 1
+            unique = f"{base}#{n}"
+        supervised = SupervisedTask(
+            unique,
+            functools.partial(self._wrap_task, fn),
+            self.logger,
+            policy=policy,
+            backoff=backoff,
+            workers=workers,
+            max_concurrency=max_concurrency,
+        )
+        self._supervised[unique] = supervised
+        if self.state is LifecycleState.STARTED:
+            supervised.start()
+        return supervised
+
+    def task_status(self) -> Dict[str, TaskStatus]:
+        return {name: task.status() for name, task in self._supervised.items()}
+
+    def is_live(self) -> bool:
+        """Cheap liveness probe: the runtime has not been torn down."""
+        return self.state is not LifecycleState.DESTROYED
+
+    def is_ready(self) -> bool:
+        """
+        Cheap readiness probe: started, not draining, no required adapter
+        restarting or having withdrawn its readiness, and every cached health
+        check of a required adapter passing. Optional and on-demand adapters
+        never count.
+        """
+        return (
+            self.state is LifecycleState.STARTED
+            and self.work.admitting
+            and not self._any_required(self._restarting)
+            and not self._any_required(self._down)
+            and not self._any_required(self._unready)
+            and self.health_monitor.healthy
+        )
+
+    def degraded(self) -> Dict[str, str]:
+        """Optional adapters whose last startup attempt failed, with the error."""
+        return dict(self._degraded)
+
+    async def get_adapter(self, name: str) -> Adapter:
+        """
+        Return adapter ``name``, starting it first if it is on demand.
+
+        Concurrent first callers share one startup. An adapter fetched this way
+        may be stopped once idle; hold it with ``using()`` for longer work.
+
+        Raises:
+            ValueError: If ``name`` is not registered
+            RuntimeError: If the runtime is not running
+        """
+        if name not in self._registry:
+            raise ValueError(f"Unknown adapter: {name}")
+        if self.state is not LifecycleState.STARTED or self._shutdown is not None:
+            raise RuntimeError(f"Cannot use '{name}': runtime is not running")
+        activation = self._on_demand.get(name)
+        if activation is not None:
+            await activation.activate()
+        return self._registry[name][0]
+
+    def using(self, name: str) -> AsyncContextManager[Adapter]:
+        """
+        ``async with runtime.using(name) as adapter:`` gets the adapter as
+        ``get_adapter`` does and keeps an on-demand one from idling out inside
+        the block.
+        """
+        return self._using(name)
+
+    @asynccontextmanager
+    async def _using(self, name: str) -> AsyncIterator[Adapter]:
+        activation = self._on_demand.get(name)
+        if activation is None:
+            yield await self.get_adapter(name)
+            return
+        async with activation.hold():
+            yield await self.get_adapter(name)
+
+    def _is_required(self, name: str) -> bool:
+        return name not in self._optional and name not in self._on_demand
+
+    def _any_required(self, names: Iterable[str]) -> bool:
+        return any(self._is_required(name) for name in names)
+
+    def _has_started(self, name: str) -> bool:
+        activation = self._on_demand.get(name)
+        if activation is not None:
+            return activation.active
+        return name not in self._optional or name in self._optional_started
+
+    def _is_running(self, name: str) -> bool:
+        """Whether the adapter is up: started, and not restarting or left down."""
+        return (
+            name not in self._restarting
+            and name not in self._down
+            and self._has_started(name)
+        )
 
-        for name in graph:
-            visit(name)
+    def _check_dependencies(self) -> None:
+        for name in self._registry:
+            for dep in self._graph.dependencies(name):
+                if dep in self._on_demand:
+                    raise RuntimeError(f"'{name}' depends on on-demand adapter {dep}")
+                if dep in self._optional and name not in self._optional:
+                    kind = "On-demand" if name in self._on_demand else "Required"
+                    raise RuntimeError(
+                        f"{kind} adapter '{name}' depends on optional {dep}"
+                    )
 
-        resolved = [(self._registry[n][1], n) for n in order]
-        resolved.sort(key=lambda x: -x[0])
-        return [self._registry[name][0] for _, name in resolved]
+    async def _activate(self, name: str) -> None:
+        async with self._restart_lock:
+            if self.state is not LifecycleState.STARTED or self._shutdown is not None:
+                raise RuntimeError(f"Cannot start '{name}': runtime is not running")
+            down = [
+                d
+                for d in self._graph.dependencies(name)
+                if d in self._restarting or d in self._down
+            ]
+            if down:
+                raise RuntimeError(
+                    f"Cannot start '{name}': {', '.join(down)} not running"
+                )
+        # Started outside the lock so a slow startup cannot hold up shutdown
+        # or a restart; they cancel it instead
+        try:
+            await self._start_adapter(name)
+        except Exception as e:
+            self.logger.error(f"❌ Failed to start {name}", extra={"error": str(e)})
+            raise
+        self.logger.info("🚀 Started %s (on demand)", name)
+
+    async def _stop_idle(self, name: str) -> None:
+        async with self._restart_lock:
+            # Shutdown or a restart already stopped it
+            if self._shutdown is not None or not self._on_demand[name].active:
+                return
+            try:
+                await asyncio.wait_for(
+                    self._stop_adapter(name), self.adapter_shutdown_timeout
+                )
+                self.logger.info("💤 Stopped idle %s", name)
+            except Exception as e:
+                self.logger.error(
+                    f"❌ Shutdown failed for {name}", extra={"error": str(e)}
+                )
+            self._adapter_events[name].clear()
+
+    def health_snapshot(self) -> HealthSnapshot:
+        """Latest cached health-check results; never touches a backend."""
+        return self.health_monitor.snapshot()
+
+    def adopt_start_plan(self, plan: StartPlan) -> None:
+        """Skip resolving the start order; ``plan`` was resolved ahead of time."""
+        self._graph.adopt(plan)
+
+    def _resolve_start_order(self) -> List[Adapter]:
+        return [self._registry[name][0] for name in self._graph.resolve().order]
+
+    def release_signals(self) -> None:
+        """
+        Leave SIGINT and SIGTERM to whatever hosts the runtime (e.g. an ASGI
+        server), as if it had been created with ``handle_signals=False``.
+        Must be called before ``run()``.
+        """
+        if not self.handle_signals:
+            return
+        self.handle_signals = False
+        if signal.getsignal(signal.SIGINT) == self._handle_signal:
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+        if signal.getsignal(signal.SIGTERM) == self._handle_signal:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
 
     def _on_signal(self, signum: int) -> None:
+        if self._shutdown is not None and not self._shutdown.done():
+            self.logger.info(
+                f"🔔 Received signal {signal.Signals(signum).name}, "
+                "shutdown already in progress"
+            )
+            return
         self.logger.info(
             f"🔔 Received signal {signal.Signals(signum).name}, initiating shutdown..."
         )
         asyncio.create_task(self.shutdown())
 
-    async def run(self, settings: Settings, app: DocsProvider) -> None:
+    async def run(
+        self,
+        settings: Optional[Settings] = None,
+        app: Optional[DocsProvider] = None,
+    ) -> None:
         if self.state != LifecycleState.UNINITIALIZED:
             self.logger.warn(f"🟡 Already started or shut down: {self.state.name}")
             return
 
-        # Install robust signal handlers on the running loop
+        # Install robust signal handlers on the running loop, unless whatever
+        # hosts us (e.g. an ASGI server) owns signal handling
+        if self.handle_signals:
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self._on_signal, sig)
+
+        self.timings.run_began = self.timings.clock()
+        if self.loop_lag_threshold:
+            self.loop_monitor = LoopMonitor(
+                self.logger, threshold=self.loop_lag_threshold
+            )
+            self.loop_monitor.start()
+
+        self._check_dependencies()
+        try:
+            required = [n for n in self._registry if self._is_required(n)]
+            deferred = self._optional or self._on_demand
+            await self._start_adapters(required if deferred else None)
+        except BaseException:
+            if self.loop_monitor is not None:
+                await self.loop_monitor.stop()
+            raise
+
+        for task_fn in self.startup_tasks:
+            self.supervise(task_fn, policy=self.task_restart_policy)
+        for supervised in self._supervised.values():
+            supervised.start()
+
+        self.health_monitor.start()
+        if settings is not None and app is not None:
+            self._print_docs_url(settings, app)
+        self.state = LifecycleState.STARTED
+        if self._optional:
+            self._background = asyncio.create_task(
+                self._start_optional(), name="startup:optional"
+            )
+        self.timings.run_ended = self.timings.clock()
+        report = self.startup_report()
+        self._metrics.startup.value = report.total or 0.0
+        self.logger.info(
+            f"⏱️ Startup took {report.total or 0.0:.3f}s",
+            extra={
+                "critical_path": " → ".join(report.critical_path),
+                "critical_path_s": round(report.critical_path_duration or 0.0, 6),
+            },
+        )
+
+    async def _start_adapters(self, names: Optional[Iterable[str]] = None) -> None:
+        if self.startup_mode is StartupMode.CONCURRENT:
+            await self._start_concurrently(names=names)
+        elif self.startup_mode is StartupMode.READY_GATED:
+            await self._start_concurrently(gate_on_ready=True, names=names)
+        else:
+            start_order = self._resolve_start_order()
+            if names is not None:
+                subset = set(names)
+                start_order = [svc for svc in start_order if svc.name in subset]
+            started: List[str] = []
+            try:
+                for svc in start_order:
+                    try:
+                        await self._start_adapter(svc.name)
+                        self.logger.info("🚀 Started %s", svc.name)
+                    except Exception as e:
+                        self.logger.error(
+                            f"❌ Failed to start {svc.name}", extra={"error": str(e)}
+                        )
+                        raise
+                    started.append(svc.name)
+            except BaseException:
+                await self._rollback(started)
+                raise
+
+    async def _start_optional(self, names: Optional[Iterable[str]] = None) -> None:
+        """
+        Start the optional adapters (or those among ``names``) concurrently,
+        each once its optional dependencies are up. An adapter whose
+        dependency gave up, or is not running, is not tried.
+        """
         loop = asyncio.get_running_loop()
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, self._on_signal, sig)
+        wanted = self._optional if names is None else set(names)
+        outcome: Dict[str, asyncio.Future] = {
+            name: loop.create_future()
+            for name in self._subset(n for n in self._optional if n in wanted)
+        }
 
-        start_order = self._resolve_start_order()
-        for svc in start_order:
+        async def start(name: str) -> None:
+            deps = [d for d in self._graph.dependencies(name) if d in outcome]
+            started = True
+            if any(
+                d not in outcome and not self._is_running(d)
+                for d in self._graph.dependencies(name)
+            ):
+                self._degraded[name] = "dependency unavailable"
+                started = False
+            elif deps:
+                results = await asyncio.gather(*(outcome[d] for d in deps))
+                if not all(results):
+                    self._degraded[name] = "dependency unavailable"
+                    started = False
+            outcome[name].set_result(started and await self._start_with_retry(name))
+
+        await asyncio.gather(
+            *(asyncio.create_task(start(n), name=f"startup:{n}") for n in outcome)
+        )
+        if self._degraded:
+            self.logger.warn(
+                "⚠️ Running degraded", extra={"degraded": sorted(self._degraded)}
+            )
+
+    async def _start_with_retry(self, name: str) -> bool:
+        backoff = self._optional[name]
+        attempt = 0
+        while True:
             try:
-                await svc.startup()
-                self.logger.info(f"🚀 Started {svc.name}")
+                await self._start_adapter(name)
             except Exception as e:
-                self.logger.error(
-                    f"❌ Failed to start {svc.name}", extra={"error": str(e)}
+                self._degraded[name] = str(e) or type(e).__name__
+                if attempt >= backoff.max_restarts:
+                    self.logger.error(
+                        f"❌ Gave up starting optional {name}",
+                        extra={"attempts": attempt + 1, "error": str(e)},
+                    )
+                    return False
+                delay = backoff.delay(attempt)
+                self.logger.warn(
+                    f"⚠️ Failed to start optional {name}, retrying",
+                    extra={"error": str(e), "retry_in": round(delay, 3)},
                 )
-                raise
+                attempt += 1
+                await asyncio.sleep(delay)
+            else:
+                self._degraded.pop(name, None)
+                self._optional_started.add(name)
+                self.logger.info("🚀 Started %s (optional)", name)
+                return True
 
-        for task_fn in self.startup_tasks:
-            task = asyncio.create_task(self._wrap_task(task_fn))
-            self._running_tasks.append(task)
+    def startup_report(self) -> StartupReport:
+        """
+        Per-adapter dependency wait, queueing, startup, readiness and shutdown
+        durations for the last ``run()``, plus the critical path through the
+        dependency graph that determined total startup time.
+        """
+        return self.timings.startup_report(self._graph)
 
-        self._print_docs_url(settings, app)
-        self.state = LifecycleState.STARTED
+    async def _start_adapter(self, name: str) -> None:
+        self.timings.record(name, "startup_began")
+        try:
+            # Shared resources are open and warm before the adapter starts
+            for resource in self._resource_needs.get(name, ()):
+                await self.resources.acquire(resource, name)
+            await self._registry[name][0].startup()
+        except BaseException:
+            await self.resources.release_all(name)
+            raise
+        finally:
+            self.timings.record(name, "startup_ended")
 
-    async def shutdown(self):
-        if self.state != LifecycleState.STARTED:
-            self.logger.warn("🟡 Not running or already destroyed")
-            return
+    async def _stop_adapter(self, name: str) -> None:
+        self.timings.record(name, "shutdown_began")
+        try:
+            await self._registry[name][0].shutdown()
+        finally:
+            await self.resources.release_all(name)
+            self.timings.record(name, "shutdown_ended")
 
-        self.logger.info("🛑 Application is shutting down!")
+    async def _start_concurrently(
+        self, gate_on_ready: bool = False, names: Optional[Iterable[str]] = None
+    ) -> None:
+        """
+        Start every adapter (or just ``names``, whose other dependencies are
+        already running) as soon as all of its dependencies have started.
 
-        for task in self._running_tasks:
-            task.cancel()
-        await asyncio.gather(*self._running_tasks, return_exceptions=True)
+        Independent adapters run their ``startup()`` concurrently; priority only
+        decides launch order among adapters that become ready together. With
+        ``gate_on_ready`` a dependency counts as satisfied once it calls
+        ``mark_ready`` (within ``readiness_timeout``) rather than when its
+        ``startup()`` returns. On the first failure the still-running startups
+        are cancelled and the adapters that already started are shut down again
+        in reverse order.
+        """
+        order = self._subset(names)
+        rank = {name: i for i, name in enumerate(order)}
+        waiting = {
+            name: sum(dep in rank for dep in self._graph.dependencies(name))
+            for name in order
+        }
 
-        for svc in reversed(self._resolve_start_order()):
+        started: List[str] = []
+        running: Dict[asyncio.Task, Tuple[str, bool]] = {}
+
+        def launch(names: List[str]) -> None:
+            for name in sorted(names, key=rank.__getitem__):
+                start = self._start_adapter(name)
+                task = asyncio.create_task(start, name=f"startup:{name}")
+                running[task] = (name, False)
+                if gate_on_ready and self._graph.dependents(name):
+                    ready = asyncio.wait_for(
+                        self._adapter_events[name].wait(), self.readiness_timeout
+                    )
+                    waiter = asyncio.create_task(ready, name=f"ready:{name}")
+                    running[waiter] = (name, True)
+
+        def release(name: str, into: List[str]) -> None:
+            for dependent in self._graph.dependents(name):
+                if dependent not in waiting:
+                    continue
+                waiting[dependent] -= 1
+                if not waiting[dependent]:
+                    into.append(dependent)
+
+        launch([name for name, count in waiting.items() if not count])
+        try:
+            while running:
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                ready: List[str] = []
+                failure: Optional[BaseException] = None
+                for task in done:
+                    name, is_readiness = running.pop(task)
+                    error = task.exception()
+                    if error is not None:
+                        message = (
+                            f"❌ {name} was not ready within {self.readiness_timeout}s"
+                            if is_readiness
+                            else f"❌ Failed to start {name}"
+                        )
+                        self.logger.error(message, extra={"error": str(error)})
+                        failure = failure or error
+                    elif is_readiness:
+                        release(name, ready)
+                    else:
+                        started.append(name)
+                        self.logger.info("🚀 Started %s", name)
+                        if not gate_on_ready:
+                            release(name, ready)
+                if failure is not None:
+                    raise failure
+                launch(ready)
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            await self._rollback(started)
+            raise
+
+    async def _rollback(self, started: List[str]) -> None:
+        for name in reversed(started):
             try:
-                await svc.shutdown()
-                self.logger.info(f"🛑 Stopped {svc.name}")
+                await self._stop_adapter(name)
+                self.logger.info("↩️ Rolled back %s", name)
             except Exception as e:
                 self.logger.error(
-                    f"❌ Shutdown failed for {svc.name}", extra={"error": str(e)}
+                    f"❌ Rollback failed for {name}", extra={"error": str(e)}
                 )
 
+    async def shutdown(
+        self, timeout: Optional[float] = None
+    ) -> Optional[ShutdownReport]:
+        """
+        Drain in-flight work, then stop all adapters within a global deadline.
+
+        First the runtime reports not-ready and stops admitting work tracked
+        through ``work``, and waits up to ``drain_timeout`` for work already
+        admitted to finish. Running tasks are cancelled next, then adapters are
+        stopped in reverse dependency order: an adapter is only stopped once
+        everything that depends on it has stopped, and independent adapters
+        stop in parallel.
+        Each ``shutdown()`` call is bounded by ``adapter_shutdown_timeout``;
+        adapters still running when the deadline passes are abandoned.
+
+        Args:
+            timeout (Optional[float]): Overrides ``shutdown_timeout`` for this call.
+
+        Returns:
+            Optional[ShutdownReport]: Per-adapter outcome, or None if not running.
+            Calls made while a shutdown is in progress join it.
+        """
+        if self._shutdown is not None and not self._shutdown.done():
+            return await asyncio.shield(self._shutdown)
+        if self.state != LifecycleState.STARTED:
+            self.logger.warn("🟡 Not running or already destroyed")
+            return None
+
+        self._shutdown = asyncio.ensure_future(self._shutdown_within(timeout))
+        return await asyncio.shield(self._shutdown)
+
+    async def _shutdown_within(self, timeout: Optional[float]) -> ShutdownReport:
+        self.logger.info("🛑 Application is shutting down!")
+        loop = asyncio.get_running_loop()
+        budget = self.shutdown_timeout if timeout is None else timeout
+        deadline = loop.time() + budget
+
+        abandoned = await self._drain(min(budget, self.drain_timeout or 0.0))
+
+        await self.health_monitor.stop()
+        if self._background is not None:
+            self._background.cancel()
+            await asyncio.gather(self._background, return_exceptions=True)
+        await asyncio.gather(
+            *(
+                task.stop(timeout=max(deadline - loop.time(), 0))
+                for task in self._supervised.values()
+            )
+        )
+
+        for activation in self._on_demand.values():
+            activation.close()
+        await asyncio.gather(*(a.cancel() for a in self._on_demand.values()))
+        async with self._restart_lock:
+            # Adapters left down by a failed restart, and optional or on-demand
+            # ones that are not running, have nothing to stop
+            running = [
+                n
+                for n in self._registry
+                if n not in self._restarting
+                and n not in self._down
+                and self._has_started(n)
+            ]
+            report = await self._stop_adapters(deadline, running)
+        report.abandoned_work = abandoned
+        # No publishers are left; consumers drain what is queued, then stop
+        self.bus.close()
+
         for task_fn in self.shutdown_tasks:
             try:
-                await task_fn()
+                await asyncio.wait_for(task_fn(), max(deadline - loop.time(), 0))
             except Exception as e:
                 self.logger.error("❌ Shutdown task failed:", extra={"error": str(e)})
 
+        if self.loop_monitor is not None:
+            await self.loop_monitor.stop()
+
+        if report.timed_out or report.skipped:
+            self.logger.warn(
+                "⏱️ Shutdown overran its deadline",
+                extra={"timed_out": report.timed_out, "skipped": report.skipped},
+            )
+        await self.resources.close_all()
         self.state = LifecycleState.DESTROYED
+        await self._flush_logs(max(deadline - loop.time(), 0))
+        return report
+
+    async def restart(self, name: str, timeout: Optional[float] = None) -> List[str]:
+        """
+        Restart adapter ``name`` and every adapter that depends on it.
+
+        The affected adapters are stopped in reverse dependency order (in
+        parallel where independent) and started again in ``startup_mode``, so
+        resources only they hold are reopened. Unrelated adapters, and the
+        resources they hold, are left untouched. The runtime reports not-ready
+        until the restart completes; if startup fails, the affected adapters
+        that did start are stopped again, all of them stay down, and it keeps
+        reporting not-ready until a restart succeeds.
+        Affected optional adapters start again in the background once the
+        required ones are up, retried and reported like at startup; their
+        failure never fails the restart. Affected on-demand adapters are only
+        stopped; their next use starts them again.
+
+        Args:
+            name (str): Adapter to restart
+            timeout (Optional[float]): Bounds stopping the affected adapters;
+                defaults to ``shutdown_timeout``
+
+        Returns:
+            List[str]: The restarted adapters, in start order
+
+        Raises:
+            ValueError: If ``name`` is not registered
+            RuntimeError: If the runtime is not running, optional adapters
+                among the affected ones are still starting in the background,
+                or the affected adapters did not stop within ``timeout``
+        """
+        if name not in self._registry:
+            raise ValueError(f"Unknown adapter: {name}")
+        async with self._restart_lock:
+            if self.state is not LifecycleState.STARTED or self._shutdown is not None:
+                raise RuntimeError(f"Cannot restart '{name}': runtime is not running")
+            names = self._graph.dependent_closure(name)
+            if self._background is not None and not self._background.done():
+                pending = [n for n in names if n in self._optional]
+                if pending:
+                    raise RuntimeError(
+                        f"Cannot restart '{name}': {', '.join(pending)} still "
+                        "starting in the background"
+                    )
+            self.logger.info("🔁 Restarting %s", ", ".join(names))
+            self._restarting.update(names)
+            try:
+                await self._restart_subgraph(name, names, timeout)
+            finally:
+                self._restarting.difference_update(names)
+            self.logger.info("🔁 Restarted %s", ", ".join(names))
+            return list(names)
+
+    async def _restart_subgraph(
+        self, name: str, names: Tuple[str, ...], timeout: Optional[float]
+    ) -> None:
+        # An on-demand dependent still starting would come up against a
+        # dependency that is about to stop
+        await asyncio.gather(
+            *(self._on_demand[n].cancel() for n in names if n in self._on_demand)
+        )
+        for affected in names:
+            self._adapter_events[affected].clear()
+            self._unready.discard(affected)
+            self._metrics.adapter_restarts.labels(affected).inc()
+
+        loop = asyncio.get_running_loop()
+        budget = self.shutdown_timeout if timeout is None else timeout
+        started = [n for n in names if n not in self._down and self._has_started(n)]
+        report = await self._stop_adapters(loop.time() + budget, started)
+        self._optional_started.difference_update(names)
+        for affected in names:
+            if affected in self._on_demand:
+                self._on_demand[affected].reset()
+        if report.skipped:
+            # The skipped ones were never asked to stop and are still running
+            self._down.update(n for n in names if n not in report.skipped)
+            raise RuntimeError(
+                f"Restart of '{name}' aborted: {', '.join(report.skipped)} "
+                f"not stopped within {budget}s"
+            )
+
+        # On-demand adapters start again on their next use. A failed start
+        # rolls back the ones that did start and leaves the subgraph down.
+        self._down.update(names)
+        await self._start_adapters(n for n in names if self._is_required(n))
+        self._down.difference_update(names)
+        optional = [n for n in names if n in self._optional]
+        if optional:
+            for affected in optional:
+                self._degraded.pop(affected, None)
+            self._background = asyncio.create_task(
+                self._start_optional(optional), name="restart:optional"
+            )
+
+    def _subset(self, names: Optional[Iterable[str]]) -> Tuple[str, ...]:
+        """Resolved start order, restricted to ``names`` when given."""
+        order = self._graph.resolve().order
+        if names is None:
+            return order
+        subset = set(names)
+        return tuple(name for name in order if name in subset)
+
+    async def _flush_logs(self, timeout: float) -> None:
+        """Drain queued log records off the loop, within what is left of the deadline."""
+        logger = self.logger
+        if isinstance(logger, RuntimeLogger) and logger.asynchronous:
+            loop = asyncio.get_running_loop()
+            if not await loop.run_in_executor(None, logger.flush, timeout):
+                self.logger.warn("⏱️ Log queue not drained before the deadline")
+
+    async def _drain(self, timeout: float) -> Dict[str, int]:
+        """Stop admitting work and wait for in-flight work; returns what is left."""
+        self.work.close()
+        if not self.work.in_flight():
+            return {}
+        self.logger.info(
+            "⏳ Draining in-flight work", extra={"in_flight": self.work.snapshot()}
+        )
+        if await self.work.wait_idle(timeout):
+            self.logger.info("✅ Drained in-flight work")
+            return {}
+        leftover = self.work.snapshot()
+        self.logger.warn(
+            "⏱️ Drain timed out, abandoning in-flight work",
+            extra={"in_flight": leftover},
+        )
+        return leftover
+
+    async def _stop_adapters(
+        self, deadline: float, names: Optional[Iterable[str]] = None
+    ) -> ShutdownReport:
+        loop = asyncio.get_running_loop()
+        order = self._subset(names)[::-1]
+        rank = {name: i for i, name in enumerate(order)}
+        blockers = {
+            name: sum(dep in rank for dep in self._graph.dependents(name))
+            for name in order
+        }
+
+        report = ShutdownReport()
+        running: Dict[asyncio.Task, str] = {}
+        launched: Set[str] = set()
+
+        def launch(names: List[str]) -> None:
+            for name in sorted(names, key=rank.__getitem__):
+                stop = asyncio.wait_for(
+                    self._stop_adapter(name), self.adapter_shutdown_timeout
+                )
+                running[asyncio.create_task(stop, name=f"shutdown:{name}")] = name
+                launched.add(name)
+
+        launch([name for name, count in blockers.items() if not count])
+        while running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(
+                running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            ready: List[str] = []
+            for task in done:
+                name = running.pop(task)
+                self._record_shutdown(name, task, report)
+                for dep in self._graph.dependencies(name):
+                    if dep not in blockers:
+                        continue
+                    blockers[dep] -= 1
+                    if not blockers[dep]:
+                        ready.append(dep)
+            launch(ready)
+
+        for task, name in running.items():
+            task.cancel()
+            report.timed_out.append(name)
+            self.logger.error(f"⏱️ Abandoned shutdown of {name} at deadline")
+        if running:
+            await asyncio.wait(running, timeout=0)
+        report.skipped = [name for name in rank if name not in launched]
+        return report
+
+    def _record_shutdown(
+        self, name: str, task: asyncio.Task, report: ShutdownReport
+    ) -> None:
+        error = None if task.cancelled() else task.exception()
+        if task.cancelled() or isinstance(error, asyncio.TimeoutError):
+            report.timed_out.append(name)
+            self.logger.error(
+                f"⏱️ Shutdown of {name} exceeded its timeout",
+                extra={"timeout": self.adapter_shutdown_timeout},
+            )
+        elif error is not None:
+            report.failed[name] = str(error)
+            self.logger.error(
+                f"❌ Shutdown failed for {name}", extra={"error": str(error)}
+            )
+        else:
+            report.stopped.append(name)
+            self.logger.info("🛑 Stopped %s", name)
 
     def _handle_signal(self, signum, _frame):
+        if self._shutdown is not None and not self._shutdown.done():
+            self.logger.info(
+                f"🔔 Received signal {signum}, shutdown already in progress"
+            )
+            return
         self.logger.info(f"🔔 Received signal {signum}, initiating shutdown...")
         asyncio.create_task(self.shutdown())
 
@@ -183,6 +1031,7 @@ class Orchestrator:
             await coro_fn()
         except asyncio.CancelledError:
             self.logger.info(f"🛑 Task {coro_fn.__name__} cancelled.")
+            raise
         except Exception:
             self.logger.error(f"❌ Task {coro_fn.__name__} failed:")
             raise
@@ -0,0 +1,266 @@
+import asyncio
+import gc
+import importlib
+import math
+import multiprocessing
+import os
+import signal
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+
+from haraka_runtime.orchestrator.orchestrator import (
+    DocsProvider,
+    Orchestrator,
+    Settings,
+)
+from haraka_runtime.orchestrator.log import RuntimeLogger
+from haraka_runtime.orchestrator.supervision import Backoff
+
+WORKER_ID_ENV = "HARAKA_WORKER_ID"
+DRAIN_TIMEOUT_ENV = "HARAKA_DRAIN_TIMEOUT"
+
+
+def cpu_quota(root: Path = Path("/sys/fs/cgroup")) -> int:
+    """
+    Number of CPUs this process may use, honouring a cgroup CPU quota.
+
+    Reads ``cpu.max`` (cgroup v2) or ``cpu.cfs_quota_us``/``cpu.cfs_period_us``
+    (cgroup v1) and rounds the quota up, capped by the CPUs we are scheduled
+    on. Falls back to the CPU count when no quota is set.
+    """
+    try:
+        available = len(os.sched_getaffinity(0))
+    except AttributeError:
+        available = os.cpu_count() or 1
+
+    quota: Optional[float] = None
+    try:
+        limit, period = (root / "cpu.max").read_text().split()[:2]
+        if limit != "max":
+            quota = int(limit) / int(period)
+    except (OSError, ValueError):
+        try:
+            limit = (root / "cpu" / "cpu.cfs_quota_us").read_text().strip()
+            period = (root / "cpu" / "cpu.cfs_period_us").read_text().strip()
+            if int(limit) > 0:
+                quota = int(limit) / int(period)
+        except (OSError, ValueError):
+            pass
+
+    if quota is None:
+        return max(1, available)
+    return max(1, min(available, math.ceil(quota)))
+
+
+def preload_modules(names: Iterable[str]) -> None:
+    """Import ``module`` or ``module:attr`` names, e.g. adapter entrypoints."""
+    for name in names:
+        importlib.import_module(name.partition(":")[0])
+
+
+def worker_shutdown_timeout(
+    default: float, drain_timeout: Optional[float] = None
+) -> float:
+    """
+    Shutdown budget for a worker: ``default``, capped so that shutdown ends
+    before the drain deadline after which the supervisor kills the worker.
+
+    The deadline is ``drain_timeout`` or, when not given, the supervisor's
+    ``drain_timeout`` passed to forked workers in ``HARAKA_DRAIN_TIMEOUT``.
+    """
+    if drain_timeout is None:
+        value = os.environ.get(DRAIN_TIMEOUT_ENV)
+        if not value:
+            return default
+        drain_timeout = float(value)
+    # Leave part of the deadline for the process itself to exit
+    return min(default, drain_timeout * 0.9)
+
+
+def orchestrator_worker(
+    factory: Callable[[], Orchestrator],
+    settings: Optional[Settings] = None,
+    app: Optional[DocsProvider] = None,
+) -> None:
+    """
+    Worker entry point running the orchestrator built by ``factory``.
+
+    The orchestrator is started, then shut down when the worker receives
+    SIGTERM or SIGINT, within its own ``shutdown_timeout`` capped by the
+    supervisor's drain deadline (see ``worker_shutdown_timeout``). Build it
+    with ``handle_signals=False``; the worker owns signal handling.
+    """
+
+    async def main() -> None:
+        runtime = factory()
+        runtime.shutdown_timeout = worker_shutdown_timeout(runtime.shutdown_timeout)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await runtime.run(settings, app)
+        await stop.wait()
+        await runtime.shutdown()
+
+    asyncio.run(main())
+
+
+class PreforkSupervisor:
+    """
+    Runs ``workers`` forked copies of ``target`` and keeps them running.
+
+    Modules named in ``preload`` are imported, and the heap frozen out of the
+    cyclic GC, before forking so workers share those pages copy-on-write. A
+    worker that exits non-zero is restarted after ``backoff``; more than
+    ``backoff.max_restarts`` crashes within ``backoff.window`` seconds stops
+    the whole supervisor. On SIGTERM the supervisor forwards the signal and
+    gives workers ``drain_timeout`` seconds to exit before killing them.
+    SIGINT (Ctrl-C) reaches workers through the process group and is not
+    forwarded. Workers find ``drain_timeout`` in ``HARAKA_DRAIN_TIMEOUT``.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: Optional[int] = None,
+        preload: Iterable[str] = (),
+        drain_timeout: float = 30.0,
+        backoff: Backoff = Backoff(),
+        variant: str = "PyFast",
+    ):
+        self.target = target
+        self.workers = workers if workers is not None else cpu_quota()
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.preload = tuple(preload)
+        self.drain_timeout = drain_timeout
+        self.backoff = backoff
+        self.logger = RuntimeLogger.for_variant(variant)
+        self.procs: Dict[int, Any] = {}
+        self._started: Dict[int, float] = {}
+        self.restarts = 0
+        self._ctx = multiprocessing.get_context("fork")
+        self._stopping = False
+
+    def run(self) -> int:
+        """Run until signalled or until every worker exits; returns an exit code."""
+        preload_modules(self.preload)
+        gc.collect()
+        gc.freeze()
+
+        previous = {
+            signal.SIGTERM: signal.signal(signal.SIGTERM, self._on_signal),
+            signal.SIGINT: signal.signal(signal.SIGINT, self._on_signal),
+        }
+        try:
+            for slot in range(self.workers):
+                self._spawn(slot)
+            code = self._supervise()
+            self._drain()
+            return code
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            gc.unfreeze()
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def _on_signal(self, signum: int, _frame: Any) -> None:
+        if not self._stopping:
+            self.logger.info(
+                f"🔔 Received signal {signal.Signals(signum).name}, draining workers..."
+            )
+        self._stopping = True
+        if signum == signal.SIGTERM:
+            self._signal_workers(signal.SIGTERM)
+
+    def _spawn(self, slot: int) -> None:
+        proc = self._ctx.Process(
+            target=_bootstrap,
+            args=(self.target, slot, self.drain_timeout),
+            name=f"worker-{slot}",
+        )
+        proc.start()
+        self.procs[slot] = proc
+        self._started[slot] = time.monotonic()
+        self.logger.info(f"👷 Started worker {slot}", extra={"pid": proc.pid})
+
+    def _supervise(self) -> int:
+        crashes: Deque[float] = deque()
+        attempts: Dict[int, int] = {}
+        pending: Dict[int, float] = {}
+        while not self._stopping:
+            now = time.monotonic()
+            for slot, due in list(pending.items()):
+                if due <= now:
+                    del pending[slot]
+                    self._spawn(slot)
+            if not self.procs and not pending:
+                return 0
+
+            sentinels = {proc.sentinel: slot for slot, proc in self.procs.items()}
+            for sentinel in wait(list(sentinels), timeout=0.1):
+                slot = sentinels[sentinel]
+                proc = self.procs.pop(slot)
+                proc.join()
+                if self._stopping or proc.exitcode == 0:
+                    continue
+
+                now = time.monotonic()
+                crashes.append(now)
+                while crashes and now - crashes[0] > self.backoff.window:
+                    crashes.popleft()
+                if len(crashes) > self.backoff.max_restarts:
+                    self.logger.error(
+                        "❌ Workers exceeded their restart budget, shutting down",
+                        extra={"max_restarts": self.backoff.max_restarts},
+                    )
+                    self._stopping = True
+                    self._signal_workers(signal.SIGTERM)
+                    return 1
+
+                # A worker that stayed up for a full window starts backoff over
+                lived = now - self._started[slot]
+                attempt = 0 if lived > self.backoff.window else attempts.get(slot, 0)
+                attempts[slot] = attempt + 1
+                delay = self.backoff.delay(attempt)
+                self.restarts += 1
+                self.logger.warn(
+                    f"🔁 Worker {slot} exited with {proc.exitcode}, "
+                    f"restarting in {delay:.2f}s",
+                    extra={"restarts": self.restarts},
+                )
+                pending[slot] = now + delay
+        return 0
+
+    def _drain(self) -> None:
+        deadline = time.monotonic() + self.drain_timeout
+        for proc in self.procs.values():
+            proc.join(max(0.0, deadline - time.monotonic()))
+        stragglers = [proc for proc in self.procs.values() if proc.is_alive()]
+        for proc in stragglers:
+            self.logger.warn(
+                f"⏰ Worker {proc.name} did not drain in time, killing it",
+                extra={"pid": proc.pid},
+            )
+            proc.kill()
+            proc.join()
+        self.procs.clear()
+
+    def _signal_workers(self, signum: int) -> None:
+        for proc in self.procs.values():
+            if proc.is_alive():
+                os.kill(proc.pid, signum)
+
+
+def _bootstrap(target: Callable[[], None], slot: int, drain_timeout: float) -> None:
+    # Forked children inherit the supervisor's handlers; start from defaults
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    os.environ[WORKER_ID_ENV] = str(slot)
+    os.environ[DRAIN_TIMEOUT_ENV] = str(drain_timeout)
+    target()
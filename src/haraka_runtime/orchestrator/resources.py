@@ -0,0 +1,110 @@
+import asyncio
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+Factory = Callable[[], Awaitable[Any]]
+Closer = Callable[[Any], Awaitable[None]]
+
+
+@dataclass
+class _Resource:
+    factory: Factory
+    close: Optional[Closer]
+    users: Set[str] = field(default_factory=set)
+    value: Any = None
+    live: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ResourceRegistry:
+    """
+    Named, reference-counted resources shared between adapters.
+
+    A resource (a Redis pool, an HTTP client, a DB engine...) is defined once
+    with an async ``factory`` that creates and warms it. The first ``acquire``
+    creates it; later acquirers share the same object, even while creation is
+    still in flight. When the last user releases it, it is closed with
+    ``close`` or, by default, the object's own ``aclose()``/``close()``.
+    """
+
+    def __init__(self, logger: Any):
+        self.logger = logger
+        self._resources: Dict[str, _Resource] = {}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._resources
+
+    def define(
+        self, name: str, factory: Factory, close: Optional[Closer] = None
+    ) -> None:
+        if name in self._resources:
+            raise ValueError(f"Resource '{name}' is already defined")
+        self._resources[name] = _Resource(factory, close)
+
+    async def acquire(self, name: str, user: str) -> Any:
+        """Return resource ``name``, creating it on first use; counts ``user`` once."""
+        resource = self._lookup(name)
+        async with resource.lock:
+            if not resource.live:
+                resource.value = await resource.factory()
+                resource.live = True
+                self.logger.info("🔌 Opened resource %s", name)
+            resource.users.add(user)
+            return resource.value
+
+    def get(self, name: str) -> Any:
+        """Return a resource that is currently held by at least one user."""
+        resource = self._lookup(name)
+        if not resource.live:
+            raise RuntimeError(f"Resource '{name}' has not been acquired")
+        return resource.value
+
+    def users(self, name: str) -> Set[str]:
+        return set(self._lookup(name).users)
+
+    def held_by(self, user: str) -> List[str]:
+        return [name for name, r in self._resources.items() if user in r.users]
+
+    async def release(self, name: str, user: str) -> None:
+        """Drop ``user``'s reference; the last release closes the resource."""
+        resource = self._lookup(name)
+        async with resource.lock:
+            resource.users.discard(user)
+            if resource.users or not resource.live:
+                return
+            value, resource.value, resource.live = resource.value, None, False
+            try:
+                await self._close(resource, value)
+                self.logger.info("🔌 Closed resource %s", name)
+            except Exception as e:
+                self.logger.error(
+                    f"❌ Failed to close resource {name}", extra={"error": str(e)}
+                )
+
+    async def release_all(self, user: str) -> None:
+        for name in self.held_by(user):
+            await self.release(name, user)
+
+    async def close_all(self) -> None:
+        """Close every live resource regardless of its remaining users."""
+        for name, resource in self._resources.items():
+            for user in list(resource.users):
+                await self.release(name, user)
+
+    def _lookup(self, name: str) -> _Resource:
+        try:
+            return self._resources[name]
+        except KeyError:
+            raise ValueError(f"Unknown resource '{name}'") from None
+
+    @staticmethod
+    async def _close(resource: _Resource, value: Any) -> None:
+        if resource.close is not None:
+            await resource.close(value)
+            return
+        closer = getattr(value, "aclose", None) or getattr(value, "close", None)
+        if closer is not None:
+            result = closer()
+            if inspect.isawaitable(result):
+                await result
@@ -0,0 +1,199 @@
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+
+
+class RestartPolicy(Enum):
+    ALWAYS = auto()
+    ON_FAILURE = auto()
+    NEVER = auto()
+
+
+class TaskState(Enum):
+    PENDING = auto()
+    RUNNING = auto()
+    BACKING_OFF = auto()
+    COMPLETED = auto()
+    FAILED = auto()
+    STOPPED = auto()
+
+
+@dataclass(frozen=True)
+class Backoff:
+    """Exponential restart backoff with jitter and a restart-rate ceiling."""
+
+    initial: float = 0.5
+    maximum: float = 30.0
+    factor: float = 2.0
+    jitter: float = 0.2
+    max_restarts: int = 10
+    window: float = 60.0
+
+    def delay(self, attempt: int) -> float:
+        base = min(self.maximum, self.initial * self.factor**attempt)
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+@dataclass(frozen=True)
+class TaskStatus:
+    name: str
+    state: TaskState
+    workers: int
+    running: int
+    restarts: int
+    last_error: Optional[str]
+
+
+# How a group's state is derived from its workers': the first one any worker is in
+_PRECEDENCE = (
+    TaskState.FAILED,
+    TaskState.RUNNING,
+    TaskState.BACKING_OFF,
+    TaskState.STOPPED,
+    TaskState.PENDING,
+)
+
+
+class SupervisedTask:
+    """
+    Runs ``workers`` copies of a coroutine function and restarts them per policy.
+
+    A worker that raises is restarted after an exponential backoff. If it
+    crashes more than ``backoff.max_restarts`` times within ``backoff.window``
+    seconds it is given up on and marked ``FAILED``. With
+    ``RestartPolicy.ALWAYS`` a worker that returns is run again after
+    ``backoff.initial`` seconds; clean exits reset the backoff and never count
+    against the crash budget. ``max_concurrency`` bounds how many workers
+    execute at the same time. Each worker has its own state; ``state``
+    combines them, and a failed worker keeps the task ``FAILED``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Awaitable[Any]],
+        logger: Any,
+        policy: RestartPolicy = RestartPolicy.ON_FAILURE,
+        backoff: Backoff = Backoff(),
+        workers: int = 1,
+        max_concurrency: Optional[int] = None,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.name = name
+        self.fn = fn
+        self.logger = logger
+        self.policy = policy
+        self.backoff = backoff
+        self.workers = workers
+        self.restarts = 0
+        self.last_error: Optional[str] = None
+        self.tasks: List[asyncio.Task] = []
+        self._running = 0
+        self._states = [TaskState.PENDING] * workers
+        self._stopping = False
+        self._limit = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+    @property
+    def state(self) -> TaskState:
+        for state in _PRECEDENCE:
+            if state in self._states:
+                return state
+        return TaskState.COMPLETED
+
+    def status(self) -> TaskStatus:
+        return TaskStatus(
+            self.name,
+            self.state,
+            self.workers,
+            self._running,
+            self.restarts,
+            self.last_error,
+        )
+
+    def start(self) -> None:
+        if self.tasks:
+            return
+        for index in range(self.workers):
+            task_name = self.name if self.workers == 1 else f"{self.name}[{index}]"
+            self._states[index] = TaskState.RUNNING
+            self.tasks.append(
+                asyncio.create_task(self._supervise(index), name=task_name)
+            )
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping = True
+        for task in self.tasks:
+            task.cancel()
+        if self.tasks:
+            await asyncio.wait(self.tasks, timeout=timeout)
+        for index, state in enumerate(self._states):
+            if state in (TaskState.RUNNING, TaskState.BACKING_OFF):
+                self._states[index] = TaskState.STOPPED
+
+    async def _supervise(self, index: int) -> None:
+        recent: Deque[float] = deque()
+        attempt = 0
+        while not self._stopping:
+            error: Optional[BaseException] = None
+            try:
+                await self._run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+                self.last_error = str(e) or type(e).__name__
+
+            if self._stopping:
+                return
+            if self.policy is RestartPolicy.NEVER or (
+                error is None and self.policy is RestartPolicy.ON_FAILURE
+            ):
+                self._states[index] = TaskState.FAILED if error else TaskState.COMPLETED
+                return
+
+            if error is None:
+                # A clean exit under ALWAYS is the normal cycle of e.g. a poller
+                recent.clear()
+                attempt = 0
+                delay = self.backoff.initial
+            else:
+                now = time.monotonic()
+                recent.append(now)
+                while recent and now - recent[0] > self.backoff.window:
+                    recent.popleft()
+                if len(recent) > self.backoff.max_restarts:
+                    self.logger.error(
+                        f"❌ Task {self.name} exceeded its restart budget, giving up",
+                        extra={"max_restarts": self.backoff.max_restarts},
+                    )
+                    self._states[index] = TaskState.FAILED
+                    return
+                delay = self.backoff.delay(attempt)
+                attempt += 1
+                self.logger.warn(
+                    f"🔁 Restarting task {self.name} in {delay:.2f}s",
+                    extra={"restarts": self.restarts + 1},
+                )
+            self.restarts += 1
+            self._states[index] = TaskState.BACKING_OFF
+            await asyncio.sleep(delay)
+            self._states[index] = TaskState.RUNNING
+
+    async def _run_once(self) -> None:
+        if self._limit is None:
+            await self._run_counted()
+            return
+        async with self._limit:
+            await self._run_counted()
+
+    async def _run_counted(self) -> None:
+        self._running += 1
+        try:
+            await self.fn()
+        finally:
+            self._running -= 1
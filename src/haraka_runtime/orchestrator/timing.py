@@ -0,0 +1,102 @@
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from haraka_runtime.orchestrator.graph import DependencyGraph
+
+
+@dataclass
+class AdapterTiming:
+    """Monotonic timestamps (seconds) of one adapter's lifecycle events."""
+
+    name: str
+    startup_began: Optional[float] = None
+    startup_ended: Optional[float] = None
+    ready_at: Optional[float] = None
+    shutdown_began: Optional[float] = None
+    shutdown_ended: Optional[float] = None
+
+    @property
+    def startup_duration(self) -> Optional[float]:
+        return _span(self.startup_began, self.startup_ended)
+
+    @property
+    def shutdown_duration(self) -> Optional[float]:
+        return _span(self.shutdown_began, self.shutdown_ended)
+
+
+@dataclass
+class StartupReport:
+    """Where startup time went, per adapter and along the critical path."""
+
+    total: Optional[float]
+    adapters: Dict[str, Dict[str, Optional[float]]] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    critical_path_duration: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _span(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    if start is None or end is None:
+        return None
+    return end - start
+
+
+class LifecycleTimings:
+    """
+    Collects lifecycle timestamps for every adapter.
+
+    Durations in reports are relative to ``run_began``; a dependency wait is
+    the time from the start of ``run()`` until the adapter's last dependency
+    finished starting, and ``queued`` is any further delay before its own
+    ``startup()`` began.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.run_began: Optional[float] = None
+        self.run_ended: Optional[float] = None
+        self.adapters: Dict[str, AdapterTiming] = {}
+
+    def record(self, name: str, event: str) -> None:
+        """Stamp ``event`` (an ``AdapterTiming`` field) for adapter ``name``."""
+        timing = self.adapters.get(name)
+        if timing is None:
+            timing = self.adapters[name] = AdapterTiming(name)
+        setattr(timing, event, self.clock())
+
+    def startup_report(self, graph: DependencyGraph) -> StartupReport:
+        order = [name for name in graph.resolve().order if name in self.adapters]
+        report = StartupReport(total=_span(self.run_began, self.run_ended))
+        if self.run_began is None:
+            return report
+
+        finished: Dict[str, float] = {}
+        via: Dict[str, Optional[str]] = {}
+        for name in order:
+            timing = self.adapters[name]
+            deps = [d for d in graph.dependencies(name) if d in finished]
+            last_dep = max(deps, key=finished.__getitem__, default=None)
+            deps_met = finished[last_dep] if last_dep else self.run_began
+            report.adapters[name] = {
+                "dependency_wait": deps_met - self.run_began,
+                "queued": _span(deps_met, timing.startup_began),
+                "startup": timing.startup_duration,
+                "ready": _span(self.run_began, timing.ready_at),
+                "shutdown": timing.shutdown_duration,
+            }
+            if timing.startup_ended is not None:
+                finished[name] = timing.startup_ended
+                via[name] = last_dep
+
+        if finished:
+            last = max(finished, key=finished.__getitem__)
+            report.critical_path_duration = finished[last] - self.run_began
+            node: Optional[str] = last
+            while node is not None:
+                report.critical_path.append(node)
+                node = via[node]
+            report.critical_path.reverse()
+        return report
@@ -4,48 +4,49 @@
 # # It supports service autoloading via service.yaml manifests, structured startup/shutdown,
 # # and optional API routing via modular routers.
 #
-# from fastapi import FastAPI
 # from pathlib import Path
-# from contextlib import asynccontextmanager
 #
-# from src.haraka_runtime.orchestrator import Orchestrator
-# from src.haraka_runtime.loader import load_adapter_from_manifest
+# from haraka_runtime.orchestrator.orchestrator import Orchestrator
+# from haraka_runtime.loader.manifest_loader import load_adapters_from_manifests
+# from haraka_runtime.runtime_http.main import create_app, serve
 # from config.settings import settings  # Project-level config via pydantic
 # from app.routes import include_routers  # Optional route aggregator
 #
-# # Initialize orchestrator — the core Haraka runtime controller
-# runtime = Orchestrator()
-#
-#
-# # Lifecycle wrapper using FastAPI lifespan protocol
-# @asynccontextmanager
-# async def lifespan(app: FastAPI):
-#     # Start orchestrator + all services (in dependency/priority order)
-#     await runtime.run(settings, app)
-#     yield
-#     # Clean shutdown of services (reverse order)
-#     await runtime.shutdown()
-#
-#
-# # Create FastAPI app with standard Swagger UI config
-# app = FastAPI(
-#     title="app_name",
-#     version="version",
-#     description="description",
-#     openapi_url="/openapi.json",
-#     docs_url="/app_name/docs",
-#     redoc_url=None,
-#     swagger_ui_parameters={
-#         "defaultModelsExpandDepth": 1,
-#         "displayRequestDuration": True,
-#         "syntaxHighlight": {"theme": "obsidian"},
-#     },
-#     lifespan=lifespan,
-# )
-#
-# # Optional: Include modular API routers (if HTTP is used)
-# include_routers(app)
-#
-# # Load all declared services from service.yaml manifests in ./services/
-# for manifest_path in Path("services").rglob("service.yaml"):
-#     load_adapter_from_manifest(manifest_path, runtime)
+#
+# def make_app():
+#     # One orchestrator per worker process; uvicorn owns signal handling and
+#     # drives startup/shutdown through the app's lifespan
+#     runtime = Orchestrator(handle_signals=False)
+#
+#     # Create FastAPI app with standard Swagger UI config
+#     app = create_app(
+#         runtime,
+#         settings,
+#         title="app_name",
+#         version="version",
+#         description="description",
+#         openapi_url="/openapi.json",
+#         docs_url="/app_name/docs",
+#         swagger_ui_parameters={
+#             "defaultModelsExpandDepth": 1,
+#             "displayRequestDuration": True,
+#             "syntaxHighlight": {"theme": "obsidian"},
+#         },
+#     )
+#
+#     # Optional: Include modular API routers (if HTTP is used)
+#     include_routers(app)
+#
+#     # Load all declared services from service.yaml manifests in ./services/
+#     # (parsed in parallel, validated together, registered in one batch).
+#     # Images can precompile them at build time with
+#     #   python -m haraka_runtime.loader.startup_plan services -o startup-plan.json
+#     # and use load_startup_plan(Path("startup-plan.json"), Path("services"), runtime)
+#     # instead; it falls back to the manifests if they changed since.
+#     load_adapters_from_manifests(Path("services"), runtime)
+#     return app
+#
+#
+# if __name__ == "__main__":
+#     # uvloop + httptools when installed; N workers share the port via SO_REUSEPORT
+#     serve(make_app, port=settings.port, workers=4)
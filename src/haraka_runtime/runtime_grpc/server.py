@@ -0,0 +1,209 @@
+import functools
+import inspect
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from haraka_runtime.core.interfaces import Adapter
+
+Serializer = Optional[Callable[[Any], bytes]]
+Deserializer = Optional[Callable[[bytes], Any]]
+
+
+class GrpcServer(Adapter):
+    """
+    Asyncio gRPC server run as an orchestrator adapter.
+
+    Register it with ``Orchestrator.use(server, dependencies=[...])`` so it only
+    starts accepting RPCs once the adapters its handlers rely on are up.
+    Handlers are registered per method: unary handlers are coroutines,
+    server-streaming and bidi handlers are async generators. Each ``yield``
+    waits for the transport to accept the message, so a slow client applies
+    HTTP/2 flow control back to the handler instead of buffering unboundedly.
+
+    On shutdown the server stops accepting RPCs, withdraws readiness and gives
+    in-flight RPCs ``drain_grace`` seconds (capped by the orchestrator's
+    per-adapter shutdown timeout) to finish before cancelling them.
+    Requires the ``grpcio`` package.
+    """
+
+    def __init__(
+        self,
+        name: str = "grpc",
+        host: str = "[::]",
+        port: Optional[int] = None,
+        max_concurrent_streams: int = 100,
+        max_concurrent_rpcs: Optional[int] = None,
+        keepalive_time_ms: int = 30_000,
+        keepalive_timeout_ms: int = 10_000,
+        max_message_bytes: int = 4 * 1024 * 1024,
+        drain_grace: float = 5.0,
+        options: Optional[List[Tuple[str, Any]]] = None,
+    ):
+        self.name = name
+        self.host = host
+        self.port = (
+            port if port is not None else int(os.environ.get("GRPC_PORT", 50051))
+        )
+        self.max_concurrent_rpcs = max_concurrent_rpcs
+        self.drain_grace = drain_grace
+        self.options = [
+            ("grpc.max_concurrent_streams", max_concurrent_streams),
+            ("grpc.keepalive_time_ms", keepalive_time_ms),
+            ("grpc.keepalive_timeout_ms", keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            ("grpc.http2.min_ping_interval_without_data_ms", keepalive_time_ms // 2),
+            ("grpc.max_send_message_length", max_message_bytes),
+            ("grpc.max_receive_message_length", max_message_bytes),
+            *(options or []),
+        ]
+        self.bound_port: Optional[int] = None
+        self.active_rpcs = 0
+        self._methods: Dict[str, Dict[str, Tuple[str, Callable, Any, Any]]] = {}
+        self._servicers: List[Tuple[Callable[[Any, Any], None], Any]] = []
+        self._server: Any = None
+
+    def add_unary(
+        self,
+        service: str,
+        method: str,
+        handler: Callable,
+        request_deserializer: Deserializer = None,
+        response_serializer: Serializer = None,
+    ) -> None:
+        self._add(
+            "unary_unary",
+            service,
+            method,
+            handler,
+            request_deserializer,
+            response_serializer,
+        )
+
+    def add_server_stream(
+        self,
+        service: str,
+        method: str,
+        handler: Callable,
+        request_deserializer: Deserializer = None,
+        response_serializer: Serializer = None,
+    ) -> None:
+        self._add(
+            "unary_stream",
+            service,
+            method,
+            handler,
+            request_deserializer,
+            response_serializer,
+        )
+
+    def add_bidi_stream(
+        self,
+        service: str,
+        method: str,
+        handler: Callable,
+        request_deserializer: Deserializer = None,
+        response_serializer: Serializer = None,
+    ) -> None:
+        self._add(
+            "stream_stream",
+            service,
+            method,
+            handler,
+            request_deserializer,
+            response_serializer,
+        )
+
+    def add_servicer(
+        self, add_to_server: Callable[[Any, Any], None], servicer: Any
+    ) -> None:
+        """Register protoc-generated code, e.g. ``add_GreeterServicer_to_server``."""
+        self._servicers.append((add_to_server, servicer))
+
+    async def startup(self):
+        try:
+            import grpc
+        except ImportError as e:
+            raise ImportError("GrpcServer requires the 'grpcio' package") from e
+
+        self._server = grpc.aio.server(
+            options=self.options, maximum_concurrent_rpcs=self.max_concurrent_rpcs
+        )
+        handlers = []
+        for service, methods in self._methods.items():
+            table = {
+                method: getattr(grpc, f"{kind}_rpc_method_handler")(
+                    self._track(handler),
+                    request_deserializer=request_deserializer,
+                    response_serializer=response_serializer,
+                )
+                for method, (
+                    kind,
+                    handler,
+                    request_deserializer,
+                    response_serializer,
+                ) in methods.items()
+            }
+            handlers.append(grpc.method_handlers_generic_handler(service, table))
+        self._server.add_generic_rpc_handlers(tuple(handlers))
+        for add_to_server, servicer in self._servicers:
+            add_to_server(servicer, self._server)
+
+        self.bound_port = self._server.add_insecure_port(f"{self.host}:{self.port}")
+        await self._server.start()
+        runtime = getattr(self, "runtime", None)
+        if runtime is not None:
+            runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        if self._server is None:
+            return
+        runtime = getattr(self, "runtime", None)
+        grace = self.drain_grace
+        if runtime is not None:
+            runtime.mark_unready(self.name)
+            limit = getattr(runtime, "adapter_shutdown_timeout", None)
+            if limit is not None:
+                grace = min(grace, limit * 0.9)
+        await self._server.stop(grace)
+        self._server = None
+
+    def _add(
+        self,
+        kind: str,
+        service: str,
+        method: str,
+        handler: Callable,
+        request_deserializer: Deserializer,
+        response_serializer: Serializer,
+    ) -> None:
+        self._methods.setdefault(service, {})[method] = (
+            kind,
+            handler,
+            request_deserializer,
+            response_serializer,
+        )
+
+    def _track(self, handler: Callable) -> Callable:
+        """Count in-flight RPCs around a coroutine or async-generator handler."""
+        if inspect.isasyncgenfunction(handler):
+
+            @functools.wraps(handler)
+            async def stream(request: Any, context: Any) -> Any:
+                self.active_rpcs += 1
+                try:
+                    async for response in handler(request, context):
+                        yield response
+                finally:
+                    self.active_rpcs -= 1
+
+            return stream
+
+        @functools.wraps(handler)
+        async def unary(request: Any, context: Any) -> Any:
+            self.active_rpcs += 1
+            try:
+                return await handler(request, context)
+            finally:
+                self.active_rpcs -= 1
+
+        return unary
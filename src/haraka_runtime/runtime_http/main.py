@@ -0,0 +1,290 @@
+"""
+HTTP façade for Haraka Runtime.
+
+Builds a FastAPI app whose lifespan runs an ``Orchestrator`` and serves it
+with uvicorn, on uvloop/httptools when they are installed. ``serve`` can run
+several worker processes on one port: each worker binds its own
+``SO_REUSEPORT`` socket so the kernel spreads connections across them, and
+each calls the app factory to build its own orchestrator and adapters.
+
+Usage::
+
+    python -m haraka_runtime.runtime_http.main app.main:make_app --workers 4
+"""
+
+import argparse
+import functools
+import importlib
+import os
+import socket
+import sys
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional
+
+from haraka_runtime.loader.entrypoint import parse_entrypoint
+from haraka_runtime.orchestrator.drain import AdmissionClosed
+from haraka_runtime.orchestrator.metrics import CONTENT_TYPE
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, Settings
+from haraka_runtime.orchestrator.prefork import (
+    PreforkSupervisor,
+    worker_shutdown_timeout,
+)
+
+AppFactory = Callable[[], Any]
+
+
+def lifespan(runtime: Orchestrator, settings: Settings) -> Callable[[Any], Any]:
+    """FastAPI ``lifespan`` that starts ``runtime`` and shuts it down on exit."""
+
+    @asynccontextmanager
+    async def _lifespan(app: Any) -> AsyncIterator[None]:
+        await runtime.run(settings, app)
+        try:
+            yield
+        finally:
+            await runtime.shutdown()
+
+    return _lifespan
+
+
+def create_app(
+    runtime: Orchestrator,
+    settings: Settings,
+    metrics_path: Optional[str] = "/metrics",
+    health_path: Optional[str] = "/healthz",
+    ready_path: Optional[str] = "/readyz",
+    **fastapi_kwargs: Any,
+) -> Any:
+    """
+    Create a FastAPI app driven by ``runtime``.
+
+    Every request is tracked in ``runtime.work``; once shutdown starts
+    draining, new requests get a 503. ``runtime.metrics`` is served in the
+    Prometheus text format at ``metrics_path``, liveness (``is_live()``) at
+    ``health_path`` and readiness (``is_ready()`` plus the cached health
+    checks) at ``ready_path``; each answers 200 or 503, stays reachable
+    while draining, and is disabled by passing ``None``.
+
+    uvicorn owns SIGINT and SIGTERM and shuts the orchestrator down through
+    the lifespan, so the orchestrator's own signal handling is turned off.
+    """
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse, Response
+
+    runtime.release_signals()
+    fastapi_kwargs.setdefault("redoc_url", None)
+    app = FastAPI(lifespan=lifespan(runtime, settings), **fastapi_kwargs)
+    app.state.runtime = runtime
+    probes = {metrics_path, health_path, ready_path} - {None}
+
+    @app.middleware("http")
+    async def admission(request: Any, call_next: Any) -> Any:
+        # Requests count as in-flight work, so shutdown drains them before
+        # tearing adapters down; once draining, new requests are turned away.
+        if request.url.path in probes:
+            return await call_next(request)
+        try:
+            with runtime.work.track("http"):
+                return await call_next(request)
+        except AdmissionClosed:
+            return JSONResponse(
+                {"detail": "Shutting down"},
+                status_code=503,
+                headers={"Connection": "close"},
+            )
+
+    if metrics_path is not None:
+
+        @app.get(metrics_path, include_in_schema=False)
+        async def metrics() -> Any:
+            return Response(runtime.metrics.render(), media_type=CONTENT_TYPE)
+
+    if health_path is not None:
+
+        @app.get(health_path, include_in_schema=False)
+        async def healthz() -> Any:
+            live = runtime.is_live()
+            return JSONResponse({"live": live}, status_code=200 if live else 503)
+
+    if ready_path is not None:
+
+        @app.get(ready_path, include_in_schema=False)
+        async def readyz() -> Any:
+            ready = runtime.is_ready()
+            body = {"ready": ready, **runtime.health_snapshot().as_dict()}
+            return JSONResponse(body, status_code=200 if ready else 503)
+
+    return app
+
+
+def event_loop_impl() -> str:
+    """Return ``"uvloop"`` if it is installed, otherwise ``"asyncio"``."""
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        return "asyncio"
+    return "uvloop"
+
+
+def http_impl() -> str:
+    """Return ``"httptools"`` if it is installed, otherwise ``"h11"``."""
+    try:
+        import httptools  # noqa: F401
+    except ImportError:
+        return "h11"
+    return "httptools"
+
+
+def bind_socket(host: str, port: int, reuse_port: bool = False) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def serve(
+    app_factory: AppFactory,
+    host: str = "0.0.0.0",
+    port: Optional[int] = None,
+    workers: int = 1,
+    log_level: str = "info",
+    preload: Iterable[str] = (),
+    drain_timeout: float = 30.0,
+) -> int:
+    """
+    Serve the app returned by ``app_factory`` until SIGINT/SIGTERM.
+
+    With several workers a ``PreforkSupervisor`` forks them, restarts crashed
+    workers and bounds the drain on SIGTERM. Each worker gives uvicorn half of
+    ``drain_timeout`` to finish open requests and caps the orchestrator's
+    shutdown to the rest.
+
+    Args:
+        app_factory: Zero-argument callable building the app (and its
+            orchestrator); called once per worker, in the worker
+        host: Interface to listen on
+        port: Port to listen on, defaulting to ``HTTP_PORT`` or 8080
+        workers: Number of worker processes
+        log_level: uvicorn log level
+        preload: Modules to import before forking workers
+        drain_timeout: Seconds workers get to shut down after SIGTERM
+
+    Returns:
+        The process exit code
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if port is None:
+        port = int(os.environ.get("HTTP_PORT", 8080))
+
+    if workers == 1:
+        _run_worker(app_factory, bind_socket(host, port), log_level, drain_timeout)
+        return 0
+
+    if port == 0:
+        raise ValueError("Multiple workers need a fixed port to share")
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    # Without SO_REUSEPORT, workers inherit one listening socket instead
+    shared = None if reuse_port else bind_socket(host, port)
+    try:
+        return PreforkSupervisor(
+            functools.partial(
+                _worker_main, app_factory, host, port, shared, log_level, drain_timeout
+            ),
+            workers=workers,
+            preload=preload,
+            drain_timeout=drain_timeout,
+        ).run()
+    finally:
+        if shared is not None:
+            shared.close()
+
+
+def _worker_main(
+    app_factory: AppFactory,
+    host: str,
+    port: int,
+    shared: Optional[socket.socket],
+    log_level: str,
+    drain_timeout: float,
+) -> None:
+    sock = shared if shared is not None else bind_socket(host, port, reuse_port=True)
+    _run_worker(app_factory, sock, log_level, drain_timeout)
+
+
+def _run_worker(
+    app_factory: AppFactory,
+    sock: socket.socket,
+    log_level: str,
+    drain_timeout: float,
+) -> None:
+    import uvicorn
+
+    app = app_factory()
+    # uvicorn finishes open requests first, then the lifespan shuts the
+    # orchestrator down; together they must fit in the drain deadline
+    graceful = int(drain_timeout // 2)  # uvicorn takes whole seconds
+    runtime = getattr(getattr(app, "state", None), "runtime", None)
+    if isinstance(runtime, Orchestrator):
+        runtime.shutdown_timeout = worker_shutdown_timeout(
+            runtime.shutdown_timeout, drain_timeout - graceful
+        )
+    config = uvicorn.Config(
+        app,
+        loop=event_loop_impl(),
+        http=http_impl(),
+        lifespan="on",
+        log_level=log_level,
+        timeout_graceful_shutdown=graceful,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _load_factory(entrypoint: str) -> AppFactory:
+    module_path, attr = parse_entrypoint(entrypoint)
+    factory = getattr(importlib.import_module(module_path), attr)
+    if not callable(factory):
+        raise TypeError(f"{entrypoint} is not callable")
+    return factory
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve a Haraka Runtime HTTP app")
+    parser.add_argument("factory", help="App factory as 'module:function'")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument(
+        "--preload",
+        action="append",
+        default=[],
+        help="Module to import before forking workers (repeatable)",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds workers get to shut down after SIGTERM",
+    )
+    args = parser.parse_args(argv)
+    sys.exit(
+        serve(
+            _load_factory(args.factory),
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level=args.log_level,
+            preload=args.preload,
+            drain_timeout=args.drain_timeout,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
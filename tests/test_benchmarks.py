@@ -0,0 +1,34 @@
+from benchmarks.run import compare, edges, run_suite
+
+
+def test_graph_shapes():
+    assert edges("flat", 3) == [("svc0", []), ("svc1", []), ("svc2", [])]
+    assert edges("fanout", 3) == [("svc0", []), ("svc1", ["svc0"]), ("svc2", ["svc0"])]
+    assert edges("chain", 3) == [("svc0", []), ("svc1", ["svc0"]), ("svc2", ["svc1"])]
+
+
+def test_suite_covers_every_phase():
+    results = run_suite(sizes=(10,), repeat=1, io_latency=0.0)
+
+    for phase in ("resolve", "run", "wait_for_all_ready", "shutdown"):
+        assert f"lifecycle/chain-10/concurrent/{phase}" in results
+    assert "lifecycle/fanout-10/sequential/run" in results
+    assert "manifest/10/cold" in results
+    assert "metrics/10/render" in results
+    assert all(stats["min"] <= stats["median"] for stats in results.values())
+
+
+def test_compare_flags_only_real_regressions():
+    baseline = {
+        "a": {"median": 0.010},
+        "b": {"median": 0.010},
+        "c": {"median": 0.0001},
+    }
+    results = {
+        "a": {"median": 0.020},  # 2x slower
+        "b": {"median": 0.011},  # within tolerance
+        "c": {"median": 0.0005},  # 5x, but below the noise floor
+        "d": {"median": 1.0},  # not in the baseline
+    }
+
+    assert compare(results, baseline, tolerance=0.25) == [("a", 0.010, 0.020)]
@@ -0,0 +1,96 @@
+import pytest
+
+from haraka_runtime.orchestrator.graph import DependencyGraph, StartPlan
+
+
+def test_priority_never_overrides_dependency_edges():
+    graph = DependencyGraph()
+    graph.add("db", 0, [])
+    graph.add("api", 100, ["db"])
+    graph.add("cache", 50, [])
+
+    plan = graph.resolve()
+
+    assert plan.order == ("cache", "db", "api")
+    assert plan.waves == (("cache", "db"), ("api",))
+
+
+def test_forward_and_reverse_indexes():
+    graph = DependencyGraph()
+    graph.add("db", 0, [])
+    graph.add("api", 0, ["db"])
+    graph.add("worker", 0, ["db", "db"])
+
+    assert graph.dependencies("worker") == ("db",)
+    assert graph.dependents("db") == ["api", "worker"]
+    assert graph.dependents("api") == []
+    assert "db" in graph and len(graph) == 3
+
+
+def test_dependent_closure_is_transitive_and_in_start_order():
+    graph = DependencyGraph()
+    graph.add("db", 0, [])
+    graph.add("cache", 0, [])
+    graph.add("web", 10, ["api", "cache"])
+    graph.add("api", 0, ["db"])
+    graph.add("jobs", 5, ["db"])
+
+    assert graph.dependent_closure("db") == ("db", "jobs", "api", "web")
+    assert graph.dependent_closure("cache") == ("cache", "web")
+    assert graph.dependent_closure("web") == ("web",)
+
+
+def test_plan_is_cached_until_graph_changes():
+    graph = DependencyGraph()
+    graph.add("a", 0, [])
+    first = graph.resolve()
+    assert graph.resolve() is first
+
+    graph.add("b", 1, ["a"])
+    second = graph.resolve()
+    assert second is not first
+    assert second.order == ("a", "b")
+
+
+def test_deep_chain_resolves_without_recursion():
+    graph = DependencyGraph()
+    graph.add("n0", 0, [])
+    for i in range(1, 5000):
+        graph.add(f"n{i}", i, [f"n{i - 1}"])
+
+    plan = graph.resolve()
+
+    assert plan.order[0] == "n0" and plan.order[-1] == "n4999"
+    assert len(plan.waves) == 5000
+
+
+def test_unknown_dependency_and_cycles_raise():
+    graph = DependencyGraph()
+    graph.add("a", 0, ["ghost"])
+    with pytest.raises(RuntimeError, match="Unknown dependency 'ghost'"):
+        graph.resolve()
+
+    cyclic = DependencyGraph()
+    cyclic.add("root", 0, [])
+    cyclic.add("a", 0, ["b"])
+    cyclic.add("b", 0, ["a"])
+    with pytest.raises(RuntimeError, match="Circular dependency detected at a"):
+        cyclic.resolve()
+
+    with pytest.raises(ValueError):
+        cyclic.add("a", 0, [])
+
+
+def test_adopt_rejects_plans_that_do_not_fit():
+    graph = DependencyGraph()
+    graph.add("db", 0, [])
+    graph.add("api", 0, ["db"])
+
+    with pytest.raises(ValueError, match="does not match"):
+        graph.adopt(StartPlan(("db",), (("db",),)))
+    with pytest.raises(ValueError, match="before its dependencies"):
+        graph.adopt(StartPlan(("api", "db"), (("api", "db"),)))
+
+    plan = StartPlan(("db", "api"), (("db",), ("api",)))
+    graph.adopt(plan)
+    assert graph.resolve() is plan
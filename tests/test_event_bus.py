@@ -0,0 +1,152 @@
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.bus import BusClosed, EventBus
+from haraka_runtime.orchestrator.log import OverflowPolicy
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+
+@dataclass
+class Order:
+    id: int
+
+
+@pytest.mark.asyncio
+async def test_items_fan_out_by_reference():
+    bus = EventBus()
+    orders = bus.topic("orders", Order)
+    billing = orders.subscribe("billing")
+    audit = bus.topic("orders", Order).subscribe("audit")
+
+    order = Order(1)
+    await orders.publish(order)
+
+    assert await billing.get() is order
+    assert await audit.get() is order
+    assert orders.published == 1
+
+    frames = bus.topic("frames", memoryview).subscribe("sse")
+    buffer = bytearray(b"hello")
+    await bus.topic("frames", memoryview).publish(memoryview(buffer)[1:])
+    view = await frames.get()
+    buffer[1:] = b"ELLO"
+    assert view.tobytes() == b"ELLO"  # a window onto the buffer, not a copy
+
+
+@pytest.mark.asyncio
+async def test_topics_are_typed():
+    bus = EventBus()
+    orders = bus.topic("orders", Order)
+
+    with pytest.raises(TypeError, match="carries Order, got dict"):
+        await orders.publish({"id": 1})
+    with pytest.raises(TypeError, match="carries Order"):
+        await orders.publish_batch([Order(1), "nope"])
+    with pytest.raises(TypeError, match="not int"):
+        bus.topic("orders", int)
+    orders.subscribe("billing")
+    with pytest.raises(ValueError, match="already subscribed"):
+        orders.subscribe("billing")
+
+
+@pytest.mark.asyncio
+async def test_drop_policies_keep_the_queue_bounded():
+    bus = EventBus()
+    ticks = bus.topic("ticks", int)
+    newest = ticks.subscribe("newest", maxsize=3, overflow=OverflowPolicy.DROP_NEWEST)
+    oldest = ticks.subscribe("oldest", maxsize=3, overflow=OverflowPolicy.DROP_OLDEST)
+
+    await ticks.publish_batch(range(10))
+
+    assert await newest.get_batch() == [0, 1, 2]
+    assert await oldest.get_batch() == [7, 8, 9]
+    assert newest.dropped == oldest.dropped == 7
+
+
+@pytest.mark.asyncio
+async def test_block_policy_applies_backpressure_to_publishers():
+    bus = EventBus()
+    jobs = bus.topic("jobs", int)
+    slow = jobs.subscribe("slow", maxsize=2)
+
+    publishing = asyncio.create_task(jobs.publish_batch(range(5)))
+    await asyncio.sleep(0.01)
+    assert not publishing.done() and len(slow) == 2
+
+    received = []
+    while len(received) < 5:
+        received += await slow.get_batch(max_items=2)
+    await publishing
+    assert received == [0, 1, 2, 3, 4]
+    assert slow.dropped == 0
+    assert await slow.get_batch(timeout=0.01) == []
+    with pytest.raises(asyncio.TimeoutError):
+        await slow.get(timeout=0.01)
+
+
+@pytest.mark.asyncio
+async def test_closing_drains_then_stops_receivers_and_releases_publishers():
+    bus = EventBus()
+    jobs = bus.topic("jobs", int)
+    sub = jobs.subscribe("worker", maxsize=1)
+    await jobs.publish(1)
+    blocked = asyncio.create_task(jobs.publish(2))
+    await asyncio.sleep(0)
+
+    bus.close()
+    await asyncio.wait_for(blocked, 0.1)
+
+    assert [item async for item in sub] == [1]
+    with pytest.raises(BusClosed):
+        await sub.get()
+    assert jobs.subscriptions == []
+
+
+class Producer(Adapter):
+    name = "producer"
+
+    async def startup(self):
+        self.topic = self.runtime.bus.topic("orders", Order)
+
+    async def shutdown(self):
+        pass
+
+
+class Consumer(Adapter):
+    name = "consumer"
+
+    def __init__(self):
+        self.seen = []
+
+    async def startup(self):
+        self.sub = self.runtime.bus.topic("orders", Order).subscribe(self.name)
+        self.runtime.supervise(self.consume)
+
+    async def consume(self):
+        async for batch in self.sub.batches():
+            self.seen.extend(order.id for order in batch)
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_adapters_share_the_orchestrators_bus():
+    orch = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    producer, consumer = Producer(), Consumer()
+    orch.use(producer)
+    orch.use(consumer)
+    await orch.run()
+
+    await producer.topic.publish_batch([Order(i) for i in range(3)])
+    text = orch.metrics.render()
+    assert 'haraka_bus_published_total{topic="orders"} 3' in text
+    assert 'haraka_bus_queue_depth{topic="orders",subscriber="consumer"} 3' in text
+
+    await asyncio.sleep(0.01)
+    assert consumer.seen == [0, 1, 2]
+    await orch.shutdown()
+    assert consumer.sub.closed
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+
+from haraka_runtime.core.interfaces import Adapter  # noqa: E402
+from haraka_runtime.orchestrator.orchestrator import (  # noqa: E402
+    Orchestrator,
+    StartupMode,
+)
+from haraka_runtime.runtime_grpc.server import GrpcServer  # noqa: E402
+
+
+class DummyAdapter(Adapter):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    async def startup(self):
+        await asyncio.sleep(0.01)
+        self.log.append(self.name)
+
+    async def shutdown(self):
+        pass
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+def echo_server():
+    server = GrpcServer(port=0, host="127.0.0.1")
+
+    async def echo(request, context):
+        return request
+
+    async def count(request, context):
+        for i in range(int(request)):
+            yield str(i).encode()
+
+    async def upper(requests, context):
+        async for request in requests:
+            yield request.upper()
+
+    server.add_unary("test.Echo", "Echo", echo)
+    server.add_server_stream("test.Echo", "Count", count)
+    server.add_bidi_stream("test.Echo", "Upper", upper)
+    return server
+
+
+@pytest.mark.asyncio
+async def test_unary_and_streaming_rpcs():
+    server = echo_server()
+    await server.startup()
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{server.bound_port}") as ch:
+        assert await ch.unary_unary("/test.Echo/Echo")(b"hi") == b"hi"
+
+        counted = [r async for r in ch.unary_stream("/test.Echo/Count")(b"3")]
+        assert counted == [b"0", b"1", b"2"]
+
+        async def requests():
+            for word in (b"a", b"b"):
+                yield word
+
+        call = ch.stream_stream("/test.Echo/Upper")(requests())
+        assert [r async for r in call] == [b"A", b"B"]
+
+    assert server.active_rpcs == 0
+    await server.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_starts_after_dependencies_and_drains_on_shutdown():
+    log = []
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT, loop_lag_threshold=None)
+    server = GrpcServer(port=0, host="127.0.0.1", drain_grace=2.0)
+    started = asyncio.Event()
+
+    async def slow(request, context):
+        started.set()
+        await asyncio.sleep(0.2)
+        return b"done"
+
+    server.add_unary("test.Slow", "Call", slow)
+    orch.use(DummyAdapter("db", log))
+    orch.use(server, dependencies=["db"])
+    await orch.run(SETTINGS, APP)
+
+    assert log == ["db"]
+    assert orch._adapter_events["grpc"].is_set()
+
+    async with grpc.aio.insecure_channel(f"127.0.0.1:{server.bound_port}") as ch:
+        call = ch.unary_unary("/test.Slow/Call")(b"")
+        await started.wait()
+        report = await orch.shutdown()
+        assert await call == b"done"
+
+    assert "grpc" in report.stopped
+    assert server.active_rpcs == 0
@@ -0,0 +1,229 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from haraka_runtime.core.interfaces import Adapter  # noqa: E402
+from haraka_runtime.orchestrator.orchestrator import (  # noqa: E402
+    LifecycleState,
+    Orchestrator,
+)
+from haraka_runtime.runtime_http.main import (  # noqa: E402
+    _run_worker,
+    bind_socket,
+    create_app,
+    serve,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+SETTINGS = type("S", (), {"port": 0})()
+
+
+class RecordingAdapter(Adapter):
+    def __init__(self, log):
+        self.name = "db"
+        self.log = log
+
+    async def startup(self):
+        self.log.append("start")
+
+    async def shutdown(self):
+        self.log.append("stop")
+
+
+def make_app():
+    """Factory used by the multi-worker test; one orchestrator per worker."""
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    app = create_app(runtime, SETTINGS, docs_url="/docs")
+
+    @app.get("/pid")
+    async def pid():
+        return {"pid": os.getpid(), "state": runtime.state.name}
+
+    return app
+
+
+@pytest.mark.asyncio
+async def test_lifespan_runs_and_shuts_down_the_orchestrator():
+    log = []
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    runtime.use(RecordingAdapter(log))
+    app = create_app(runtime, SETTINGS)
+
+    async with app.router.lifespan_context(app):
+        assert runtime.state is LifecycleState.STARTED
+        assert log == ["start"]
+
+    assert log == ["start", "stop"]
+    assert runtime.state is LifecycleState.DESTROYED
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_served_in_prometheus_format():
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    runtime.use(RecordingAdapter([]))
+    app = create_app(runtime, SETTINGS)
+    endpoint = next(r.endpoint for r in app.routes if r.path == "/metrics")
+
+    async with app.router.lifespan_context(app):
+        response = await endpoint()
+
+    assert response.media_type.startswith("text/plain; version=0.0.4")
+    assert b"haraka_ready 1" in response.body
+    assert all(r.path != "/metrics" for r in create_app(runtime, SETTINGS, None).routes)
+
+
+async def _get_json(app, path):
+    """Send one GET through the ASGI app, middleware included."""
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1),
+        "server": ("127.0.0.1", 80),
+    }
+    await app(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], json.loads(body)
+
+
+@pytest.mark.asyncio
+async def test_health_and_readiness_probes():
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    runtime.use(RecordingAdapter([]))
+    app = create_app(runtime, SETTINGS)
+
+    @app.get("/work")
+    async def work():
+        return {}
+
+    async with app.router.lifespan_context(app):
+        assert await _get_json(app, "/healthz") == (200, {"live": True})
+        assert await _get_json(app, "/readyz") == (
+            200,
+            {"ready": True, "healthy": True, "checks": {}},
+        )
+
+        runtime.work.close()  # draining: work is refused, probes still answer
+        assert await _get_json(app, "/work") == (503, {"detail": "Shutting down"})
+        assert (await _get_json(app, "/readyz"))[1]["ready"] is False
+        assert await _get_json(app, "/healthz") == (200, {"live": True})
+
+    assert await _get_json(app, "/healthz") == (503, {"live": False})
+    paths = {r.path for r in create_app(runtime, SETTINGS, None, None, None).routes}
+    assert not paths & {"/metrics", "/healthz", "/readyz"}
+
+
+def test_create_app_leaves_signals_to_uvicorn():
+    runtime = Orchestrator(loop_lag_threshold=None)
+    assert signal.getsignal(signal.SIGTERM) == runtime._handle_signal
+
+    create_app(runtime, SETTINGS)
+
+    assert not runtime.handle_signals
+    assert signal.getsignal(signal.SIGTERM) is signal.SIG_DFL
+    assert signal.getsignal(signal.SIGINT) is signal.default_int_handler
+
+
+def test_worker_splits_the_drain_deadline(monkeypatch):
+    uvicorn = pytest.importorskip("uvicorn")
+    configs = []
+    monkeypatch.setattr(
+        uvicorn.Server, "run", lambda self, sockets: configs.append(self.config)
+    )
+    sock = bind_socket("127.0.0.1", 0)
+    try:
+        _run_worker(make_app, sock, "warning", drain_timeout=10.0)
+    finally:
+        sock.close()
+
+    (config,) = configs
+    assert config.timeout_graceful_shutdown == 5
+    assert config.app.state.runtime.shutdown_timeout == 4.5
+
+
+def test_reuse_port_sockets_share_a_port():
+    first = bind_socket("127.0.0.1", 0, reuse_port=True)
+    port = first.getsockname()[1]
+    second = bind_socket("127.0.0.1", port, reuse_port=True)
+    assert second.getsockname()[1] == port
+    first.close()
+    second.close()
+
+
+def test_serve_rejects_bad_worker_settings():
+    with pytest.raises(ValueError):
+        serve(make_app, workers=0)
+    with pytest.raises(ValueError, match="fixed port"):
+        serve(make_app, port=0, workers=2)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _get(url):
+    with urllib.request.urlopen(url, timeout=2) as resp:
+        return resp.read()
+
+
+@pytest.mark.skipif(not hasattr(socket, "SO_REUSEPORT"), reason="no SO_REUSEPORT")
+def test_workers_share_the_port_and_stop_on_sigterm():
+    pytest.importorskip("uvicorn")
+    port = _free_port()
+    env = dict(os.environ, PYTHONPATH=f"{ROOT / 'src'}{os.pathsep}{ROOT}")
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "haraka_runtime.runtime_http.main",
+            "tests.test_http_main:make_app",
+            "--host=127.0.0.1",
+            f"--port={port}",
+            "--workers=2",
+            "--log-level=warning",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    try:
+        pids = set()
+        deadline = time.monotonic() + 15
+        while len(pids) < 2 and time.monotonic() < deadline:
+            try:
+                body = _get(f"http://127.0.0.1:{port}/pid")
+            except OSError:
+                time.sleep(0.05)
+                continue
+            assert b'"STARTED"' in body
+            pids.add(body)
+        assert len(pids) == 2
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=15) == 0
@@ -0,0 +1,190 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.adapters.kafka_adapter import (
+    InMemoryBackend,
+    InMemoryBroker,
+    KafkaAdapter,
+    KafkaDeliveryError,
+)
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+
+def make_pair(broker, **producer_kwargs):
+    producer = KafkaAdapter(
+        name="producer",
+        topic="events",
+        backend=InMemoryBackend(broker),
+        **producer_kwargs,
+    )
+    consumer = KafkaAdapter(
+        name="consumer",
+        topic="events",
+        group_id="g1",
+        backend=InMemoryBackend(broker),
+        consume_batch_size=100,
+    )
+    return producer, consumer
+
+
+@pytest.mark.asyncio
+async def test_records_are_batched_and_consumed_in_batches():
+    broker = InMemoryBroker(partitions=3)
+    producer, consumer = make_pair(broker, batch_size=100, linger_ms=50)
+    await producer.startup()
+    await consumer.startup()
+
+    for i in range(1000):
+        await producer.send(f"m{i}".encode(), key=f"k{i % 7}".encode())
+    await producer.flush()
+
+    # One request per full batch instead of one per record
+    assert producer.stats.batches_sent == 10
+    assert producer.backend.requests == 10
+
+    seen = []
+    async for batch in consumer.batches(timeout=0.05):
+        assert len(batch) <= 100
+        seen.extend(batch)
+        if len(seen) == 1000:
+            break
+    assert sorted(m.value for m in seen) == sorted(
+        f"m{i}".encode() for i in range(1000)
+    )
+    # Offsets are committed once per batch, not per message
+    assert consumer.stats.commits == 9
+
+    await producer.shutdown()
+    await consumer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_partial_batch_is_sent_after_linger():
+    broker = InMemoryBroker()
+    producer, _ = make_pair(broker, batch_size=100, linger_ms=10)
+    await producer.startup()
+
+    await producer.send(b"lonely")
+    await asyncio.sleep(0.05)
+
+    assert producer.stats.batches_sent == 1
+    assert [m.value for m in broker.logs["events"][0]] == [b"lonely"]
+    await producer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_uncommitted_batch_is_redelivered_to_the_group():
+    broker = InMemoryBroker()
+    producer, consumer = make_pair(broker, batch_size=5, linger_ms=0)
+    await producer.startup()
+    await consumer.startup()
+    for i in range(10):
+        await producer.send(bytes([i]))
+    await producer.flush()
+
+    async for batch in consumer.batches(max_records=5, timeout=0.05):
+        break  # crash before the batch is committed
+    await consumer.shutdown()
+
+    restarted = KafkaAdapter(
+        topic="events", group_id="g1", backend=InMemoryBackend(broker)
+    )
+    await restarted.startup()
+    async for batch in restarted.batches(max_records=5, timeout=0.05):
+        assert [m.value for m in batch] == [bytes([i]) for i in range(5)]
+        break
+    await restarted.shutdown()
+    await producer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_withdraws_readiness_until_buffer_drains():
+    orch = Orchestrator()
+    slow = InMemoryBackend(latency=0.05)
+    producer = KafkaAdapter(
+        topic="events",
+        backend=slow,
+        batch_size=10,
+        linger_ms=0,
+        max_in_flight=1,
+        max_buffered=40,
+    )
+    orch.use(producer)
+    await orch.run(type("S", (), {"port": 0})(), type("D", (), {"docs_url": "/"})())
+    assert "kafka" not in orch._unready
+
+    senders = asyncio.gather(*(producer.send(b"x" * 10) for _ in range(100)))
+    await asyncio.sleep(0.01)
+    assert "kafka" in orch._unready
+    assert producer.stats.buffered <= producer.max_buffered
+    assert not orch.is_ready()
+
+    await senders
+    await producer.flush()
+    assert "kafka" not in orch._unready
+    assert producer.stats.produced == 100 and producer.stats.send_errors == 0
+    await orch.shutdown()
+
+
+class FlakyBackend(InMemoryBackend):
+    def __init__(self, broker, failures):
+        super().__init__(broker)
+        self.failures = failures
+
+    async def send_batch(self, topic, records):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker unavailable")
+        await super().send_batch(topic, records)
+
+
+@pytest.mark.asyncio
+async def test_failed_sends_are_retried_until_the_broker_recovers():
+    broker = InMemoryBroker()
+    producer = KafkaAdapter(
+        topic="events",
+        backend=FlakyBackend(broker, failures=1),
+        linger_ms=0,
+        retry_backoff_ms=1,
+    )
+    await producer.startup()
+
+    for i in range(3):
+        await producer.send(bytes([i]))
+    await producer.flush()
+
+    assert [m.value for m in broker.logs["events"][0]] == [b"\0", b"\1", b"\2"]
+    assert producer.stats.send_retries == 1
+    assert producer.stats.send_errors == producer.stats.undelivered == 0
+    await producer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_flush_reports_undelivered_records_and_resends_them_later():
+    broker = InMemoryBroker()
+    backend = FlakyBackend(broker, failures=3)
+    producer = KafkaAdapter(
+        topic="events", backend=backend, linger_ms=0, retries=2, retry_backoff_ms=1
+    )
+    await producer.startup()
+    await producer.send(b"a")
+
+    with pytest.raises(KafkaDeliveryError, match="1 record\\(s\\) undelivered") as e:
+        await producer.flush()
+    assert e.value.undelivered == producer.stats.send_errors == 1
+    assert broker.logs["events"][0] == []
+
+    # The held-back record goes out once the broker is back
+    await producer.send(b"b")
+    await producer.flush()
+    assert [m.value for m in broker.logs["events"][0]] == [b"a", b"b"]
+    assert producer.stats.undelivered == 0
+
+    backend.failures = 100
+    await producer.send(b"c")
+    producer.retry_backoff_ms = 1000
+    producer.flush_timeout = 0.05
+    with pytest.raises(KafkaDeliveryError, match="not delivered within 0.05s"):
+        await producer.shutdown()
+    assert producer._flusher is None
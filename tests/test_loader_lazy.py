@@ -0,0 +1,113 @@
+import asyncio
+import sys
+
+import pytest
+import yaml
+
+from haraka_runtime.loader.entrypoint import LazyAdapter
+from haraka_runtime.loader.manifest_loader import load_adapter_from_manifest
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, StartupMode
+
+HEAVY_MODULE = "heavy_lazy_adapter_module"
+
+
+@pytest.fixture(autouse=True)
+def heavy_module(tmp_path, monkeypatch):
+    """
+    A module standing in for an adapter with an expensive import.
+    """
+    (tmp_path / f"{HEAVY_MODULE}.py").write_text("""
+from haraka_runtime.core.interfaces import Adapter
+
+IMPORTS = []
+IMPORTS.append(1)
+
+
+class HeavyAdapter(Adapter):
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.name = "renamed"
+        self.started = False
+
+    async def startup(self):
+        self.started = True
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        self.started = False
+
+
+class NotAnAdapter:
+    pass
+""")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sys.modules.pop(HEAVY_MODULE, None)
+    yield
+    sys.modules.pop(HEAVY_MODULE, None)
+
+
+def _manifest(tmp_path, **fields):
+    path = tmp_path / "service.yaml"
+    path.write_text(yaml.safe_dump(fields))
+    return path
+
+
+def test_lazy_manifest_registers_proxy_without_importing(tmp_path):
+    """
+    A lazy manifest registers a LazyAdapter and leaves the module unimported.
+    """
+    path = _manifest(
+        tmp_path,
+        entrypoint=f"{HEAVY_MODULE}:HeavyAdapter",
+        lazy=True,
+        name="heavy",
+        settings={"url": "kafka://x"},
+    )
+    orch = Orchestrator()
+    svc = load_adapter_from_manifest(path, orch)
+
+    assert isinstance(svc, LazyAdapter)
+    assert orch._registry["heavy"][0] is svc
+    assert HEAVY_MODULE not in sys.modules
+    with pytest.raises(AttributeError, match="until lazy adapter 'heavy'"):
+        svc.kwargs
+
+
+@pytest.mark.asyncio
+async def test_lazy_adapter_resolves_on_startup_and_delegates(tmp_path):
+    """
+    Starting the orchestrator imports the entrypoint once and wires the
+    real adapter to the runtime under the manifest name.
+    """
+    path = _manifest(
+        tmp_path,
+        entrypoint=f"{HEAVY_MODULE}:HeavyAdapter",
+        lazy=True,
+        settings={"name": "heavy", "url": "kafka://x"},
+    )
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT)
+    svc = load_adapter_from_manifest(path, orch)
+
+    # Concurrent resolutions share one import and one instance
+    first, second = await asyncio.gather(svc.resolve(), svc.resolve())
+    assert first is second
+    assert sys.modules[HEAVY_MODULE].IMPORTS == [1]
+
+    await orch.run(type("S", (), {"port": 0})(), type("D", (), {"docs_url": "/"})())
+    assert svc.target.name == "heavy"
+    assert svc.started is True
+    assert svc.kwargs == {"name": "heavy", "url": "kafka://x"}
+    await orch.wait_for_all_ready(timeout=0.1)
+
+    await orch.shutdown()
+    assert svc.started is False
+
+
+@pytest.mark.asyncio
+async def test_lazy_adapter_type_errors_surface_at_startup():
+    svc = LazyAdapter("bad", f"{HEAVY_MODULE}:NotAnAdapter")
+    with pytest.raises(TypeError, match="does not implement the Adapter interface"):
+        await svc.startup()
+
+    with pytest.raises(ValueError, match="module:Class"):
+        LazyAdapter("bad", "no_colon_here")
@@ -3,7 +3,13 @@ import yaml
 import pytest
 
 from haraka_runtime.core.interfaces import Adapter
-from haraka_runtime.loader.manifest_loader import load_adapter_from_manifest
+from haraka_runtime.loader.manifest_loader import (
+    ManifestValidationError,
+    clear_manifest_cache,
+    load_adapter_from_manifest,
+    load_adapters_from_manifests,
+    read_manifest,
+)
 from haraka_runtime.orchestrator.orchestrator import Orchestrator
 
 
@@ -147,3 +153,135 @@ def test_loader_uses_default_priority_and_deps(tmp_path):
     reg_svc, pri, deps = orch._registry[svc.name]
     assert pri == 0  # default
     assert deps == []  # default
+
+
+def _write_service(root, name, **extra):
+    manifest = {
+        "entrypoint": f"{DUMMY_MODULE_NAME}:{DUMMY_CLASS_NAME}",
+        "settings": {"name": name},
+        **extra,
+    }
+    service_dir = root / "services" / name
+    service_dir.mkdir(parents=True)
+    path = service_dir / "service.yaml"
+    path.write_text(yaml.safe_dump(manifest))
+    return path
+
+
+def test_bulk_loader_registers_every_manifest_in_a_directory(tmp_path):
+    """
+    load_adapters_from_manifests should discover service.yaml files
+    recursively and register all of them.
+    """
+    for i in range(20):
+        _write_service(tmp_path, f"svc{i:02}", priority=i)
+
+    orch = Orchestrator()
+    adapters = load_adapters_from_manifests(tmp_path / "services", orch)
+
+    assert [a.name for a in adapters] == [f"svc{i:02}" for i in range(20)]
+    assert orch._registry["svc07"][1] == 7
+
+    # A glob expression finds the same set
+    orch2 = Orchestrator()
+    pattern = str(tmp_path / "services" / "*" / "service.yaml")
+    assert len(load_adapters_from_manifests(pattern, orch2)) == 20
+
+
+def test_bulk_loader_reports_all_errors_and_registers_nothing(tmp_path):
+    """
+    Every invalid manifest is reported together, and no adapter is
+    registered when any of them fails.
+    """
+    _write_service(tmp_path, "good")
+    bad_entry = _write_service(tmp_path, "bad_entry")
+    bad_entry.write_text(yaml.safe_dump({"entrypoint": "no_such_mod:NoClass"}))
+    no_entry = _write_service(tmp_path, "no_entry")
+    no_entry.write_text(yaml.safe_dump({"settings": {}}))
+    broken = _write_service(tmp_path, "broken")
+    broken.write_text("entrypoint: [unclosed")
+
+    orch = Orchestrator()
+    with pytest.raises(ManifestValidationError) as exc_info:
+        load_adapters_from_manifests(tmp_path / "services", orch)
+
+    failed = sorted(path.parent.name for path, _ in exc_info.value.errors)
+    assert failed == ["bad_entry", "broken", "no_entry"]
+    assert orch._registry == {}
+
+
+def test_parsed_manifests_are_cached_until_file_changes(tmp_path, monkeypatch):
+    """
+    read_manifest should parse a file once and re-parse only when its
+    mtime or size changes.
+    """
+    path = _write_service(tmp_path, "cached")
+    clear_manifest_cache()
+
+    calls = []
+    real_load = yaml.load
+
+    def counting_load(*args, **kwargs):
+        calls.append(1)
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(yaml, "load", counting_load)
+
+    first = read_manifest(path)
+    assert read_manifest(path) is first
+    assert len(calls) == 1
+
+    path.write_text(yaml.safe_dump({"entrypoint": "changed:Class", "priority": 3}))
+    assert read_manifest(path)["priority"] == 3
+    assert len(calls) == 2
+
+
+def test_manifests_mark_adapters_optional_with_a_retry_policy(tmp_path):
+    """
+    'optional' (or its alias 'background') registers the adapter as optional;
+    'retry' holds Backoff fields and is only valid on optional adapters.
+    """
+    _write_service(tmp_path, "core")
+    _write_service(tmp_path, "metrics", optional=True, retry={"initial": 2})
+    _write_service(tmp_path, "warmer", background=True)
+
+    orch = Orchestrator()
+    load_adapters_from_manifests(tmp_path / "services", orch)
+
+    assert set(orch._optional) == {"metrics", "warmer"}
+    assert orch._optional["metrics"].initial == 2
+
+    bad = tmp_path / "bad"
+    _write_service(bad, "eager", retry={"initial": 1})
+    _write_service(bad, "typo", optional=True, retry={"intial": 1})
+    with pytest.raises(ManifestValidationError) as exc_info:
+        load_adapters_from_manifests(bad / "services", Orchestrator())
+    messages = [str(error) for _, error in exc_info.value.errors]
+    assert "only applies to optional adapters" in messages[0]
+    assert "Invalid 'retry'" in messages[1]
+
+
+def test_manifests_declare_on_demand_activation(tmp_path):
+    """
+    'activation: on_demand' defers startup to first use; 'idle_timeout'
+    only applies to such adapters.
+    """
+    _write_service(tmp_path, "geo", activation="on_demand", idle_timeout=300)
+    _write_service(tmp_path, "core", activation="eager")
+
+    orch = Orchestrator()
+    load_adapters_from_manifests(tmp_path / "services", orch)
+
+    assert list(orch._on_demand) == ["geo"]
+    assert orch._on_demand["geo"].idle_timeout == 300
+
+    bad = tmp_path / "bad"
+    _write_service(bad, "a_unknown", activation="lazily")
+    _write_service(bad, "b_eager", idle_timeout=300)
+    _write_service(bad, "c_both", activation="on_demand", optional=True)
+    with pytest.raises(ManifestValidationError) as exc_info:
+        load_adapters_from_manifests(bad / "services", Orchestrator())
+    messages = [str(error) for _, error in exc_info.value.errors]
+    assert "Unknown activation 'lazily'" in messages[0]
+    assert "only applies on demand" in messages[1]
+    assert "cannot be activated on demand" in messages[2]
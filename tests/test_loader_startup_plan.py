@@ -0,0 +1,157 @@
+import shutil
+
+import pytest
+import yaml
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.loader.manifest_loader import ManifestValidationError
+from haraka_runtime.loader.startup_plan import (
+    compile_startup_plan,
+    hash_manifests,
+    load_startup_plan,
+    read_startup_plan,
+    write_startup_plan,
+)
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+ENTRYPOINT = f"{__name__}:PlanAdapter"
+
+
+class PlanAdapter(Adapter):
+    def __init__(self, name, **settings):
+        self.name = name
+        self.settings = settings
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+def write_services(root, services):
+    for name, manifest in services.items():
+        (root / name).mkdir(parents=True, exist_ok=True)
+        manifest = {"entrypoint": ENTRYPOINT, **manifest}
+        manifest.setdefault("settings", {})["name"] = name
+        (root / name / "service.yaml").write_text(yaml.safe_dump(manifest))
+
+
+@pytest.fixture
+def services(tmp_path):
+    root = tmp_path / "services"
+    write_services(
+        root,
+        {
+            "db": {"priority": 5, "settings": {"dsn": "x"}},
+            "cache": {"dependencies": ["db"]},
+            "api": {"dependencies": ["db", "cache"]},
+            "later": {"lazy": True, "name": "later"},
+        },
+    )
+    return root
+
+
+def runtime():
+    return Orchestrator(handle_signals=False, loop_lag_threshold=None)
+
+
+def test_compile_captures_order_waves_settings_and_hash(services, tmp_path):
+    plan = compile_startup_plan(services)
+
+    assert plan.order == ("db", "cache", "api", "later")
+    assert plan.waves == (("db", "later"), ("cache",), ("api",))
+    db = next(a for a in plan.adapters if a.name == "db")
+    assert (db.priority, db.settings) == (5, {"dsn": "x", "name": "db"})
+
+    path = tmp_path / "plan.json"
+    write_startup_plan(plan, path)
+    assert read_startup_plan(path) == plan
+
+
+def test_load_uses_plan_when_hash_matches(services, tmp_path, monkeypatch):
+    path = tmp_path / "plan.json"
+    write_startup_plan(compile_startup_plan(services), path)
+
+    # The warm path neither parses YAML nor resolves the graph
+    monkeypatch.setattr(
+        "haraka_runtime.loader.manifest_loader.read_manifest",
+        lambda *_: pytest.fail("parsed a manifest"),
+    )
+    orch = runtime()
+    adapters = load_startup_plan(path, services, orch)
+
+    assert [a.name for a in adapters] == ["api", "cache", "db", "later"]
+    assert adapters[2].settings == {"dsn": "x"}
+    assert orch._graph._plan is not None
+    assert [a.name for a in orch._resolve_start_order()] == [
+        "db",
+        "cache",
+        "api",
+        "later",
+    ]
+
+
+def test_hash_ignores_where_the_tree_lives(services, tmp_path):
+    moved = shutil.copytree(services, tmp_path / "elsewhere")
+    assert hash_manifests(services.rglob("service.yaml")) == hash_manifests(
+        moved.rglob("service.yaml")
+    )
+
+
+def test_stale_or_broken_plan_falls_back_to_manifests(services, tmp_path):
+    path = tmp_path / "plan.json"
+    write_startup_plan(compile_startup_plan(services), path)
+    write_services(services, {"extra": {"dependencies": ["api"]}})
+
+    orch = runtime()
+    adapters = load_startup_plan(path, services, orch)
+    assert "extra" in [a.name for a in adapters]
+    order = [a.name for a in orch._resolve_start_order()]
+    assert order.index("extra") > order.index("api")
+
+    path.write_text("{not json")
+    assert len(load_startup_plan(path, services, runtime())) == 5
+    assert len(load_startup_plan(tmp_path / "missing.json", services, runtime())) == 5
+
+
+def test_compile_rejects_invalid_manifests(tmp_path):
+    write_services(tmp_path, {"bad": {"entrypoint": "nope.module:Thing"}})
+    with pytest.raises(ManifestValidationError):
+        compile_startup_plan(tmp_path)
+
+
+def test_plan_keeps_optional_and_on_demand_adapters(services, tmp_path):
+    write_services(
+        services,
+        {
+            "sink": {"optional": True, "retry": {"initial": 2}},
+            "geo": {"activation": "on_demand", "idle_timeout": 60},
+        },
+    )
+    path = tmp_path / "plan.json"
+    write_startup_plan(compile_startup_plan(services), path)
+
+    orch = runtime()
+    load_startup_plan(path, services, orch)
+
+    assert orch._graph._plan is not None
+    assert list(orch._optional) == ["sink"]
+    assert orch._optional["sink"].initial == 2
+    assert orch._on_demand["geo"].idle_timeout == 60
+
+
+def test_adapters_registered_outside_the_plan_fall_back_to_resolution(
+    services, tmp_path
+):
+    path = tmp_path / "plan.json"
+    write_startup_plan(compile_startup_plan(services), path)
+
+    orch = runtime()
+    orch.use(PlanAdapter("grpc"), dependencies=["api"])
+    adapters = load_startup_plan(path, services, orch)
+
+    assert len(adapters) == 4
+    assert orch._graph._plan is None
+    order = [a.name for a in orch._resolve_start_order()]
+    assert order.index("grpc") > order.index("api")
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from haraka_runtime.orchestrator.loop_monitor import LagHistogram, LoopMonitor
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+def blocking_section(seconds):
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_task_is_named_and_located():
+    monitor = LoopMonitor(logging.getLogger("lag"), interval=0.01, threshold=0.05)
+    monitor.start()
+
+    async def offender():
+        blocking_section(0.2)
+
+    await asyncio.sleep(0.03)
+    await asyncio.create_task(offender(), name="startup:kafka")
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+
+    assert len(monitor.slow_callbacks) == 1
+    slow = monitor.slow_callbacks[0]
+    assert slow.task == "startup:kafka"
+    assert slow.blocked_for >= 0.05
+    assert "blocking_section" in slow.location or "offender" in slow.location
+    assert monitor.histogram.max >= 0.15
+    assert monitor.histogram.count >= 3
+
+
+def test_lag_histogram_buckets_and_quantiles():
+    hist = LagHistogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.001, 0.002, 0.05, 0.5, 3.0):
+        hist.observe(value)
+
+    assert hist.buckets() == [(0.01, 2), (0.1, 3), (1.0, 4), (float("inf"), 5)]
+    assert hist.quantile(0.4) == 0.01
+    assert hist.quantile(0.6) == 0.1
+    assert hist.quantile(1.0) == 3.0
+    assert hist.total == pytest.approx(3.553)
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_runs_the_monitor_for_its_lifetime():
+    orch = Orchestrator(loop_lag_threshold=0.05)
+    await orch.run(SETTINGS, APP)
+    monitor = orch.loop_monitor
+    assert monitor is not None and monitor._task is not None
+
+    await orch.shutdown()
+    assert monitor._task is None and monitor._watchdog is None
+
+    disabled = Orchestrator(loop_lag_threshold=None)
+    await disabled.run(SETTINGS, APP)
+    assert disabled.loop_monitor is None
+    await disabled.shutdown()
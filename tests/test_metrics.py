@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.metrics import MetricsRegistry
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.supervision import Backoff
+
+FAST = Backoff(initial=0.001, maximum=0.01, jitter=0.0)
+
+
+class ReadyAdapter(Adapter):
+    def __init__(self, name):
+        self.name = name
+
+    async def startup(self):
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        pass
+
+
+def lines(text):
+    return [line for line in text.splitlines() if not line.startswith("#")]
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    hits = registry.counter("cache_hits_total", "Cache hits", ["cache"])
+    hits.labels("users").inc()
+    hits.labels("users").inc(2)
+    registry.gauge("queue_depth", 'Depth of "the" queue\nnow').labels().set(7)
+    latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        latency.labels().observe(value)
+    registry.counter("odd_total", "Escaping", ["path"]).labels('a"b\\c\n').inc()
+
+    text = registry.render()
+
+    assert '# HELP queue_depth Depth of "the" queue\\nnow' in text
+    assert "# TYPE cache_hits_total counter" in text
+    assert "# TYPE latency_seconds histogram" in text
+    assert lines(text) == [
+        'cache_hits_total{cache="users"} 3',
+        "queue_depth 7",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+        'odd_total{path="a\\"b\\\\c\\n"} 1',
+    ]
+    assert text.endswith("\n")
+
+
+def test_families_are_get_or_create_and_checked():
+    registry = MetricsRegistry()
+    family = registry.counter("jobs_total", "Jobs", ["queue"])
+    child = family.labels("emails")
+
+    assert registry.counter("jobs_total", "Jobs", ["queue"]) is family
+    assert family.labels("emails") is child
+    assert registry.get("jobs_total") is family
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("jobs_total", "Jobs", ["queue"])
+    with pytest.raises(ValueError, match="expects labels"):
+        family.labels()
+    with pytest.raises(ValueError, match="Unknown metric"):
+        registry.get("nope")
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_records_lifecycle_readiness_and_restarts():
+    orch = Orchestrator(handle_signals=False, loop_lag_threshold=0.05)
+    orch.use(ReadyAdapter("db"))
+    orch.use(ReadyAdapter("api"), dependencies=["db"])
+    attempts = []
+
+    async def consumer():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("broker gone")
+
+    orch.supervise(consumer, backoff=FAST)
+    await orch.run()
+    await asyncio.sleep(0.1)
+    await orch.restart("api")
+
+    with orch.work.track("http"):
+        text = orch.metrics.render()
+        assert 'haraka_work_in_flight{owner="http"} 1' in text
+
+    assert "haraka_ready 1" in text
+    assert "haraka_live 1" in text
+    assert 'haraka_adapter_ready{adapter="db"} 1' in text
+    assert 'haraka_adapter_startup_seconds{adapter="api"}' in text
+    assert 'haraka_task_restarts_total{task="consumer"} 2' in text
+    assert 'haraka_adapter_restarts_total{adapter="api"} 1' in text
+    assert 'haraka_adapter_restarts_total{adapter="db"}' not in text
+    assert 'haraka_event_loop_lag_seconds_bucket{le="+Inf"}' in text
+    assert "haraka_event_loop_lag_seconds_count 0" not in text
+
+    await orch.shutdown()
+    text = orch.metrics.render()
+    assert "haraka_live 0" in text
+    assert 'haraka_work_in_flight{owner="http"} 0' in text
+    assert 'haraka_adapter_shutdown_seconds{adapter="db"}' in text
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import (
+    Orchestrator,
+    LifecycleState,
+    StartupMode,
+)
+
+
+class SlowAdapter(Adapter):
+    """Adapter whose startup sleeps, recording start/finish events."""
+
+    def __init__(self, name: str, record: list, delay: float = 0.05, fail=False):
+        self.name = name
+        self._record = record
+        self._delay = delay
+        self._fail = fail
+
+    async def startup(self):
+        self._record.append(f"begin:{self.name}")
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError(f"{self.name} exploded")
+        self._record.append(f"start:{self.name}")
+
+    async def shutdown(self):
+        self._record.append(f"stop:{self.name}")
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_independent_adapters_start_together():
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT)
+    rec = []
+    for name in ("a", "b", "c", "d"):
+        orch.use(SlowAdapter(name, rec, delay=0.1))
+
+    began = time.perf_counter()
+    await orch.run(SETTINGS, APP)
+    elapsed = time.perf_counter() - began
+
+    # Four 100ms startups overlap instead of adding up to 400ms
+    assert elapsed < 0.3
+    assert orch.state == LifecycleState.STARTED
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_for_their_dependencies():
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT)
+    rec = []
+    orch.use(SlowAdapter("db", rec, delay=0.05), priority=1)
+    orch.use(SlowAdapter("cache", rec, delay=0.01), priority=5)
+    orch.use(SlowAdapter("api", rec, delay=0.0), dependencies=["db", "cache"])
+
+    await orch.run(SETTINGS, APP)
+
+    # Priority breaks the tie between adapters that become ready together
+    assert rec[:2] == ["begin:cache", "begin:db"]
+    assert rec.index("begin:api") > rec.index("start:db")
+    assert rec.index("begin:api") > rec.index("start:cache")
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_pending_and_rolls_back_started():
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT)
+    rec = []
+    orch.use(SlowAdapter("fast", rec, delay=0.0))
+    orch.use(SlowAdapter("slow", rec, delay=1.0))
+    orch.use(SlowAdapter("broken", rec, delay=0.05, fail=True))
+    orch.use(SlowAdapter("after", rec, delay=0.0), dependencies=["fast", "slow"])
+
+    with pytest.raises(RuntimeError, match="broken exploded"):
+        await orch.run(SETTINGS, APP)
+
+    assert "start:slow" not in rec
+    assert "begin:after" not in rec
+    assert "stop:fast" in rec
+    assert "stop:slow" not in rec
+    assert orch.state == LifecycleState.UNINITIALIZED
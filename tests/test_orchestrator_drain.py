@@ -0,0 +1,164 @@
+import asyncio
+import signal
+
+import pytest
+
+from haraka_runtime.adapters.kafka_adapter import (
+    InMemoryBackend,
+    InMemoryBroker,
+    KafkaAdapter,
+)
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.drain import AdmissionClosed, WorkTracker
+from haraka_runtime.orchestrator.orchestrator import LifecycleState, Orchestrator
+
+
+class RecordingAdapter(Adapter):
+    def __init__(self, name, log):
+        self.name = name
+        self.log = log
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        self.log.append(f"stop:{self.name}")
+
+
+def orchestrator(**kwargs):
+    return Orchestrator(handle_signals=False, loop_lag_threshold=None, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_tracker_counts_per_owner_and_refuses_work_once_closed():
+    work = WorkTracker()
+    with work.track("http"), work.track("http"), work.track("jobs"):
+        assert work.in_flight() == 3
+        assert work.snapshot() == {"http": 2, "jobs": 1}
+        work.close()
+        with pytest.raises(AdmissionClosed):
+            with work.track("http"):
+                pass
+        assert not await work.wait_idle(0.01)
+    assert work.in_flight() == 0
+    assert await work.wait_idle(0)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_work_finishes_before_adapters_stop():
+    log = []
+    orch = orchestrator()
+    orch.use(RecordingAdapter("db", log))
+    await orch.run()
+
+    async def request():
+        with orch.work.track("http"):
+            await asyncio.sleep(0.05)
+            log.append("request done")
+
+    pending = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    stopping = asyncio.create_task(orch.shutdown())
+    await asyncio.sleep(0.01)
+
+    # Draining: not ready, new work refused, adapters still up
+    assert not orch.is_ready()
+    assert log == []
+    with pytest.raises(AdmissionClosed):
+        with orch.work.track("http"):
+            pass
+
+    report = await stopping
+    await pending
+    assert log == ["request done", "stop:db"]
+    assert report.abandoned_work == {}
+    assert orch.state is LifecycleState.DESTROYED
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout_abandons_stuck_work():
+    log = []
+    orch = orchestrator(drain_timeout=0.05)
+    orch.use(RecordingAdapter("db", log))
+    await orch.run()
+
+    stuck = asyncio.Event()
+
+    async def request():
+        with orch.work.track("http"):
+            await stuck.wait()
+
+    pending = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    report = await asyncio.wait_for(orch.shutdown(), timeout=1.0)
+
+    assert report.abandoned_work == {"http": 1}
+    assert log == ["stop:db"]
+    stuck.set()
+    await pending
+
+
+@pytest.mark.asyncio
+async def test_repeated_signals_and_calls_join_one_shutdown():
+    log = []
+    orch = orchestrator()
+    orch.use(RecordingAdapter("db", log))
+    await orch.run()
+
+    release = asyncio.Event()
+
+    async def request():
+        with orch.work.track("http"):
+            await release.wait()
+
+    pending = asyncio.create_task(request())
+    await asyncio.sleep(0)
+    first = asyncio.create_task(orch.shutdown())
+    await asyncio.sleep(0)
+    orch._on_signal(signal.SIGTERM)
+    orch._on_signal(signal.SIGINT)
+    second = asyncio.create_task(orch.shutdown())
+    await asyncio.sleep(0.01)
+    release.set()
+
+    reports = await asyncio.gather(first, second)
+    await pending
+    await asyncio.sleep(0)
+    assert reports[0] is reports[1]
+    assert log == ["stop:db"]
+
+
+@pytest.mark.asyncio
+async def test_consumer_stops_fetching_once_draining():
+    broker = InMemoryBroker(partitions=1)
+    producer = KafkaAdapter(name="producer", topic="t", backend=InMemoryBackend(broker))
+    consumer = KafkaAdapter(
+        name="consumer",
+        topic="t",
+        group_id="g",
+        backend=InMemoryBackend(broker),
+        consume_batch_size=2,
+    )
+    orch = orchestrator()
+    orch.use(producer)
+    orch.use(consumer)
+    await orch.run()
+
+    for i in range(6):
+        await producer.send(f"m{i}".encode())
+    await producer.flush()
+
+    seen = []
+    stopping = None
+    async for batch in consumer.batches(timeout=0.05):
+        assert orch.work.in_flight("consumer") == 1
+        seen.extend(batch)
+        if stopping is None:
+            stopping = asyncio.create_task(orch.shutdown())
+            await asyncio.sleep(0.01)
+            assert orch.state is LifecycleState.STARTED  # waiting for this batch
+
+    report = await stopping
+    assert len(seen) == 2
+    assert report.abandoned_work == {}
+    assert consumer.stats.commits == 1
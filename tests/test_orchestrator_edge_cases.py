@@ -124,8 +124,8 @@ def test__resolve_start_order_raises_on_unknown_and_circular_and_sorts_by_priori
     orch3.use(b, priority=10)
     orch3.use(c, priority=5, dependencies=["a"])
     order = orch3._resolve_start_order()
-    # b(10) first, then a(1)->c(5) depends on a so a then c
-    assert [svc.name for svc in order] == ["b", "c", "a"]
+    # b(10) first, then a(1)->c(5): c outranks a but must wait for it
+    assert [svc.name for svc in order] == ["b", "a", "c"]
 
 
 def test_run_and_shutdown_warns_on_reentry_and_shutdown_before_run(orch, caplog):
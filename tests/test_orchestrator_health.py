@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.health import NOT_STARTED, HealthMonitor
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.supervision import Backoff
+
+
+class ProbedAdapter(Adapter):
+    def __init__(self, name: str, healthy=True, delay: float = 0.0):
+        self.name = name
+        self.healthy = healthy
+        self.delay = delay
+        self.probes = 0
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def health(self) -> bool:
+        self.probes += 1
+        await asyncio.sleep(self.delay)
+        if isinstance(self.healthy, Exception):
+            raise self.healthy
+        return self.healthy
+
+
+class PlainAdapter(ProbedAdapter):
+    health = Adapter.health
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_probes_read_cached_results_without_calling_adapters():
+    orch = Orchestrator(health_interval=60)
+    kafka = ProbedAdapter("kafka")
+    orch.use(kafka)
+    orch.use(PlainAdapter("plain"))
+
+    assert orch.is_live() and not orch.is_ready()
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.01)  # let the first round of checks land
+
+    assert kafka.probes == 1
+    for _ in range(100):
+        assert orch.is_ready()
+        snapshot = orch.health_snapshot()
+    assert kafka.probes == 1
+    # Adapters without a health() override are never probed
+    assert list(snapshot.checks) == ["kafka"]
+    assert snapshot.as_dict()["checks"]["kafka"]["healthy"] is True
+
+    await orch.shutdown()
+    assert not orch.is_live() and not orch.is_ready()
+
+
+@pytest.mark.asyncio
+async def test_failures_and_timeouts_mark_the_runtime_unready():
+    monitor = HealthMonitor(interval=60, timeout=0.02)
+    slow = ProbedAdapter("slow", delay=1.0)
+    broken = ProbedAdapter("broken", healthy=ConnectionError("refused"))
+    monitor.register("slow", slow.health)
+    monitor.register("broken", broken.health)
+
+    snapshot = await monitor.check_all()
+
+    assert not snapshot.healthy and not monitor.healthy
+    assert snapshot.checks["slow"].error == "timed out after 0.02s"
+    assert snapshot.checks["broken"].error == "refused"
+
+    broken.healthy = True
+    slow.delay = 0.0
+    assert (await monitor.check_all()).healthy
+
+
+@pytest.mark.asyncio
+async def test_checks_repeat_on_the_interval():
+    monitor = HealthMonitor(interval=0.01, jitter=0.5)
+    svc = ProbedAdapter("svc")
+    monitor.register("svc", svc.health)
+
+    monitor.start()
+    await asyncio.sleep(0.08)
+    await monitor.stop()
+
+    assert svc.probes >= 3
+    probes = svc.probes
+    await asyncio.sleep(0.03)
+    assert svc.probes == probes
+
+
+@pytest.mark.asyncio
+async def test_adapters_that_are_not_running_are_not_probed():
+    orch = Orchestrator(health_interval=60, handle_signals=False)
+    lazy = ProbedAdapter("lazy")
+    orch.use(lazy, on_demand=True)
+
+    class Broken(ProbedAdapter):
+        async def startup(self):
+            raise ConnectionError("refused")
+
+    sink = Broken("sink")
+    orch.use(sink, optional=True, retry=Backoff(max_restarts=0))
+    db = ProbedAdapter("db")
+    orch.use(db)
+    await orch.run()
+    await orch._background
+
+    snapshot = await orch.health_monitor.check_all()
+    assert lazy.probes == sink.probes == 0
+    assert snapshot.checks["lazy"].error == NOT_STARTED
+    assert snapshot.checks["sink"].error == NOT_STARTED
+    assert snapshot.healthy and orch.is_ready()
+
+    await orch.get_adapter("lazy")
+    await orch.health_monitor.check("lazy")
+    assert lazy.probes == 1
+
+    probes = db.probes
+    restarting = asyncio.create_task(orch.restart("db"))
+    await asyncio.sleep(0)
+    assert (await orch.health_monitor.check("db")).error == NOT_STARTED
+    assert db.probes == probes
+    await restarting
+    await orch.shutdown()
@@ -0,0 +1,177 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+
+class Client(Adapter):
+    def __init__(self, name, log, delay=0.0, failures=0):
+        self.name = name
+        self.log = log
+        self.delay = delay
+        self.failures = failures
+        self.starts = 0
+
+    async def startup(self):
+        self.starts += 1
+        await asyncio.sleep(self.delay)
+        if self.starts <= self.failures:
+            raise ConnectionError("vendor API down")
+        self.log.append(f"start:{self.name}")
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        self.log.append(f"stop:{self.name}")
+
+
+def orchestrator():
+    return Orchestrator(handle_signals=False, loop_lag_threshold=None)
+
+
+@pytest.mark.asyncio
+async def test_on_demand_adapters_start_once_on_first_use():
+    log = []
+    orch = orchestrator()
+    orch.use(Client("db", log))
+    geo = Client("geo", log, delay=0.01)
+    orch.use(geo, dependencies=["db"], on_demand=True)
+
+    await orch.run()
+    assert log == ["start:db"]
+    assert orch.is_ready()
+    await orch.wait_for_all_ready(timeout=0.1)
+
+    first = await asyncio.gather(*(orch.get_adapter("geo") for _ in range(10)))
+    assert all(adapter is geo for adapter in first)
+    assert geo.starts == 1
+    assert await orch.get_adapter("geo") is geo
+    assert geo.starts == 1
+    assert 'haraka_adapter_activations_total{adapter="geo"} 1' in orch.metrics.render()
+
+    await orch.shutdown()
+    assert log == ["start:db", "start:geo", "stop:geo", "stop:db"]
+
+
+@pytest.mark.asyncio
+async def test_failed_activation_is_shared_then_retried():
+    orch = orchestrator()
+    geo = Client("geo", [], delay=0.01, failures=1)
+    orch.use(geo, on_demand=True)
+    await orch.run()
+
+    results = await asyncio.gather(
+        orch.get_adapter("geo"), orch.get_adapter("geo"), return_exceptions=True
+    )
+    assert [type(r) for r in results] == [ConnectionError, ConnectionError]
+    assert geo.starts == 1
+    assert orch.is_ready()
+
+    assert await orch.get_adapter("geo") is geo
+    assert geo.starts == 2
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_idle_adapters_stop_and_start_again_on_next_use():
+    log = []
+    orch = orchestrator()
+    geo = Client("geo", log)
+    orch.use(geo, on_demand=True, idle_timeout=0.1)
+    await orch.run()
+
+    async with orch.using("geo") as adapter:
+        assert adapter is geo
+        await asyncio.sleep(0.15)
+        assert log == ["start:geo"]  # held, so not idle
+
+    await asyncio.sleep(0.05)
+    await orch.get_adapter("geo")  # each use pushes the idle deadline back
+    await asyncio.sleep(0.06)
+    assert log == ["start:geo"]
+
+    await asyncio.sleep(0.1)
+    assert log == ["start:geo", "stop:geo"]
+    assert not orch._adapter_events["geo"].is_set()
+
+    await orch.get_adapter("geo")
+    assert log == ["start:geo", "stop:geo", "start:geo"]
+    report = await orch.shutdown()
+    assert report.stopped == ["geo"]
+
+
+@pytest.mark.asyncio
+async def test_restart_stops_on_demand_dependents_until_next_use():
+    log = []
+    orch = orchestrator()
+    orch.use(Client("db", log))
+    orch.use(Client("geo", log), dependencies=["db"], on_demand=True)
+    await orch.run()
+    await orch.get_adapter("geo")
+    log.clear()
+
+    assert await orch.restart("db") == ["db", "geo"]
+    assert log == ["stop:geo", "stop:db", "start:db"]
+
+    await orch.get_adapter("geo")
+    assert log[-1] == "start:geo"
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unused_on_demand_adapters_are_never_started_or_stopped():
+    log = []
+    orch = orchestrator()
+    orch.use(Client("geo", log), on_demand=True)
+
+    with pytest.raises(RuntimeError, match="not running"):
+        await orch.get_adapter("geo")
+    await orch.run()
+    with pytest.raises(ValueError, match="Unknown adapter"):
+        await orch.get_adapter("nope")
+
+    report = await orch.shutdown()
+    assert report.stopped == []
+    assert log == []
+    with pytest.raises(RuntimeError, match="not running"):
+        await orch.get_adapter("geo")
+
+
+@pytest.mark.asyncio
+async def test_on_demand_registration_is_validated():
+    orch = orchestrator()
+    with pytest.raises(ValueError, match="both optional and on demand"):
+        orch.use(Client("a", []), optional=True, on_demand=True)
+    with pytest.raises(ValueError, match="only applies to on-demand"):
+        orch.use(Client("b", []), idle_timeout=5)
+    with pytest.raises(ValueError, match="must be positive"):
+        orch.use(Client("c", []), on_demand=True, idle_timeout=0)
+
+    orch.use(Client("geo", []), on_demand=True)
+    orch.use(Client("api", []), dependencies=["geo"])
+    with pytest.raises(RuntimeError, match="'api' depends on on-demand adapter geo"):
+        await orch.run()
+
+
+@pytest.mark.asyncio
+async def test_hung_activation_does_not_block_shutdown_or_restart():
+    log = []
+    orch = orchestrator()
+    orch.use(Client("db", log))
+    orch.use(Client("geo", log, delay=60), dependencies=["db"], on_demand=True)
+    await orch.run()
+
+    pending = asyncio.ensure_future(orch.get_adapter("geo"))
+    await asyncio.sleep(0.01)
+    assert await asyncio.wait_for(orch.restart("db"), 1.0) == ["db", "geo"]
+    with pytest.raises(RuntimeError, match="was cancelled"):
+        await pending
+
+    pending = asyncio.ensure_future(orch.get_adapter("geo"))
+    await asyncio.sleep(0.01)
+    report = await asyncio.wait_for(orch.shutdown(timeout=0.5), 1.0)
+    assert report.stopped == ["db"]
+    with pytest.raises(RuntimeError, match="was cancelled"):
+        await pending
+    assert log == ["start:db", "stop:db", "start:db", "stop:db"]
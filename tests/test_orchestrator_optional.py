@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import (
+    LifecycleState,
+    Orchestrator,
+    StartupMode,
+)
+from haraka_runtime.orchestrator.supervision import Backoff
+
+FAST = Backoff(initial=0.001, maximum=0.01, jitter=0.0, max_restarts=3)
+
+
+class FlakyAdapter(Adapter):
+    def __init__(self, name, log, failures=0, gate=None):
+        self.name = name
+        self.log = log
+        self.failures = failures
+        self.gate = gate
+        self.starts = 0
+
+    async def startup(self):
+        self.starts += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.starts <= self.failures:
+            raise ConnectionError("sink unreachable")
+        self.log.append(f"start:{self.name}")
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        self.log.append(f"stop:{self.name}")
+
+
+def orchestrator(mode=StartupMode.SEQUENTIAL):
+    return Orchestrator(
+        startup_mode=mode, handle_signals=False, loop_lag_threshold=None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(StartupMode))
+async def test_optional_adapters_do_not_delay_started_or_readiness(mode):
+    log = []
+    gate = asyncio.Event()
+    orch = orchestrator(mode)
+    orch.use(FlakyAdapter("db", log))
+    orch.use(FlakyAdapter("analytics", log, gate=gate), optional=True)
+    orch.use(FlakyAdapter("api", log), dependencies=["db"])
+
+    await asyncio.wait_for(orch.run(), 0.5)
+
+    assert orch.state is LifecycleState.STARTED
+    assert orch.is_ready()
+    await orch.wait_for_all_ready(timeout=0.1)
+    assert log == ["start:db", "start:api"]
+
+    gate.set()
+    await asyncio.sleep(0.01)
+    assert log[-1] == "start:analytics"
+    assert orch.degraded() == {}
+    await orch.shutdown()
+    assert sorted(log[-3:]) == ["stop:analytics", "stop:api", "stop:db"]
+
+
+@pytest.mark.asyncio
+async def test_failed_optional_startup_is_retried_then_left_degraded():
+    log = []
+    orch = orchestrator()
+    orch.use(FlakyAdapter("db", log))
+    recovers = FlakyAdapter("cache_warmer", log, failures=2)
+    gives_up = FlakyAdapter("analytics", log, failures=10)
+    orch.use(recovers, optional=True, retry=FAST)
+    orch.use(gives_up, optional=True, retry=FAST)
+    orch.use(FlakyAdapter("exporter", log), dependencies=["analytics"], optional=True)
+
+    await orch.run()
+    await asyncio.wait_for(orch._background, 1.0)
+
+    assert recovers.starts == 3
+    assert gives_up.starts == FAST.max_restarts + 1
+    assert orch.degraded() == {
+        "analytics": "sink unreachable",
+        "exporter": "dependency unavailable",
+    }
+    assert orch.is_ready()
+    text = orch.metrics.render()
+    assert 'haraka_adapter_degraded{adapter="analytics"} 1' in text
+    assert 'haraka_adapter_degraded{adapter="cache_warmer"} 0' in text
+
+    log.clear()
+    report = await orch.shutdown()
+    # Only the optional adapters that actually started are stopped
+    assert sorted(report.stopped) == ["cache_warmer", "db"]
+
+
+@pytest.mark.asyncio
+async def test_optional_adapters_never_affect_readiness():
+    orch = orchestrator()
+    orch.use(FlakyAdapter("db", []))
+    sink = FlakyAdapter("analytics", [])
+    orch.use(sink, optional=True)
+
+    async def unhealthy():
+        return False
+
+    orch.health_monitor.register("analytics", unhealthy, critical=False)
+    await orch.run()
+    await asyncio.sleep(0.01)
+    await orch.health_monitor.check_all()
+
+    orch.mark_unready("analytics")
+    assert orch.is_ready()
+    assert not orch.health_snapshot().checks["analytics"].healthy
+
+    assert await orch.restart("analytics") == ["analytics"]
+    await orch._background
+    assert sink.starts == 2
+    orch.mark_unready("db")
+    assert not orch.is_ready()
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(StartupMode))
+async def test_failed_optional_dependent_does_not_fail_a_restart(mode):
+    log = []
+    orch = orchestrator(mode)
+    orch.use(FlakyAdapter("db", log))
+    orch.use(FlakyAdapter("api", log), dependencies=["db"])
+    sink = FlakyAdapter("analytics", log, failures=1)
+    orch.use(sink, dependencies=["db"], optional=True, retry=FAST)
+    await orch.run()
+    await orch._background
+    sink.failures = 10
+    log.clear()
+
+    assert await orch.restart("db") == ["db", "api", "analytics"]
+    assert sorted(log) == [
+        "start:api",
+        "start:db",
+        "stop:analytics",
+        "stop:api",
+        "stop:db",
+    ]
+    assert orch.is_ready()
+
+    await asyncio.wait_for(orch._background, 1.0)
+    assert sink.starts == 2 + FAST.max_restarts + 1
+    assert orch.degraded() == {"analytics": "sink unreachable"}
+    report = await orch.shutdown()
+    assert sorted(report.stopped) == ["api", "db"]
+
+
+@pytest.mark.asyncio
+async def test_required_adapters_cannot_depend_on_optional_ones():
+    orch = orchestrator()
+    orch.use(FlakyAdapter("analytics", []), optional=True)
+    orch.use(FlakyAdapter("api", []), dependencies=["analytics"])
+
+    with pytest.raises(RuntimeError, match="'api' depends on optional analytics"):
+        await orch.run()
+
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_pending_optional_startups():
+    log = []
+    orch = orchestrator()
+    orch.use(FlakyAdapter("db", log))
+    stuck = FlakyAdapter("analytics", log, gate=asyncio.Event())
+    orch.use(stuck, optional=True)
+    await orch.run()
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(RuntimeError, match="still starting in the background"):
+        await orch.restart("analytics")
+
+    report = await asyncio.wait_for(orch.shutdown(), 0.5)
+    assert report.stopped == ["db"]
+    assert orch._background.cancelled()
+    assert log == ["start:db", "stop:db"]
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, StartupMode
+
+
+class WarmingAdapter(Adapter):
+    """
+    Returns from startup() immediately and marks itself ready after
+    warming in the background for ``warm_for`` seconds.
+    """
+
+    def __init__(self, name: str, record: list, warm_for: float = 0.0):
+        self.name = name
+        self._record = record
+        self._warm_for = warm_for
+        self._warming = None
+
+    async def startup(self):
+        self._record.append(f"start:{self.name}")
+        if self._warm_for is None:
+            return
+        self._warming = asyncio.create_task(self._warm())
+
+    async def _warm(self):
+        await asyncio.sleep(self._warm_for)
+        self._record.append(f"ready:{self.name}")
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        if self._warming:
+            self._warming.cancel()
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_dependents_wait_for_readiness_not_startup_return():
+    orch = Orchestrator(startup_mode=StartupMode.READY_GATED)
+    rec = []
+    orch.use(WarmingAdapter("cache", rec, warm_for=0.05))
+    orch.use(WarmingAdapter("api", rec), dependencies=["cache"])
+    orch.use(WarmingAdapter("metrics", rec))
+
+    await orch.run(SETTINGS, APP)
+
+    # Unrelated adapters are not held back by the warming cache
+    assert rec.index("start:metrics") < rec.index("ready:cache")
+    assert rec.index("start:api") > rec.index("ready:cache")
+    await orch.wait_for_ready(["api", "metrics"], timeout=0.1)
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dependency_that_never_becomes_ready_aborts_startup():
+    orch = Orchestrator(startup_mode=StartupMode.READY_GATED, readiness_timeout=0.05)
+    rec = []
+    orch.use(WarmingAdapter("silent", rec, warm_for=None))
+    orch.use(WarmingAdapter("api", rec), dependencies=["silent"])
+
+    with pytest.raises(asyncio.TimeoutError):
+        await orch.run(SETTINGS, APP)
+    assert "start:api" not in rec
+
+
+@pytest.mark.asyncio
+async def test_wait_for_ready_on_a_subset():
+    orch = Orchestrator()
+    rec = []
+    orch.use(WarmingAdapter("a", rec))
+    orch.use(WarmingAdapter("b", rec))
+
+    orch.mark_ready("a")
+    await orch.wait_for_ready(["a"], timeout=0.1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await orch.wait_for_ready(["a", "b"], timeout=0.01)
+    with pytest.raises(ValueError, match="Unknown adapter"):
+        await orch.wait_for_ready(["zzz"])
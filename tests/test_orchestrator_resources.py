@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, StartupMode
+from haraka_runtime.orchestrator.resources import ResourceRegistry
+
+
+class Pool:
+    def __init__(self, log):
+        self.log = log
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+        self.log.append("close:pool")
+
+
+class PoolUser(Adapter):
+    def __init__(self, name, log, fail=False):
+        self.name = name
+        self.log = log
+        self.fail = fail
+        self.pool = None
+
+    async def startup(self):
+        self.pool = self.runtime.resources.get("pool")
+        assert not self.pool.closed
+        if self.fail:
+            raise RuntimeError("boom")
+        self.log.append(f"start:{self.name}")
+
+    async def shutdown(self):
+        self.log.append(f"stop:{self.name}")
+
+
+def orchestrator(log, created):
+    orch = Orchestrator(
+        startup_mode=StartupMode.CONCURRENT,
+        handle_signals=False,
+        loop_lag_threshold=None,
+    )
+
+    async def open_pool():
+        created.append(1)
+        await asyncio.sleep(0.01)  # warm-up
+        log.append("open:pool")
+        return Pool(log)
+
+    orch.resources.define("pool", open_pool)
+    return orch
+
+
+@pytest.mark.asyncio
+async def test_pool_is_shared_and_closed_after_last_user():
+    log, created = [], []
+    orch = orchestrator(log, created)
+    a, b = PoolUser("a", log), PoolUser("b", log)
+    orch.use(a, resources=["pool"])
+    orch.use(b, resources=["pool"])
+    orch.use(PoolUser("c", log), dependencies=["a"], resources=["pool"])
+
+    await orch.run()
+
+    assert created == [1]
+    assert a.pool is b.pool
+    assert log[0] == "open:pool"
+    assert orch.resources.users("pool") == {"a", "b", "c"}
+
+    await orch.shutdown()
+
+    assert log[-1] == "close:pool"
+    assert log.count("close:pool") == 1
+    assert a.pool.closed
+
+
+@pytest.mark.asyncio
+async def test_failed_startup_releases_its_references():
+    log, created = [], []
+    orch = orchestrator(log, created)
+    orch.use(PoolUser("ok", log), resources=["pool"])
+    orch.use(PoolUser("bad", log, fail=True), dependencies=["ok"], resources=["pool"])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        await orch.run()
+
+    # "ok" was rolled back, so nobody holds the pool any more
+    assert orch.resources.users("pool") == set()
+    assert log[-1] == "close:pool"
+
+
+@pytest.mark.asyncio
+async def test_registry_reference_counting():
+    closed = []
+    registry = ResourceRegistry(Orchestrator(handle_signals=False).logger)
+
+    async def close(value):
+        closed.append(value)
+
+    registry.define("client", lambda: asyncio.sleep(0, result="conn"), close=close)
+    with pytest.raises(ValueError, match="already defined"):
+        registry.define("client", lambda: asyncio.sleep(0))
+    with pytest.raises(ValueError, match="Unknown resource"):
+        await registry.acquire("nope", "x")
+    with pytest.raises(RuntimeError, match="has not been acquired"):
+        registry.get("client")
+
+    assert await registry.acquire("client", "x") == "conn"
+    assert await registry.acquire("client", "x") == "conn"  # same user counts once
+    await registry.acquire("client", "y")
+    await registry.release("client", "x")
+    assert closed == []
+    await registry.release("client", "y")
+    assert closed == ["conn"]
+
+    # A fresh acquire after the last release re-creates it
+    await registry.acquire("client", "z")
+    await registry.close_all()
+    assert closed == ["conn", "conn"]
@@ -0,0 +1,197 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import (
+    LifecycleState,
+    Orchestrator,
+    StartupMode,
+)
+
+
+class Pool:
+    def __init__(self, log, name):
+        self.log = log
+        self.name = name
+
+    async def aclose(self):
+        self.log.append(f"close:{self.name}")
+
+
+class CountingAdapter(Adapter):
+    def __init__(self, name, log, fail_on=()):
+        self.name = name
+        self.log = log
+        self.starts = 0
+        self.fail_on = fail_on
+
+    async def startup(self):
+        self.starts += 1
+        if self.starts in self.fail_on:
+            raise RuntimeError("credential rejected")
+        self.log.append(f"start:{self.name}")
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        self.log.append(f"stop:{self.name}")
+
+
+def orchestrator(mode=StartupMode.CONCURRENT):
+    return Orchestrator(
+        startup_mode=mode, handle_signals=False, loop_lag_threshold=None
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(StartupMode))
+async def test_restart_cycles_only_the_dependent_subgraph(mode):
+    log = []
+    orch = orchestrator(mode)
+    cache = CountingAdapter("cache", log)
+    orch.use(CountingAdapter("db", log))
+    orch.use(cache)
+    orch.use(CountingAdapter("api", log), dependencies=["db"])
+    orch.use(CountingAdapter("web", log), dependencies=["api", "cache"])
+    await orch.run()
+    log.clear()
+
+    restarted = await orch.restart("db")
+
+    assert restarted == ["db", "api", "web"]
+    assert log == [
+        "stop:web",
+        "stop:api",
+        "stop:db",
+        "start:db",
+        "start:api",
+        "start:web",
+    ]
+    assert cache.starts == 1
+    assert orch.is_ready()
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_restart_reopens_resources_only_the_subgraph_holds():
+    log = []
+    orch = orchestrator()
+
+    def opener(name):
+        async def open_pool():
+            log.append(f"open:{name}")
+            return Pool(log, name)
+
+        return open_pool
+
+    orch.resources.define("redis", opener("redis"))
+    orch.resources.define("http", opener("http"))
+    orch.use(CountingAdapter("sessions", log), resources=["redis", "http"])
+    orch.use(CountingAdapter("search", log), resources=["http"])
+    await orch.run()
+    log.clear()
+
+    await orch.restart("sessions")
+
+    assert log == ["stop:sessions", "close:redis", "open:redis", "start:sessions"]
+    assert orch.resources.users("http") == {"sessions", "search"}
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_runtime_is_not_ready_while_restarting():
+    orch = orchestrator()
+    gate = asyncio.Event()
+
+    class Slow(CountingAdapter):
+        async def startup(self):
+            if self.starts:
+                await gate.wait()
+            await super().startup()
+
+    orch.use(Slow("db", []))
+    await orch.run()
+    assert orch.is_ready()
+
+    restarting = asyncio.create_task(orch.restart("db"))
+    await asyncio.sleep(0.01)
+    assert not orch.is_ready()
+    with pytest.raises(asyncio.TimeoutError):
+        await orch.wait_for_ready(["db"], timeout=0.01)
+
+    gate.set()
+    await restarting
+    await orch.wait_for_ready(["db"], timeout=0.1)
+    assert orch.is_ready()
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_failed_restart_leaves_the_subgraph_down_until_retried():
+    log = []
+    orch = orchestrator()
+    redis = CountingAdapter("redis", log, fail_on=(2, 4))
+    orch.use(redis)
+    orch.use(CountingAdapter("api", log), dependencies=["redis"])
+    orch.use(CountingAdapter("cache", log))
+    await orch.run()
+    log.clear()
+
+    with pytest.raises(RuntimeError, match="credential rejected"):
+        await orch.restart("redis")
+    assert log == ["stop:api", "stop:redis"]
+    assert not orch.is_ready()
+
+    assert await orch.restart("redis") == ["redis", "api"]
+    assert orch.is_ready()
+
+    with pytest.raises(RuntimeError, match="credential rejected"):
+        await orch.restart("redis")
+    log.clear()
+    report = await orch.shutdown()
+
+    # Adapters left down by the failed restart are not stopped again
+    assert report.stopped == ["cache"]
+    assert log == ["stop:cache"]
+
+
+@pytest.mark.asyncio
+async def test_restart_rejects_unknown_adapters_and_stopped_runtimes():
+    orch = orchestrator()
+    orch.use(CountingAdapter("db", []))
+
+    with pytest.raises(ValueError, match="Unknown adapter"):
+        await orch.restart("nope")
+    with pytest.raises(RuntimeError, match="not running"):
+        await orch.restart("db")
+
+    await orch.run()
+    await orch.shutdown()
+    assert orch.state is LifecycleState.DESTROYED
+    with pytest.raises(RuntimeError, match="not running"):
+        await orch.restart("db")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", list(StartupMode))
+async def test_dependent_failing_to_restart_rolls_back_the_subgraph(mode):
+    log = []
+    orch = orchestrator(mode)
+    orch.use(CountingAdapter("db", log))
+    api = CountingAdapter("api", log, fail_on=(2,))
+    orch.use(api, dependencies=["db"])
+    await orch.run()
+    log.clear()
+
+    with pytest.raises(RuntimeError, match="credential rejected"):
+        await orch.restart("db")
+    assert log == ["stop:api", "stop:db", "start:db", "stop:db"]
+    assert not orch._restarting
+    assert not orch.is_ready()
+
+    assert await orch.restart("db") == ["db", "api"]
+    assert orch.is_ready()
+    log.clear()
+    report = await orch.shutdown()
+    assert report.stopped == ["api", "db"]
+    assert log == ["stop:api", "stop:db"]
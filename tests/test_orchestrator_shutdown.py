@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, LifecycleState
+
+
+class StopAdapter(Adapter):
+    """Adapter whose shutdown takes a configurable amount of time."""
+
+    def __init__(self, name: str, record: list, delay: float = 0.0, fail=False):
+        self.name = name
+        self._record = record
+        self._delay = delay
+        self._fail = fail
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        self._record.append(f"begin:{self.name}")
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError("flush failed")
+        self._record.append(f"stop:{self.name}")
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_dependents_stop_first_and_independents_in_parallel():
+    orch = Orchestrator()
+    rec = []
+    orch.use(StopAdapter("db", rec, delay=0.01))
+    orch.use(StopAdapter("api", rec, delay=0.1), dependencies=["db"])
+    orch.use(StopAdapter("worker", rec, delay=0.1), dependencies=["db"])
+    await orch.run(SETTINGS, APP)
+
+    began = time.perf_counter()
+    report = await orch.shutdown()
+    elapsed = time.perf_counter() - began
+
+    assert elapsed < 0.18
+    assert rec.index("begin:db") > rec.index("stop:api")
+    assert rec.index("begin:db") > rec.index("stop:worker")
+    assert sorted(report.stopped) == ["api", "db", "worker"]
+    assert report.overran == []
+    assert orch.state == LifecycleState.DESTROYED
+
+
+@pytest.mark.asyncio
+async def test_hung_adapter_times_out_and_failures_are_reported():
+    orch = Orchestrator(adapter_shutdown_timeout=0.05)
+    rec = []
+    orch.use(StopAdapter("db", rec))
+    orch.use(StopAdapter("hung", rec, delay=10), dependencies=["db"])
+    orch.use(StopAdapter("broken", rec, fail=True))
+    await orch.run(SETTINGS, APP)
+
+    report = await orch.shutdown()
+
+    assert report.timed_out == ["hung"]
+    assert report.failed == {"broken": "flush failed"}
+    # db still stops once the hung dependent has been given up on
+    assert report.stopped == ["db"]
+
+
+@pytest.mark.asyncio
+async def test_global_deadline_skips_adapters_not_yet_reached():
+    orch = Orchestrator(adapter_shutdown_timeout=None)
+    rec = []
+    orch.use(StopAdapter("db", rec))
+    orch.use(StopAdapter("hung", rec, delay=10), dependencies=["db"])
+    await orch.run(SETTINGS, APP)
+
+    began = time.perf_counter()
+    report = await orch.shutdown(timeout=0.05)
+
+    assert time.perf_counter() - began < 0.5
+    assert report.timed_out == ["hung"]
+    assert report.skipped == ["db"]
+    assert report.overran == ["hung", "db"]
@@ -0,0 +1,174 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.supervision import Backoff, RestartPolicy, TaskState
+
+FAST = Backoff(initial=0.001, maximum=0.01, jitter=0.0)
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_crashing_task_is_restarted_until_it_succeeds():
+    orch = Orchestrator()
+    attempts = []
+
+    async def consumer():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("broker gone")
+
+    orch.supervise(consumer, policy=RestartPolicy.ON_FAILURE, backoff=FAST)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.1)
+
+    status = orch.task_status()["consumer"]
+    assert len(attempts) == 3
+    assert status.restarts == 2
+    assert status.state is TaskState.COMPLETED
+    assert status.last_error == "broker gone"
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_startup_tasks_are_supervised_and_observable():
+    orch = Orchestrator(task_restart_policy=RestartPolicy.NEVER)
+
+    async def crashes():
+        raise RuntimeError("dead consumer")
+
+    orch.startup_tasks.append(crashes)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.01)
+
+    status = orch.task_status()["crashes"]
+    assert status.state is TaskState.FAILED
+    assert status.last_error == "dead consumer"
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_restart_rate_limit_marks_task_failed():
+    orch = Orchestrator()
+
+    async def always_broken():
+        raise RuntimeError("boom")
+
+    budget = Backoff(initial=0.001, maximum=0.001, max_restarts=3, window=60)
+    task = orch.supervise(always_broken, backoff=budget)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.1)
+
+    assert task.status().state is TaskState.FAILED
+    assert task.status().restarts == 3
+    await orch.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_always_policy_restarts_clean_exits_and_never_does_not():
+    orch = Orchestrator()
+    ticks = {"poll": 0, "once": 0}
+
+    async def poll():
+        ticks["poll"] += 1
+        await asyncio.sleep(0.005)
+
+    async def once():
+        ticks["once"] += 1
+        raise ValueError("no retry")
+
+    orch.supervise(poll, policy=RestartPolicy.ALWAYS, backoff=FAST)
+    orch.supervise(once, policy=RestartPolicy.NEVER)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.05)
+
+    assert ticks["poll"] >= 3
+    assert ticks["once"] == 1
+    assert orch.task_status()["once"].state is TaskState.FAILED
+
+    await orch.shutdown()
+    assert orch.task_status()["poll"].state is TaskState.STOPPED
+
+
+@pytest.mark.asyncio
+async def test_clean_exits_under_always_do_not_exhaust_the_restart_budget():
+    orch = Orchestrator()
+    ticks = []
+
+    async def poll():
+        ticks.append(1)
+
+    budget = Backoff(initial=0.001, maximum=0.001, jitter=0.0, max_restarts=3)
+    task = orch.supervise(poll, policy=RestartPolicy.ALWAYS, backoff=budget)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0.1)
+
+    assert len(ticks) > 10
+    assert task.status().state is not TaskState.FAILED
+    assert task.status().last_error is None
+    await orch.shutdown()
+    assert task.status().state is TaskState.STOPPED
+
+
+@pytest.mark.asyncio
+async def test_one_failed_worker_keeps_the_group_failed():
+    orch = Orchestrator()
+    budget = Backoff(initial=0.001, maximum=0.001, jitter=0.0, max_restarts=2)
+    crashes = []
+
+    async def worker():
+        if asyncio.current_task().get_name() == "worker[0]":
+            crashes.append(1)
+            raise ConnectionError("boom")  # only the first worker burns its budget
+        await asyncio.sleep(0.001)
+
+    group = orch.supervise(
+        worker, policy=RestartPolicy.ALWAYS, backoff=budget, workers=2
+    )
+    group.start()
+    await asyncio.sleep(0.05)
+
+    assert len(crashes) == budget.max_restarts + 1
+    assert group._states[0] is TaskState.FAILED
+    assert group._states[1] is not TaskState.FAILED
+    assert group.status().state is TaskState.FAILED
+    await asyncio.wait_for(group.stop(), 1.0)
+    assert group.status().state is TaskState.FAILED
+    assert group._states[1] is TaskState.STOPPED
+
+
+@pytest.mark.asyncio
+async def test_worker_group_respects_concurrency_limit():
+    orch = Orchestrator()
+    active = []
+    peak = []
+
+    async def worker():
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+
+    group = orch.supervise(worker, workers=8, max_concurrency=3)
+    await orch.run(SETTINGS, APP)
+    await asyncio.sleep(0)
+    assert group.status().running == 3
+
+    await asyncio.sleep(0.1)
+    assert max(peak) == 3
+    assert len(peak) == 8
+    assert group.status().state is TaskState.COMPLETED
+    await orch.shutdown()
+
+
+def test_duplicate_task_names_are_made_unique():
+    orch = Orchestrator()
+
+    async def job():
+        pass
+
+    orch.supervise(job)
+    orch.supervise(job)
+    assert list(orch.task_status()) == ["job", "job#2"]
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.graph import DependencyGraph
+from haraka_runtime.orchestrator.orchestrator import Orchestrator, StartupMode
+from haraka_runtime.orchestrator.timing import LifecycleTimings
+
+
+class TimedAdapter(Adapter):
+    def __init__(self, name: str, delay: float):
+        self.name = name
+        self._delay = delay
+
+    async def startup(self):
+        await asyncio.sleep(self._delay)
+        self.runtime.mark_ready(self.name)
+
+    async def shutdown(self):
+        await asyncio.sleep(self._delay / 2)
+
+
+SETTINGS = type("S", (), {"port": 0})()
+APP = type("D", (), {"docs_url": "/"})()
+
+
+@pytest.mark.asyncio
+async def test_startup_report_tracks_durations_and_critical_path():
+    orch = Orchestrator(startup_mode=StartupMode.CONCURRENT)
+    orch.use(TimedAdapter("db", 0.06))
+    orch.use(TimedAdapter("cache", 0.02))
+    orch.use(TimedAdapter("api", 0.04), dependencies=["db", "cache"])
+
+    await orch.run(SETTINGS, APP)
+    report = orch.startup_report()
+
+    assert report.critical_path == ["db", "api"]
+    assert 0.09 <= report.critical_path_duration <= report.total
+    api = report.adapters["api"]
+    assert api["dependency_wait"] == pytest.approx(0.06, abs=0.03)
+    assert api["startup"] >= 0.04
+    assert api["ready"] >= api["dependency_wait"] + 0.04
+    assert report.adapters["cache"]["dependency_wait"] == 0.0
+    assert report.as_dict()["critical_path"] == ["db", "api"]
+
+    await orch.shutdown()
+    assert orch.timings.adapters["db"].shutdown_duration >= 0.03
+    assert orch.startup_report().adapters["db"]["shutdown"] >= 0.03
+
+
+def test_report_with_injected_clock_is_deterministic():
+    ticks = iter([0.0, 1.0, 3.0, 3.0, 4.0, 10.0])
+    timings = LifecycleTimings(clock=lambda: next(ticks))
+    graph = DependencyGraph()
+    graph.add("a", 0, [])
+    graph.add("b", 0, ["a"])
+
+    timings.run_began = timings.clock()  # 0.0
+    timings.record("a", "startup_began")  # 1.0
+    timings.record("a", "startup_ended")  # 3.0
+    timings.record("b", "startup_began")  # 3.0
+    timings.record("b", "startup_ended")  # 4.0
+    timings.run_ended = timings.clock()  # 10.0
+
+    report = timings.startup_report(graph)
+    assert report.total == 10.0
+    assert report.critical_path == ["a", "b"]
+    assert report.critical_path_duration == 4.0
+    assert report.adapters["a"]["queued"] == 1.0
+    assert report.adapters["b"]["dependency_wait"] == 3.0
+    assert report.adapters["b"]["startup"] == 1.0
@@ -0,0 +1,172 @@
+import asyncio
+import functools
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+from haraka_runtime.orchestrator.prefork import (
+    DRAIN_TIMEOUT_ENV,
+    WORKER_ID_ENV,
+    PreforkSupervisor,
+    cpu_quota,
+    orchestrator_worker,
+    worker_shutdown_timeout,
+)
+from haraka_runtime.orchestrator.supervision import Backoff
+
+FAST = Backoff(initial=0.01, maximum=0.01, jitter=0.0, max_restarts=2, window=60)
+
+
+def test_cpu_quota_reads_cgroup_v2_and_v1(tmp_path):
+    available = len(os.sched_getaffinity(0))
+
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert cpu_quota(tmp_path) == min(available, 2)
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert cpu_quota(tmp_path) == available
+
+    (tmp_path / "cpu.max").unlink()
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("50000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert cpu_quota(tmp_path) == 1
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    assert cpu_quota(tmp_path) == available
+
+
+def _crash_once(marker):
+    path = marker / os.environ[WORKER_ID_ENV]
+    if not path.exists():
+        path.write_text("crashed")
+        os._exit(3)
+
+
+def test_crashed_workers_are_restarted(tmp_path):
+    supervisor = PreforkSupervisor(
+        functools.partial(_crash_once, tmp_path), workers=2, backoff=FAST
+    )
+
+    assert supervisor.run() == 0
+    assert supervisor.restarts == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["0", "1"]
+
+
+def test_restart_budget_stops_the_supervisor():
+    supervisor = PreforkSupervisor(lambda: os._exit(1), workers=1, backoff=FAST)
+
+    assert supervisor.run() == 1
+    assert supervisor.restarts == 2
+
+
+class FileAdapter(Adapter):
+    def __init__(self, directory):
+        self.name = "files"
+        self.directory = directory
+
+    async def startup(self):
+        (self.directory / f"started-{os.getpid()}").touch()
+
+    async def shutdown(self):
+        (self.directory / f"stopped-{os.getpid()}").touch()
+
+
+def _build(directory):
+    runtime = Orchestrator(handle_signals=False, loop_lag_threshold=None)
+    runtime.use(FileAdapter(directory))
+    return runtime
+
+
+def _sigterm_once(directory, count):
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if len(list(directory.glob("started-*"))) >= count:
+            break
+        time.sleep(0.02)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def test_sigterm_drains_orchestrator_workers(tmp_path):
+    supervisor = PreforkSupervisor(
+        functools.partial(orchestrator_worker, functools.partial(_build, tmp_path)),
+        workers=2,
+    )
+    threading.Thread(target=_sigterm_once, args=(tmp_path, 2), daemon=True).start()
+
+    assert supervisor.run() == 0
+    assert len(list(tmp_path.glob("stopped-*"))) == 2
+    assert supervisor.restarts == 0
+
+
+def _ignore_sigterm(directory):
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    (directory / f"started-{os.getpid()}").touch()
+    time.sleep(60)
+
+
+def test_workers_that_overrun_the_drain_deadline_are_killed(tmp_path):
+    supervisor = PreforkSupervisor(
+        functools.partial(_ignore_sigterm, tmp_path), workers=1, drain_timeout=0.2
+    )
+    threading.Thread(target=_sigterm_once, args=(tmp_path, 1), daemon=True).start()
+
+    began = time.monotonic()
+    assert supervisor.run() == 0
+    assert time.monotonic() - began < 5
+    assert not supervisor.procs
+
+
+class StuckAdapter(Adapter):
+    name = "stuck"
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        await asyncio.sleep(60)
+
+
+def _build_stuck():
+    runtime = Orchestrator(
+        shutdown_timeout=60,
+        adapter_shutdown_timeout=None,
+        handle_signals=False,
+        loop_lag_threshold=None,
+    )
+    runtime.use(StuckAdapter())
+    return runtime
+
+
+def _stuck_worker(directory):
+    (directory / f"started-{os.getpid()}").touch()
+    orchestrator_worker(_build_stuck)
+    (directory / "exited").write_text(os.environ[DRAIN_TIMEOUT_ENV])
+
+
+def test_worker_shutdown_fits_the_supervisor_drain_deadline(tmp_path):
+    supervisor = PreforkSupervisor(
+        functools.partial(_stuck_worker, tmp_path), workers=1, drain_timeout=1.5
+    )
+    threading.Thread(target=_sigterm_once, args=(tmp_path, 1), daemon=True).start()
+
+    assert supervisor.run() == 0
+    # The orchestrator gave up on the stuck adapter instead of being killed
+    assert (tmp_path / "exited").read_text() == "1.5"
+
+
+def test_worker_shutdown_timeout(monkeypatch):
+    monkeypatch.delenv(DRAIN_TIMEOUT_ENV, raising=False)
+    assert worker_shutdown_timeout(25.0) == 25.0
+    assert worker_shutdown_timeout(25.0, drain_timeout=10) == 9.0
+    monkeypatch.setenv(DRAIN_TIMEOUT_ENV, "20")
+    assert worker_shutdown_timeout(25.0) == 18.0
+    assert worker_shutdown_timeout(5.0) == 5.0
+
+
+def test_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        PreforkSupervisor(lambda: None, workers=0)
@@ -0,0 +1,253 @@
+import asyncio
+
+import pytest
+
+from haraka_runtime.adapters.redis_adapter import (
+    ClientCache,
+    ConnectionPool,
+    InMemoryRedis,
+    RedisAdapter,
+    RedisError,
+    encode_command,
+    read_reply,
+)
+
+
+def bulk(value):
+    return b"$%d\r\n%s\r\n" % (len(value), value)
+
+
+class RespStandIn:
+    """
+    Minimal RESP server: GET/SET/PING, CLIENT ID, SUBSCRIBE and CLIENT
+    TRACKING redirects, with an invalidation push to every redirect target
+    on SET. Redirecting to a client that has disconnected fails as in Redis.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.clients = {}
+        self.targets = set()
+        self.next_id = 0
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return "redis://127.0.0.1:%d/0" % self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for writer in self.clients.values():
+            writer.close()
+        await self.server.wait_closed()
+
+    def drop(self, client_id):
+        self.clients[client_id].close()
+
+    async def _serve(self, reader, writer):
+        self.next_id += 1
+        client_id = self.next_id
+        self.clients[client_id] = writer
+        try:
+            while True:
+                command = await read_reply(reader)
+                writer.write(self._reply(client_id, command))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self.clients[client_id]
+            writer.close()
+
+    def _reply(self, client_id, command):
+        name, args = command[0].upper(), command[1:]
+        if name == b"CLIENT" and args[0].upper() == b"ID":
+            return b":%d\r\n" % client_id
+        if name == b"CLIENT":
+            target = int(args[-1])
+            if target not in self.clients:
+                return b"-ERR The client ID you want redirect to does not exist\r\n"
+            self.targets.add(target)
+            return b"+OK\r\n"
+        if name == b"SUBSCRIBE":
+            return b"*3\r\n" + bulk(b"subscribe") + bulk(args[0]) + b":1\r\n"
+        if name == b"SET":
+            self.data[args[0]] = args[1]
+            channel = b"__redis__:invalidate"
+            push = b"*3\r\n" + bulk(b"message") + bulk(channel) + b"*1\r\n"
+            push += bulk(args[0])
+            for target in self.targets & set(self.clients):
+                self.clients[target].write(push)
+            return b"+OK\r\n"
+        if name == b"GET":
+            value = self.data.get(args[0])
+            return b"$-1\r\n" if value is None else bulk(value)
+        return b"+PONG\r\n"
+
+
+@pytest.mark.asyncio
+async def test_startup_warms_the_pool():
+    server = InMemoryRedis()
+    redis = RedisAdapter(server=server, pool_size=4, min_idle=3)
+    await redis.startup()
+
+    assert server.connections == 3
+    assert redis.pool.size == 3
+    await redis.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_commands_in_one_tick_share_a_round_trip():
+    server = InMemoryRedis(latency=0.01)
+    redis = RedisAdapter(server=server, max_pipeline=50)
+    await redis.startup()
+
+    await asyncio.gather(*(redis.set(f"k{i}", i) for i in range(100)))
+    values = await asyncio.gather(*(redis.get(f"k{i}") for i in range(100)))
+
+    assert values == [str(i).encode() for i in range(100)]
+    # 200 commands, two ticks, max_pipeline=50 → 4 pipelines
+    assert server.round_trips == 4
+    with pytest.raises(RedisError, match="unknown command"):
+        await redis.execute("NOPE")
+    assert await redis.incr("counter", 5) == 5
+    await redis.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pool_bounds_concurrent_connections():
+    server = InMemoryRedis(latency=0.01)
+    redis = RedisAdapter(server=server, pool_size=2, min_idle=1, max_pipeline=1)
+    await redis.startup()
+
+    await asyncio.gather(*(redis.execute("PING") for _ in range(10)))
+
+    assert server.connections == 2
+    assert redis.pool.size == 2
+    await redis.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_client_cache_serves_hot_keys_and_honours_invalidation():
+    server = InMemoryRedis()
+    reader = RedisAdapter(server=server, client_cache=True)
+    writer = RedisAdapter(name="writer", server=server)
+    await reader.startup()
+    await writer.startup()
+
+    await writer.set("hot", "v1")
+    assert await reader.get("hot") == b"v1"
+    trips = server.round_trips
+    for _ in range(50):
+        assert await reader.get("hot") == b"v1"
+    assert server.round_trips == trips
+    assert reader.cache.hits == 50
+
+    # A write from another client invalidates the cached entry
+    await writer.set("hot", "v2")
+    assert await reader.get("hot") == b"v2"
+
+    await reader.shutdown()
+    await writer.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_client_cache_survives_restart_and_listener_loss():
+    server = RespStandIn()
+    url = await server.start()
+    reader = RedisAdapter(url=url, client_cache=True, min_idle=1)
+    writer = RedisAdapter(name="writer", url=url, min_idle=1)
+    await writer.startup()
+
+    await reader.startup()
+    first_listener = reader._tracking_id
+    await reader.shutdown()
+
+    # A second startup must not redirect tracking to the closed listener
+    await reader.startup()
+    assert reader._tracking_id != first_listener
+    await writer.set("hot", "v1")
+    assert await reader.get("hot") == b"v1"
+    assert await reader.get("hot") == b"v1"
+    assert reader.cache.hits == 1
+
+    await writer.set("hot", "v2")
+    await asyncio.sleep(0.05)  # the invalidation push arrives
+    assert await reader.get("hot") == b"v2"
+
+    # Losing the listener unexpectedly disables the cache, not the adapter
+    server.drop(reader._tracking_id)
+    await asyncio.sleep(0.05)
+    assert reader.cache is None
+    await writer.set("hot", "v3")
+    assert await reader.get("hot") == b"v3"
+
+    await reader.shutdown()
+    await writer.shutdown()
+    await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_keeps_the_connections_that_opened():
+    opened = []
+
+    async def factory():
+        opened.append(object())
+        if len(opened) == 2:
+            raise ConnectionError("refused")
+        return await InMemoryRedis().connect()
+
+    pool = ConnectionPool(factory, max_size=5, min_idle=3)
+    with pytest.raises(ConnectionError):
+        await pool.warm()
+    assert pool.size == pool._idle.qsize() == 2
+
+    await pool.warm()
+    assert pool.size == pool._idle.qsize() == 3
+
+
+def test_client_cache_ttl_lru_and_stale_fill_protection(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        "haraka_runtime.adapters.redis_adapter.time.monotonic", lambda: now[0]
+    )
+    cache = ClientCache(max_entries=2, ttl=5.0)
+
+    cache.put(b"a", 1, cache.epoch)
+    cache.put(b"b", 2, cache.epoch)
+    assert cache.get(b"a") == 1
+    cache.put(b"c", 3, cache.epoch)  # evicts b, the least recently used
+    assert len(cache) == 2
+    cache.get(b"b")
+    assert cache.misses == 1
+
+    now[0] += 6
+    cache.get(b"a")  # expired
+    assert cache.misses == 2
+
+    epoch = cache.epoch
+    cache.invalidate([b"x"])  # an invalidation raced with the read of x
+    cache.put(b"x", "stale", epoch)
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_resp_encoding_and_reply_parsing():
+    assert (
+        encode_command(("SET", "k", 1)) == b"*3\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\n1\r\n"
+    )
+
+    reader = asyncio.StreamReader()
+    reader.feed_data(
+        b"+OK\r\n-ERR bad\r\n:42\r\n$3\r\nfoo\r\n$-1\r\n*2\r\n$1\r\na\r\n:1\r\n"
+    )
+    reader.feed_eof()
+
+    assert await read_reply(reader) == "OK"
+    error = await read_reply(reader)
+    assert isinstance(error, RedisError) and str(error) == "ERR bad"
+    assert await read_reply(reader) == 42
+    assert await read_reply(reader) == b"foo"
+    assert await read_reply(reader) is None
+    assert await read_reply(reader) == [b"a", 1]
+    with pytest.raises(ConnectionError):
+        await read_reply(reader)
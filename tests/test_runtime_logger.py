@@ -0,0 +1,115 @@
+import io
+import threading
+
+import pytest
+
+from haraka.utils import Logger
+from haraka_runtime.core.interfaces import Adapter
+from haraka_runtime.orchestrator.log import LogLevel, OverflowPolicy, RuntimeLogger
+from haraka_runtime.orchestrator.orchestrator import Orchestrator
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted a filtered record")
+
+
+class GatedStream(io.StringIO):
+    """Stream whose first write blocks until ``gate`` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Event()
+        self.entered = threading.Event()
+
+    def write(self, text):
+        self.entered.set()
+        self.gate.wait(5)
+        return super().write(text)
+
+
+def test_filtered_records_are_never_formatted(capsys):
+    logger = RuntimeLogger("[x]", level=LogLevel.INFO)
+    logger.debug("value %s", Exploding())
+    logger.trace("value %s", Exploding())
+
+    assert capsys.readouterr().out == ""
+    assert LogLevel.parse("warn") is LogLevel.WARN
+    assert LogLevel.parse("evm") is LogLevel.INFO
+
+
+def test_output_matches_haraka_logger(capsys):
+    label = Logger.get_label("PyFast")
+    Logger(label).info("🚀 Started db", extra={"n": 1})
+    expected = capsys.readouterr().out
+
+    logger = RuntimeLogger(label)
+    logger.info("🚀 Started %s", "db", extra={"n": 1})
+    logger.warn("slow")
+    captured = capsys.readouterr()
+    assert captured.out == expected
+    assert captured.err == f"{label} ⚠️ WARNING: slow\n"
+
+
+def test_async_mode_writes_from_a_background_thread():
+    stream = io.StringIO()
+    logger = RuntimeLogger("[x]", stream=stream)
+    logger.start()
+
+    for i in range(100):
+        logger.info("record %d", i)
+    assert logger.flush(timeout=5)
+    assert stream.getvalue().count("INFO: record") == 100
+
+    assert logger.close(timeout=5)
+    logger.info("after close")
+    assert stream.getvalue().endswith("[x] INFO: after close\n")
+
+
+@pytest.mark.parametrize(
+    "policy, kept",
+    [
+        (OverflowPolicy.DROP_NEWEST, ["1", "2"]),
+        (OverflowPolicy.DROP_OLDEST, ["2", "3"]),
+    ],
+)
+def test_overflow_policy_when_queue_is_full(policy, kept):
+    stream = GatedStream()
+    logger = RuntimeLogger("[x]", maxsize=2, overflow=policy, stream=stream)
+    logger.start()
+
+    logger.info("0")
+    assert stream.entered.wait(5)  # the writer is stuck on record 0
+    for i in (1, 2, 3):
+        logger.info(str(i))
+    assert logger.dropped == 1
+
+    stream.gate.set()
+    assert logger.flush(timeout=5)
+    lines = [line.rsplit(" ", 1)[-1] for line in stream.getvalue().splitlines()]
+    assert lines == ["0"] + kept
+
+
+class Service(Adapter):
+    name = "svc"
+
+    async def startup(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_flushes_async_logs_on_shutdown(capsys):
+    orch = Orchestrator(
+        handle_signals=False, loop_lag_threshold=None, async_logging=True
+    )
+    assert orch.logger.asynchronous
+    orch.use(Service())
+    await orch.run()
+    await orch.shutdown(timeout=5)
+
+    out = capsys.readouterr().out
+    assert "🚀 Started svc" in out
+    assert "🛑 Stopped svc" in out